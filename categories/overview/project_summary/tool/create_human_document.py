@@ -9,7 +9,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent.parent / 'common'))
 from config import AI_DOCUMENT_YAML
-from paths import DOC_CATEGORIES, get_all_category_doc_type_pairs, get_ai_document_path
+from paths import DOC_CATEGORIES
 from md_base import (
     format_ai_context_section,
     format_meta_dates,
@@ -17,26 +17,27 @@ from md_base import (
     format_references_section,
     format_status,
     get_doc_type_role_description,
+    list_ai_documents,
     load_yaml,
     rel_path_to_human_doc,
     run_create_human_document,
 )
 
+# meta だけを読む他ドキュメントへの依存（categories 相対の glob）。build.py の依存グラフで使用し、
+# 一致する YAML の meta が変わったか、一致する YAML が増減したらこの doc_type も再ビルドする
+# （get_all_doc_links は全 doc_type の meta.title だけを読むため、本文の編集では再ビルドしない）
+DOCUMENT_META_DEPENDENCIES = ('*/*/' + AI_DOCUMENT_YAML,)
+
 
 def get_all_doc_links() -> list[tuple[str, str, str]]:
     """全カテゴリの (category, doc_type, title) 一覧を返す（project_summary 自身を除く）"""
     entries = []
-    for category, doc_type in get_all_category_doc_type_pairs():
+    for document in list_ai_documents():
+        category, doc_type, meta = document['category'], document['doc_type'], document['meta']
         if category == 'overview' and doc_type == 'project_summary':
             continue
-        yaml_path = get_ai_document_path(category, doc_type)
-        if not yaml_path.exists():
-            continue
-        try:
-            data = load_yaml(str(yaml_path))
-        except Exception:
+        if meta is None:
             continue
-        meta = data.get('meta', {})
         title = meta.get('title') or meta.get('doc_type', doc_type)
         entries.append((category, doc_type, title))
     return entries
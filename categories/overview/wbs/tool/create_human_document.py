@@ -10,7 +10,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent.parent / 'common'))
 from config import AI_DOCUMENT_YAML
-from paths import DOC_CATEGORIES, get_available_categories, get_category_label, get_doc_types, get_ai_document_path
+from paths import DOC_CATEGORIES, get_category_label
 from md_base import (
     compute_task_hours,
     format_ai_context_section,
@@ -20,10 +20,15 @@ from md_base import (
     format_references_section,
     format_status,
     get_doc_type_role_description,
+    list_ai_documents,
     load_yaml,
     run_create_human_document,
 )
 
+# 他ドキュメントへの依存（categories 相対の glob）。build.py の依存グラフで使用し、
+# 一致する YAML が変わったらこの doc_type も再ビルドする（collect_task_states / collect_category_tasks が全 doc_type の YAML を読むため）
+DOCUMENT_DEPENDENCIES = ('*/*/' + AI_DOCUMENT_YAML,)
+
 
 def _wbs_code_sort_key(wbs_code: str) -> tuple:
     """wbs_code をソート用タプルに変換（1, 1.1, 1.1.1 の順）"""
@@ -51,50 +56,41 @@ def _progress_from_elements(elements: list[dict]) -> tuple[float, float, int, in
 def collect_task_states() -> list[dict]:
     """各カテゴリの ai_document.yaml からタスク状態を収集（tasks または wbs_elements）"""
     entries = []
-    for category in DOC_CATEGORIES:
-        if category not in get_available_categories():
+    for document in list_ai_documents():
+        category, doc_type, yaml_path = document['category'], document['doc_type'], document['path']
+        try:
+            data = load_yaml(str(yaml_path))
+        except Exception:
             continue
-        for doc_type in get_doc_types(category):
-            yaml_path = get_ai_document_path(category, doc_type)
-            if not yaml_path.exists():
-                continue
-            try:
-                data = load_yaml(str(yaml_path))
-            except Exception:
-                continue
-            meta = data.get('meta', {})
-            entry = {
-                'category': category,
-                'doc_type': meta.get('doc_type', doc_type),
-                'title': meta.get('title', yaml_path.stem),
-                'status': meta.get('status', ''),
-            }
-            tasks = data.get('tasks', [])
-            wbs_elements = data.get('wbs_elements', [])
-            if tasks:
-                entry['tasks'] = [
-                    {'id': t.get('id', ''), 'title': t.get('title', ''), 'status': t.get('status', '')}
-                    for t in tasks
-                ]
-            elif wbs_elements:
-                entry['tasks'] = [
-                    {'id': e.get('id', ''), 'title': e.get('title', ''), 'status': e.get('status', '')}
-                    for e in wbs_elements if e.get('type') in ('task', 'milestone')
-                ]
-            entries.append(entry)
+        meta = data.get('meta', {})
+        entry = {
+            'category': category,
+            'doc_type': meta.get('doc_type', doc_type),
+            'title': meta.get('title', yaml_path.stem),
+            'status': meta.get('status', ''),
+        }
+        tasks = data.get('tasks', [])
+        wbs_elements = data.get('wbs_elements', [])
+        if tasks:
+            entry['tasks'] = [
+                {'id': t.get('id', ''), 'title': t.get('title', ''), 'status': t.get('status', '')}
+                for t in tasks
+            ]
+        elif wbs_elements:
+            entry['tasks'] = [
+                {'id': e.get('id', ''), 'title': e.get('title', ''), 'status': e.get('status', '')}
+                for e in wbs_elements if e.get('type') in ('task', 'milestone')
+            ]
+        entries.append(entry)
     return entries
 
 
 def collect_category_tasks() -> list[dict]:
     """各カテゴリの doc_type: tasks から詳細タスクを収集（WBS で集約表示用）"""
     entries = []
-    for category in DOC_CATEGORIES:
-        if category == 'overview':
-            continue
-        if 'tasks' not in get_doc_types(category):
-            continue
-        yaml_path = get_ai_document_path(category, 'tasks')
-        if not yaml_path.exists():
+    for document in list_ai_documents():
+        category, yaml_path = document['category'], document['path']
+        if category == 'overview' or document['doc_type'] != 'tasks':
             continue
         try:
             data = load_yaml(str(yaml_path))
@@ -5,7 +5,7 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent.parent / 'common'))
-from md_base import generate_open_items_markdown, run_create_human_document
+from md_base import generate_open_items_markdown as generate_markdown, run_create_human_document
 
 if __name__ == '__main__':
-    run_create_human_document(generate_open_items_markdown)
+    run_create_human_document(generate_markdown)
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+インクリメンタルビルド用のマニフェスト（.yaml-bridge/build-manifest.json）。
+YAML ごとに、入力ファイル（YAML 本体・scheme.json とその $ref 先・create_human_document.py・
+common の共通モジュール・変換時に読んだ他ドキュメント）のハッシュと、生成した Markdown のハッシュを記録する。
+build.py は入力と出力が前回成功時から変わっていない YAML をスキップする。
+
+他ドキュメントへの依存は、create_human_document.py の DOCUMENT_DEPENDENCIES（categories 相対の glob）による
+宣言と、変換中に md_base.load_yaml で実際に読まれたパスの記録の両方から得る。
+meta だけを読む依存（DOCUMENT_META_DEPENDENCIES の宣言と、md_base.list_ai_documents・load_yaml_meta で読まれたパス）は
+ファイル全体ではなく meta の内容のハッシュを 'meta:' 付きのキーで記録し、meta 以外の編集では再ビルドしない。
+references / related_docs のファイルパス（バリデーションで実在を確認するもの）は 'exists:' 付きのキーで記録し、
+参照先が消えたらスキップせずに再検証する。
+記録した入力を逆引きした依存グラフ（reverse_dependencies）で、変更されたファイルから影響を受ける YAML を求める。
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from config import AI_DOCUMENT_SCHEME_JSON, BUILD_MANIFEST_JSON, CREATE_HUMAN_DOCUMENT_SCRIPT
+from paths import get_build_cache_dir, get_categories_dir, get_doc_type_dir, get_project_root
+
+# マニフェスト形式のバージョン（形式を変えたら上げる。異なる場合は全件再ビルド）
+MANIFEST_VERSION = 5
+
+# 全ドキュメントのビルド結果に影響する共通ファイル（プロジェクトルート相対）
+COMMON_INPUT_FILES = (
+    'common/config.py',
+    'common/paths.py',
+    'common/build_manifest.py',
+    'common/build_trace.py',
+    'common/md_base.py',
+    'common/doc_store.py',
+    'common/parsed_cache.py',
+    'common/workspace_index.py',
+    'common/file_index.py',
+    'common/schema_bundle.py',
+    'common/schema_compiler.py',
+    'common/link_check.py',
+    'common/link_cache.py',
+    'common/tools/validate.py',
+)
+
+# meta だけを読んだ入力のキーの接頭辞（META_INPUT_PREFIX + マニフェストキー）
+META_INPUT_PREFIX = 'meta:'
+
+# 存在だけを確認する入力（references / related_docs のファイルパス）のキーの接頭辞
+EXISTS_INPUT_PREFIX = 'exists:'
+
+# 存在する入力に記録する値（存在しなければ None）
+EXISTS_DIGEST = 'exists'
+
+# パス → ((mtime_ns, size), sha256)。同一プロセス内で同じファイルを何度もハッシュしない
+_sha256_cache: dict[Path, tuple[tuple[int, int], str]] = {}
+
+
+def get_manifest_path() -> Path:
+    """マニフェストファイルの絶対パス"""
+    return get_build_cache_dir() / BUILD_MANIFEST_JSON
+
+
+def to_manifest_key(path: Path) -> str:
+    """マニフェストのキー（プロジェクトルート相対の POSIX パス。ルート外は絶対パス）"""
+    resolved = path.resolve()
+    try:
+        return resolved.relative_to(get_project_root()).as_posix()
+    except ValueError:
+        return resolved.as_posix()
+
+
+def from_manifest_key(key: str) -> Path:
+    """マニフェストのキーを絶対パスに戻す"""
+    return get_project_root() / key
+
+
+def file_sha256(path: Path) -> Optional[str]:
+    """ファイル内容の sha256。存在しなければ None。mtime/size が同じ間はプロセス内でキャッシュする"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _sha256_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    try:
+        digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+    _sha256_cache[path] = (signature, digest)
+    return digest
+
+
+def meta_sha256(path: Path) -> Optional[str]:
+    """
+    YAML の meta（doc_store.load_meta）の sha256。存在しなければ None。
+    meta を解析できなければファイル内容の sha256（どこを編集しても変わったものとして扱う）。
+    """
+    from doc_store import load_meta
+
+    if not os.path.isfile(path):
+        return None
+    try:
+        meta = load_meta(path)
+    except Exception:
+        return file_sha256(path)
+    text = json.dumps(meta, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def to_meta_input_key(path: Path) -> str:
+    """meta だけを読んだ入力のマニフェストキー"""
+    return META_INPUT_PREFIX + to_manifest_key(path)
+
+
+def to_exists_input_key(path: Path) -> str:
+    """存在だけを確認する入力のマニフェストキー"""
+    return EXISTS_INPUT_PREFIX + to_manifest_key(path)
+
+
+def input_file_key(key: str) -> str:
+    """入力キーが指すファイルのマニフェストキー（meta・存在確認の入力は接頭辞を除く）"""
+    for prefix in (META_INPUT_PREFIX, EXISTS_INPUT_PREFIX):
+        if key.startswith(prefix):
+            return key[len(prefix):]
+    return key
+
+
+def input_digest(key: str) -> Optional[str]:
+    """
+    入力キーの現在のハッシュ（meta の入力は meta_sha256、存在確認の入力は存在すれば EXISTS_DIGEST、
+    それ以外は file_sha256）
+    """
+    path = from_manifest_key(input_file_key(key))
+    if key.startswith(META_INPUT_PREFIX):
+        return meta_sha256(path)
+    if key.startswith(EXISTS_INPUT_PREFIX):
+        return EXISTS_DIGEST if os.path.exists(path) else None
+    return file_sha256(path)
+
+
+def _collect_ref_files(schema, base_dir: Path, found: set[Path]) -> None:
+    """スキーマ内の外部 $ref（ファイル参照）を再帰的にたどり found に追加する"""
+    if isinstance(schema, dict):
+        for key, value in schema.items():
+            if key == '$ref' and isinstance(value, str) and not value.startswith('#'):
+                ref_path = value.partition('#')[0]
+                if ref_path.startswith('file:'):
+                    continue
+                target = (base_dir / ref_path).resolve()
+                if target not in found and target.exists():
+                    found.add(target)
+                    try:
+                        _collect_ref_files(json.loads(target.read_text(encoding='utf-8')), target.parent, found)
+                    except (OSError, ValueError):
+                        pass
+            else:
+                _collect_ref_files(value, base_dir, found)
+    elif isinstance(schema, list):
+        for item in schema:
+            _collect_ref_files(item, base_dir, found)
+
+
+def collect_schema_files(schema_path: Path) -> list[Path]:
+    """scheme.json と、その $ref がたどる全スキーマファイル（common/scheme.json 等）を返す"""
+    found = {schema_path.resolve()}
+    try:
+        schema = json.loads(schema_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return sorted(found)
+    _collect_ref_files(schema, schema_path.resolve().parent, found)
+    return sorted(found)
+
+
+def collect_input_files(yaml_path: Path, category: str, doc_type: str) -> list[Path]:
+    """YAML 1 件のビルド結果に影響する入力ファイル一覧を返す"""
+    doc_type_dir = get_doc_type_dir(category, doc_type)
+    inputs = [yaml_path.resolve()]
+    inputs.extend(collect_schema_files(doc_type_dir / AI_DOCUMENT_SCHEME_JSON))
+    inputs.append(doc_type_dir / CREATE_HUMAN_DOCUMENT_SCRIPT)
+    inputs.extend(get_project_root() / p for p in COMMON_INPUT_FILES)
+    return inputs
+
+
+def expand_dependency_globs(patterns) -> list[Path]:
+    """DOCUMENT_DEPENDENCIES・DOCUMENT_META_DEPENDENCIES の glob（categories 相対）を現在存在するファイルに展開する"""
+    categories_dir = get_categories_dir()
+    found = set()
+    for pattern in patterns:
+        found.update(p.resolve() for p in categories_dir.glob(pattern) if p.is_file())
+    return sorted(found)
+
+
+def hash_input_files(paths: list[Path]) -> dict[str, Optional[str]]:
+    """入力ファイル一覧を {マニフェストキー: sha256} にする"""
+    return {to_manifest_key(p): file_sha256(p) for p in paths}
+
+
+def hash_meta_inputs(paths: list[Path]) -> dict[str, Optional[str]]:
+    """meta だけを読む入力の一覧を {META_INPUT_PREFIX 付きのキー: meta の sha256} にする"""
+    return {to_meta_input_key(p): meta_sha256(p) for p in paths}
+
+
+def hash_exists_inputs(paths: list[Path]) -> dict[str, Optional[str]]:
+    """存在だけを確認する入力の一覧を {EXISTS_INPUT_PREFIX 付きのキー: EXISTS_DIGEST（存在しなければ None）} にする"""
+    return {to_exists_input_key(p): EXISTS_DIGEST if os.path.exists(p) else None for p in paths}
+
+
+def load_manifest() -> dict:
+    """マニフェストを読み込む。存在しない・壊れている・版が違う場合は空のマニフェストを返す"""
+    path = get_manifest_path()
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        data = None
+    if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'documents': {}}
+    data.setdefault('documents', {})
+    return data
+
+
+def save_manifest(manifest: dict) -> None:
+    """マニフェストを一時ファイル経由で書き込む（途中で中断されても壊れないように）"""
+    path = get_manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True), encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def is_up_to_date(manifest: dict, yaml_path: Path, validate_only: bool = False, link_check: bool = False) -> bool:
+    """
+    前回成功時から入力（と validate_only でなければ出力）が変わっていなければ True。
+    記録済みの入力は YAML・scheme.json・$ref 先・スクリプトを含むため、YAML 本体を解析せずに判定できる。
+    link_check（今回 GitHub リンクを確認する）なのに、前回の成功がリンク確認なし（--skip-link-check）なら False。
+    """
+    entry = manifest['documents'].get(to_manifest_key(yaml_path))
+    if not entry:
+        return False
+    if link_check and not entry.get('link_checked'):
+        return False
+    inputs = entry.get('inputs', {})
+    for key, digest in inputs.items():
+        if digest is None or input_digest(key) != digest:
+            return False
+    # 宣言された依存に新しく一致するファイル（doc_type の追加等）があれば再ビルドする
+    for path in expand_dependency_globs(entry.get('dependency_globs', ())):
+        if to_manifest_key(path) not in inputs:
+            return False
+    for path in expand_dependency_globs(entry.get('meta_dependency_globs', ())):
+        if to_meta_input_key(path) not in inputs:
+            return False
+    if validate_only:
+        return True
+    output_key, output_digest = entry.get('output'), entry.get('output_sha256')
+    if not output_key or not output_digest:
+        return False
+    return file_sha256(from_manifest_key(output_key)) == output_digest
+
+
+def record_success(
+    manifest: dict,
+    yaml_path: Path,
+    inputs: dict[str, Optional[str]],
+    output_path: Optional[Path],
+    dependency_globs=(),
+    document_reads=(),
+    link_checked: bool = False,
+    meta_dependency_globs=(),
+    document_meta_reads=(),
+) -> None:
+    """
+    成功した YAML の入力ハッシュ（ビルド開始前に計算したもの）と出力ハッシュを記録する。
+    document_reads（変換中に読まれた他ドキュメント）は入力に追加する。
+    document_meta_reads（変換中に meta だけを読まれた他ドキュメント）は meta のハッシュを入力に追加する。
+    link_checked は GitHub リンクも確認して成功したか（False なら、リンクを確認するビルドではスキップしない）。
+    output_path が None（バリデーションのみ）のときは、入力が同じなら前回の出力記録を引き継ぐ。
+    """
+    key = to_manifest_key(yaml_path)
+    previous = manifest['documents'].get(key) or {}
+    inputs = dict(inputs)
+    for path in document_reads:
+        inputs.setdefault(to_manifest_key(Path(path)), file_sha256(Path(path)))
+    for path in document_meta_reads:
+        inputs.setdefault(to_meta_input_key(Path(path)), meta_sha256(Path(path)))
+    entry = {
+        'inputs': inputs,
+        'dependency_globs': list(dependency_globs),
+        'meta_dependency_globs': list(meta_dependency_globs),
+        'output': None,
+        'output_sha256': None,
+        'link_checked': link_checked,
+    }
+    if output_path is not None:
+        entry['output'] = to_manifest_key(output_path)
+        entry['output_sha256'] = file_sha256(output_path)
+    elif previous.get('inputs', {}).items() >= inputs.items():
+        entry['output'] = previous.get('output')
+        entry['output_sha256'] = previous.get('output_sha256')
+    manifest['documents'][key] = entry
+
+
+def forget(manifest: dict, yaml_path: Path) -> None:
+    """失敗した YAML の記録を消す（次回は必ず再ビルドする）"""
+    manifest['documents'].pop(to_manifest_key(yaml_path), None)
+
+
+def reverse_dependencies(manifest: dict) -> dict[str, set[str]]:
+    """
+    記録済みの入力を逆引きし、{入力ファイルのキー: その入力に依存する YAML キーの集合} を返す。
+    meta だけを読んだ入力もファイルのキーにまとめる（meta が変わったかは is_up_to_date が判定する）。
+    """
+    graph: dict[str, set[str]] = {}
+    for doc_key, entry in manifest['documents'].items():
+        for input_key in entry.get('inputs', {}):
+            graph.setdefault(input_file_key(input_key), set()).add(doc_key)
+    return graph
+
+
+def affected_documents(manifest: dict, changed_paths) -> set[str]:
+    """
+    変更されたファイル群から、再ビルドが必要な YAML キーを返す。
+    記録済みの依存グラフに加え、宣言された glob に一致する新規ファイルの依存元も含める。
+    """
+    graph = reverse_dependencies(manifest)
+    changed_keys = {to_manifest_key(Path(p)) for p in changed_paths}
+    affected = set()
+    for key in changed_keys:
+        affected.update(graph.get(key, ()))
+    categories_dir = get_categories_dir()
+    for doc_key, entry in manifest['documents'].items():
+        for pattern in (*entry.get('dependency_globs', ()), *entry.get('meta_dependency_globs', ())):
+            for key in changed_keys:
+                path = from_manifest_key(key)
+                try:
+                    rel = path.relative_to(categories_dir)
+                except ValueError:
+                    continue
+                if rel.match(pattern):
+                    affected.add(doc_key)
+    return affected
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+ビルドのフェーズ別計測（スパン）。
+build.py の --timings / --trace で有効にすると、ドキュメントごとに
+YAML 解析・スキーマ読み込み（$ref 解決）・jsonschema 検証・GitHub リンク確認・Markdown 生成・書き込み等の
+所要時間を記録し、遅いドキュメント / フェーズの表や Chrome trace-event 形式の JSON（Perfetto で開ける）を出力する。
+
+無効時の span() は共有の nullcontext を返すだけなので、計測箇所のコストはほぼゼロ。
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Optional
+
+# 記録中のイベント。None のときは計測無効
+_events: Optional[list[dict]] = None
+
+# 現在処理中のドキュメント（span の doc を省略したときに使う）
+_current_doc: Optional[str] = None
+
+_NULL_SPAN = nullcontext()
+
+# ドキュメント全体のスパン名（フェーズ別集計からは除く）
+DOCUMENT_SPAN = 'document'
+
+
+def enable() -> None:
+    """計測を有効にする（記録済みのイベントは破棄する）"""
+    global _events
+    _events = []
+
+
+def is_enabled() -> bool:
+    return _events is not None
+
+
+def span(name: str, doc: Optional[str] = None):
+    """
+    フェーズ name の所要時間を記録するコンテキストマネージャ。
+    doc を省略すると document() で設定中のドキュメントに紐づける。
+    """
+    if _events is None:
+        return _NULL_SPAN
+    return _record_span(name, doc)
+
+
+@contextmanager
+def _record_span(name: str, doc: Optional[str]):
+    started = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        ended = time.perf_counter_ns()
+        if _events is not None:
+            _events.append({
+                'name': name,
+                'doc': doc if doc is not None else _current_doc,
+                'ts': started // 1000,
+                'dur': (ended - started) // 1000,
+                'pid': os.getpid(),
+            })
+
+
+@contextmanager
+def document(doc: str):
+    """ブロック内のスパンを doc に紐づけ、ブロック全体を 'document' スパンとして記録する"""
+    global _current_doc
+    if _events is None:
+        yield
+        return
+    previous = _current_doc
+    _current_doc = doc
+    try:
+        with span(DOCUMENT_SPAN, doc):
+            yield
+    finally:
+        _current_doc = previous
+
+
+def take_events() -> list[dict]:
+    """記録済みのイベントを取り出して空にする（--jobs のワーカーが親プロセスへ返す用）"""
+    if _events is None:
+        return []
+    events = list(_events)
+    _events.clear()
+    return events
+
+
+def add_events(events: list[dict]) -> None:
+    """別プロセスで記録したイベントを合算する"""
+    if _events is not None:
+        _events.extend(events)
+
+
+def format_summary(top: int = 10) -> list[str]:
+    """遅いドキュメント・遅いフェーズの表（所要時間の降順）を出力行で返す"""
+    events = _events or []
+    by_doc: dict[str, int] = {}
+    by_phase: dict[str, list[int]] = {}
+    for event in events:
+        if event['name'] == DOCUMENT_SPAN:
+            by_doc[event['doc']] = by_doc.get(event['doc'], 0) + event['dur']
+        else:
+            total = by_phase.setdefault(event['name'], [0, 0])
+            total[0] += event['dur']
+            total[1] += 1
+    lines = [f"⏱️  遅いドキュメント（上位 {top} 件）"]
+    for doc, dur in sorted(by_doc.items(), key=lambda item: -item[1])[:top]:
+        lines.append(f"  {dur / 1000:9.1f} ms  {doc}")
+    if not by_doc:
+        lines.append("  （なし）")
+    lines.append("⏱️  フェーズ別の合計（入れ子のフェーズは親にも含まれる）")
+    for name, (dur, count) in sorted(by_phase.items(), key=lambda item: -item[1][0]):
+        lines.append(f"  {dur / 1000:9.1f} ms  {name}（{count} 回）")
+    if not by_phase:
+        lines.append("  （なし）")
+    return lines
+
+
+def write_chrome_trace(path: Path) -> None:
+    """Chrome trace-event 形式（完了イベント ph=X）で書き出す"""
+    trace_events = []
+    for event in _events or []:
+        trace_events.append({
+            'name': event['name'] if event['name'] != DOCUMENT_SPAN else (event['doc'] or DOCUMENT_SPAN),
+            'cat': event['name'],
+            'ph': 'X',
+            'ts': event['ts'],
+            'dur': event['dur'],
+            'pid': event['pid'],
+            'tid': event['pid'],
+            'args': {'doc': event['doc']} if event['doc'] else {},
+        })
+    for pid in sorted({event['pid'] for event in trace_events}):
+        label = 'build.py' if pid == os.getpid() else f'worker {pid}'
+        trace_events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': pid, 'args': {'name': label}})
+    Path(path).write_text(
+        json.dumps({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, ensure_ascii=False),
+        encoding='utf-8',
+    )
@@ -18,3 +18,57 @@ AI_DOCUMENT_SCHEME_JSON = "ai/scheme.json"
 
 # リンクチェック対象の GitHub ホスト（validate.py の 404 チェックで使用）
 GITHUB_LINK_CHECK_HOSTS = ("github.com", "raw.githubusercontent.com")
+
+# ビルドキャッシュ等を置くディレクトリ（プロジェクトルート相対、git 管理外）
+BUILD_CACHE_DIR = ".yaml-bridge"
+
+# インクリメンタルビルド用マニフェスト（BUILD_CACHE_DIR 配下）
+BUILD_MANIFEST_JSON = "build-manifest.json"
+
+# ビルドデーモンの Unix ドメインソケット（BUILD_CACHE_DIR 配下）
+BUILD_DAEMON_SOCKET = "build.sock"
+
+# GitHub リンクチェックの同時接続数・全体の制限時間（秒）・レート制限時の再試行回数（common/link_check.py）
+LINK_CHECK_CONCURRENCY = 8
+LINK_CHECK_DEADLINE_SECONDS = 60
+LINK_CHECK_MAX_RETRIES = 2
+
+# リンクチェックの送信先を差し替える環境変数（例: http://127.0.0.1:8000。ローカルの代替サーバーで試す用）
+LINK_CHECK_BASE_URL_ENV = "YAML_BRIDGE_LINK_CHECK_BASE_URL"
+
+# リンクチェック結果のキャッシュ（BUILD_CACHE_DIR 配下の SQLite）と有効期間（秒）
+# 正常（2xx / 3xx）は長め、404 は直されることがあるため短めに保持する。
+# それ以外（403・429・5xx 等）は一時的な失敗の可能性があるためキャッシュしない
+LINK_CACHE_SQLITE = "linkcache.sqlite"
+LINK_CACHE_POSITIVE_TTL_SECONDS = 7 * 24 * 60 * 60
+LINK_CACHE_NEGATIVE_TTL_SECONDS = 60 * 60
+
+# 設定するとリンクチェックのキャッシュを使わず再確認する環境変数（build.py / validate.py の --refresh-links が設定）
+LINK_CACHE_REFRESH_ENV = "YAML_BRIDGE_REFRESH_LINKS"
+
+# プロジェクトのファイルインデックス（common/file_index.py）の保存先（BUILD_CACHE_DIR 配下）と、
+# 走査せず os.path.exists で確認するディレクトリ名
+FILE_INDEX_JSON = "file-index.json"
+FILE_INDEX_SKIP_DIRS = (".git", BUILD_CACHE_DIR, "__pycache__")
+
+# schema_compiler が生成した検証コードのキャッシュ（BUILD_CACHE_DIR 配下。スキーマ一式のハッシュ.py）
+VALIDATOR_CACHE_DIR = "validators"
+
+# $ref を展開済みのスキーマ束（common/tools/bundle_schemas.py が BUILD_CACHE_DIR 配下に書き出す）
+SCHEMA_BUNDLE_DIR = "schemas"
+
+# validate.py の --max-errors / --fail-fast で、表示しきれなかったエラーを数える上限
+# （これを超えたら検証を打ち切り、省略した件数は「N 件以上」と表示する）
+SUPPRESSED_ERROR_COUNT_LIMIT = 1000
+
+# 解析済み YAML のディスクキャッシュ（common/parsed_cache.py。BUILD_CACHE_DIR 配下）と合計サイズの上限（バイト）
+# 上限を超えたら最後に使った時刻が古いものから削除する
+PARSED_CACHE_DIR = "parsed"
+PARSED_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# 設定すると解析済み YAML のディスクキャッシュを使わない環境変数
+PARSED_CACHE_DISABLE_ENV = "YAML_BRIDGE_NO_PARSED_CACHE"
+
+# ワークスペースのマニフェスト（common/workspace_index.py）の保存先（BUILD_CACHE_DIR 配下）と記録する meta のキー
+WORKSPACE_INDEX_JSON = "workspace-index.json"
+WORKSPACE_INDEX_META_FIELDS = ("doc_type", "title", "status", "version", "updated_at")
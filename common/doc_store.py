@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+解析済み YAML ドキュメントの共有ストア（プロセス内）。
+ビルド中は同じ YAML を category/doc_type の検出・バリデーション・Markdown 生成・
+他ドキュメントの集約（WBS・project_summary 等）で何度も読むため、
+(絶対パス, mtime_ns, size) が同じ間は 1 回だけ解析し、同じ解析結果を返す。
+
+返す解析結果は全利用者で共有されるため読み取り専用として扱うこと（変更する場合はコピーする）。
+
+解析には PyYAML が libyaml 付きでビルドされていれば yaml.CSafeLoader（C 実装）を使い、
+無ければ yaml.SafeLoader（純 Python）を使う。どちらも yaml.safe_load と同じ解析結果になる
+（python3 common/tools/check_yaml_loader.py で categories/ 配下の全 YAML について確認できる）。
+
+プロセス内のストアに無い YAML は、同じ内容の解析結果がディスクキャッシュ（common/parsed_cache.py）にあれば
+解析せずに読み込む（新しいプロセスでも解析を省ける）。
+
+load_meta() は meta だけが必要な処理（category/doc_type の検出・タイトルの一覧等）用で、
+PyYAML のイベント API で先頭の meta を読み終えたところで解析をやめる（文書の残りは読まない）。
+"""
+
+import io
+import os
+
+import build_trace
+
+# 絶対パス → ((mtime_ns, size), 解析結果)
+_documents: dict[str, tuple[tuple[int, int], object]] = {}
+
+# 解析に使うローダー（get_yaml_loader で初回に決める）
+_loader = None
+
+# 絶対パス → ((mtime_ns, size), meta)。load_meta で先頭の meta だけを解析した結果
+_metas: dict[str, tuple[tuple[int, int], object]] = {}
+
+# parses: 実際に YAML を解析した回数 / hits: ストアの解析結果を再利用した回数 /
+# disk_hits: ディスクキャッシュから読み込んだ回数 / probes: meta だけを解析した回数
+_stats = {'parses': 0, 'hits': 0, 'disk_hits': 0, 'probes': 0}
+
+
+def get_yaml_loader(pure_python: bool = False):
+    """
+    YAML の解析に使うローダーを返す。libyaml があれば yaml.CSafeLoader、無ければ yaml.SafeLoader。
+    pure_python=True なら常に yaml.SafeLoader（比較・確認用）。
+    """
+    global _loader
+    import yaml  # 解析するときだけ読み込む（ストアの解析結果だけを使う処理では不要）
+
+    if pure_python:
+        return yaml.SafeLoader
+    if _loader is None:
+        _loader = getattr(yaml, 'CSafeLoader', None) or yaml.SafeLoader
+    return _loader
+
+
+def parse_yaml(stream, pure_python: bool = False) -> object:
+    """yaml.safe_load と同じ解析を get_yaml_loader のローダーで行う（ストアを通さない）"""
+    import yaml
+
+    return yaml.load(stream, Loader=get_yaml_loader(pure_python))
+
+
+def _loader_version() -> str:
+    """ディスクキャッシュのキーに含めるローダーの版（PyYAML の版とローダー）"""
+    import yaml
+
+    loader = get_yaml_loader()
+    return f"{yaml.__version__}|{loader.__module__}.{loader.__qualname__}"
+
+
+def load_document(file_path) -> object:
+    """
+    YAML を読み込む。前回の解析から mtime_ns・size が変わっていなければ同じ解析結果を返す。
+    ストアに無ければ、同じ内容の解析結果がディスクキャッシュにあればそれを読み込み、無ければ解析して保存する。
+    ファイルが無い・解析できない場合は open / yaml.safe_load と同じ例外（yaml.YAMLError 等）を送出する（失敗は記録しない）。
+    """
+    abs_path = os.path.abspath(file_path)
+    st = os.stat(abs_path)
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _documents.get(abs_path)
+    if cached is not None and cached[0] == signature:
+        _stats['hits'] += 1
+        return cached[1]
+    import parsed_cache  # hashlib・pickle は YAML を読むときだけ読み込む
+
+    with open(abs_path, 'rb') as f:
+        content = f.read()
+    key = parsed_cache.cache_key(content, _loader_version()) if parsed_cache.is_enabled() else None
+    found = False
+    if key is not None:
+        with build_trace.span('parse_cache'):
+            found, data = parsed_cache.load(key)
+    if found:
+        _stats['disk_hits'] += 1
+    else:
+        # open(abs_path, encoding='utf-8') と同じ読み方（エラーの位置表示のためファイル名も付ける）
+        raw = io.BytesIO(content)
+        raw.name = abs_path
+        with build_trace.span('parse'):
+            data = parse_yaml(io.TextIOWrapper(raw, encoding='utf-8'))
+        _stats['parses'] += 1
+        if key is not None:
+            parsed_cache.store(key, data)
+    _documents[abs_path] = (signature, data)
+    return data
+
+
+def _compose_node(loader, anchors: dict):
+    """
+    loader のイベントを 1 ノード分読んでノードを組み立てる（yaml.composer.Composer.compose_node と同じ規則。
+    CSafeLoader は Composer を Python で持たないため、イベントから組み立てる）。
+    """
+    import yaml
+
+    event = loader.get_event()
+    if isinstance(event, yaml.AliasEvent):
+        if event.anchor not in anchors:
+            raise yaml.composer.ComposerError(None, None, f"found undefined alias {event.anchor!r}", event.start_mark)
+        return anchors[event.anchor]
+    if event.anchor is not None and event.anchor in anchors:
+        raise yaml.composer.ComposerError(
+            f"found duplicate anchor {event.anchor!r}; first occurrence", anchors[event.anchor].start_mark,
+            "second occurrence", event.start_mark,
+        )
+    tag = event.tag
+    if isinstance(event, yaml.ScalarEvent):
+        if tag is None or tag == '!':
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        return node
+    if isinstance(event, yaml.SequenceStartEvent):
+        node_class, end_event = yaml.SequenceNode, yaml.SequenceEndEvent
+    else:
+        node_class, end_event = yaml.MappingNode, yaml.MappingEndEvent
+    if tag is None or tag == '!':
+        tag = loader.resolve(node_class, None, event.implicit)
+    node = node_class(tag, [], event.start_mark, None, flow_style=event.flow_style)
+    if event.anchor is not None:
+        anchors[event.anchor] = node
+    while not loader.check_event(end_event):
+        if node_class is yaml.SequenceNode:
+            node.value.append(_compose_node(loader, anchors))
+        else:
+            key = _compose_node(loader, anchors)
+            node.value.append((key, _compose_node(loader, anchors)))
+    node.end_mark = loader.get_event().end_mark
+    return node
+
+
+def _probe_meta(stream) -> tuple[bool, object]:
+    """
+    文書がトップレベルのマッピングで先頭のキーが meta なら、meta の値だけを解析して (True, meta) を返す
+    （meta の終わりで解析をやめる）。そうでなければ (False, None)（呼び出し側で全体を解析する）。
+    """
+    import yaml
+
+    loader = get_yaml_loader()(stream)
+    try:
+        for event_class in (yaml.StreamStartEvent, yaml.DocumentStartEvent, yaml.MappingStartEvent):
+            if not loader.check_event(event_class):
+                return False, None
+            event = loader.get_event()
+        if event.tag not in (None, '!', 'tag:yaml.org,2002:map') or not loader.check_event(yaml.ScalarEvent):
+            return False, None
+        key = loader.get_event()
+        if key.value != 'meta' or key.anchor is not None or key.tag not in (None, '!', 'tag:yaml.org,2002:str'):
+            return False, None
+        return True, loader.construct_document(_compose_node(loader, {}))
+    finally:
+        loader.dispose()
+
+
+def load_meta(file_path) -> object:
+    """
+    YAML の meta（トップレベルの meta の値。無ければ {}）を返す。
+    全体の解析結果がストアにあればその meta を返し、無ければ先頭の meta だけを解析する（文書の残りは読まない）。
+    meta が先頭のキーでない文書は全体を解析する（load_document と同じくストアに入る）。
+    先頭の meta の後ろに構文エラーや同じ meta キーがあっても、先頭の meta を返す。
+    ファイルが無い・meta を解析できない場合は load_document と同じ例外を送出する。
+    """
+    abs_path = os.path.abspath(file_path)
+    st = os.stat(abs_path)
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _documents.get(abs_path)
+    if cached is None or cached[0] != signature:
+        cached = _metas.get(abs_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with build_trace.span('parse_meta'), open(abs_path, 'r', encoding='utf-8') as f:
+            found, meta = _probe_meta(f)
+        if found:
+            _stats['probes'] += 1
+            _metas[abs_path] = (signature, meta)
+            return meta
+    data = load_document(abs_path)
+    return data.get('meta', {}) if isinstance(data, dict) else {}
+
+
+def get_stats() -> dict[str, int]:
+    """{'parses': 解析回数, 'hits': 再利用回数, 'disk_hits': ディスクキャッシュから読んだ回数, 'probes': meta だけの解析回数} を返す"""
+    return dict(_stats)
+
+
+def add_stats(stats: dict[str, int]) -> None:
+    """別プロセス（--jobs のワーカー等）で数えた解析回数をこのプロセスの統計に合算する"""
+    for key in _stats:
+        _stats[key] += stats.get(key, 0)
+
+
+def clear() -> None:
+    """保持している解析結果と統計を破棄する"""
+    _documents.clear()
+    _metas.clear()
+    for key in _stats:
+        _stats[key] = 0
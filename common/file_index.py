@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+プロジェクト内のファイル一覧（ファイルインデックス）。
+references / related_docs のファイルパスや human/document.md の相対リンクの存在確認で、
+参照ごとに resolve() / exists()（複数回の stat）を呼ぶ代わりに、os.scandir で 1 回走査した一覧を引く。
+
+- ディレクトリごとに (mtime_ns, エントリ名) を保持する。エントリの追加・削除・名前変更は
+  そのディレクトリの mtime を変えるため、refresh() では既知のディレクトリを stat し、mtime が変わったものだけ走査し直す
+- persist=True で BUILD_CACHE_DIR/FILE_INDEX_JSON に保存し、次回の実行は読み込み + mtime 確認だけで済ませる
+- パスの `..` / `.` は字句的に正規化する（シンボリックリンクは辿らない）
+- 一覧に無いパス（FILE_INDEX_SKIP_DIRS のディレクトリ配下・シンボリックリンク・プロジェクト外・
+  走査後に作られたもの）は従来どおり os.path.exists で確認する
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+from urllib.parse import unquote, urlparse
+
+import build_trace
+from config import FILE_INDEX_JSON, FILE_INDEX_SKIP_DIRS
+from paths import get_build_cache_dir, get_project_root
+
+# 保存形式のバージョン（形式を変えたら上げる）
+FILE_INDEX_VERSION = 1
+
+# 読み込み済みのインデックス。None のときは未作成
+# {'root': プロジェクトルート, 'dirs': {ルート相対のディレクトリ（'/' 区切り、ルートは ''）: (mtime_ns, エントリ名, 走査しないエントリ名)}}
+_index: Optional[dict] = None
+
+# このプロセスで走査したディレクトリ数（確認用）
+_stats = {'scanned_dirs': 0}
+
+
+def get_index_path() -> Path:
+    """保存先（.yaml-bridge/file-index.json）の絶対パス"""
+    return get_build_cache_dir() / FILE_INDEX_JSON
+
+
+def _scan_dir(root: str, rel: str) -> tuple[tuple[int, frozenset, frozenset], list[str]]:
+    """ディレクトリ 1 つを走査して ((mtime_ns, エントリ名, 走査しないエントリ名), 走査するサブディレクトリ名) を返す"""
+    path = os.path.join(root, rel) if rel else root
+    names = []
+    opaque = []
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            names.append(entry.name)
+            if entry.is_symlink() or (entry.name in FILE_INDEX_SKIP_DIRS and entry.is_dir()):
+                opaque.append(entry.name)
+            elif entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
+    _stats['scanned_dirs'] += 1
+    return (os.stat(path).st_mtime_ns, frozenset(names), frozenset(opaque)), subdirs
+
+
+def _scan_tree(root: str, rel: str, dirs: dict) -> None:
+    """rel 以下を走査して dirs に登録する（既に登録済みのサブディレクトリは呼び出し側で確認する）"""
+    pending = [rel]
+    while pending:
+        current = pending.pop()
+        try:
+            dirs[current], subdirs = _scan_dir(root, current)
+        except OSError:
+            _drop_tree(dirs, current)
+            continue
+        for name in subdirs:
+            child = f"{current}/{name}" if current else name
+            if child not in dirs:
+                pending.append(child)
+
+
+def _drop_tree(dirs: dict, rel: str) -> None:
+    """rel とその配下を dirs から除く"""
+    dirs.pop(rel, None)
+    prefix = f"{rel}/"
+    for key in [k for k in dirs if k.startswith(prefix)]:
+        del dirs[key]
+
+
+def _revalidate(root: str, dirs: dict) -> int:
+    """既知のディレクトリを stat し、mtime が変わったものを走査し直す。走査し直した数を返す"""
+    rescanned = 0
+    for rel in sorted(dirs):
+        if rel not in dirs:
+            continue  # 親の走査し直しで消えた
+        path = os.path.join(root, rel) if rel else root
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            _drop_tree(dirs, rel)
+            continue
+        if mtime_ns == dirs[rel][0]:
+            continue
+        old_names = dirs[rel][1]
+        _scan_tree(root, rel, dirs)
+        rescanned += 1
+        new_names = dirs[rel][1] if rel in dirs else frozenset()
+        for name in old_names - new_names:
+            _drop_tree(dirs, f"{rel}/{name}" if rel else name)
+    return rescanned
+
+
+def _load_persisted(root: str) -> Optional[dict]:
+    try:
+        data = json.loads(get_index_path().read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != FILE_INDEX_VERSION or data.get('root') != root:
+        return None
+    try:
+        return {
+            rel: (int(mtime_ns), frozenset(names), frozenset(opaque))
+            for rel, (mtime_ns, names, opaque) in data['dirs'].items()
+        }
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _save_persisted(root: str, dirs: dict) -> None:
+    path = get_index_path()
+    data = {
+        'version': FILE_INDEX_VERSION,
+        'root': root,
+        'dirs': {rel: [mtime_ns, sorted(names), sorted(opaque)] for rel, (mtime_ns, names, opaque) in dirs.items()},
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, path)
+    except OSError:
+        pass  # 保存できなくても次回は作り直すだけ
+
+
+def refresh(persist: bool = False) -> None:
+    """
+    インデックスを最新にする。未作成なら作り（persist=True なら保存済みのものを読み込んで確認し）、
+    作成済みなら mtime が変わったディレクトリだけ走査し直す。
+    ビルド・バリデーションの開始時や、ファイルを書き出した後の確認（MD リンク検証）の前に呼ぶ。
+    """
+    global _index
+    root = os.path.normpath(str(get_project_root()))
+    with build_trace.span('file_index'):
+        if _index is not None and _index['root'] == root:
+            dirs = _index['dirs']
+            changed = _revalidate(root, dirs) > 0
+        else:
+            dirs = _load_persisted(root) if persist else None
+            if dirs is not None and '' in dirs:
+                changed = _revalidate(root, dirs) > 0
+            else:
+                dirs = {}
+                _scan_tree(root, '', dirs)
+                changed = True
+            _index = {'root': root, 'dirs': dirs}
+        if persist and (changed or not get_index_path().exists()):
+            _save_persisted(root, dirs)
+
+
+def _get_index() -> dict:
+    if _index is None:
+        refresh()
+    return _index
+
+
+def exists(path) -> bool:
+    """
+    path（絶対パス）が存在するか。`..` / `.` は字句的に正規化してからインデックスを引く。
+    インデックスに無いパス（プロジェクト外・シンボリックリンク・走査しないディレクトリ配下・
+    走査後に作られたもの）は os.path.exists で確認する。存在しない参照はまれなので、その分の stat は少ない。
+    """
+    normalized = os.path.normpath(str(path))
+    return _in_index(normalized) or os.path.exists(normalized)
+
+
+def _in_index(normalized: str) -> bool:
+    index = _get_index()
+    root = index['root']
+    if normalized == root:
+        return True
+    if not normalized.startswith(root + os.sep):
+        return False
+    dirs = index['dirs']
+    current = ''
+    parts = normalized[len(root) + 1:].split(os.sep)
+    for part in parts[:-1]:
+        entry = dirs.get(current)
+        if entry is None or part not in entry[1] or part in entry[2]:
+            return False
+        current = f"{current}/{part}" if current else part
+    entry = dirs.get(current)
+    return entry is not None and parts[-1] in entry[1] and parts[-1] not in entry[2]
+
+
+def resolve_reference(path_str: str, base: Path) -> Path:
+    """
+    references / related_docs のファイルパスを絶対パスにする（`..` / `.` は字句的に正規化）。
+    - file:// … URL のパス部分（%xx はデコードする）
+    - / 始まり … base（プロジェクトルート）からの相対
+    - それ以外 … base からの相対
+    """
+    s = path_str.strip()
+    if s.lower().startswith('file://'):
+        return Path(os.path.normpath(unquote(urlparse(s).path) or '/'))
+    if s.startswith('/'):
+        return Path(os.path.normpath(os.path.join(str(base), s.lstrip('/'))))
+    return Path(os.path.normpath(os.path.join(str(base), s)))
+
+
+def get_stats() -> dict[str, int]:
+    """{'scanned_dirs': このプロセスで走査したディレクトリ数}"""
+    return dict(_stats)
+
+
+def clear() -> None:
+    """メモリ上のインデックスを破棄する（保存済みのファイルは残す）"""
+    global _index
+    _index = None
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+リンクチェック結果の永続キャッシュ（.yaml-bridge/linkcache.sqlite）。
+URL ごとに HTTP ステータス・確認時刻・ETag / Last-Modified を保持し、実行をまたいで再利用する。
+
+- 有効期間内の結果はネットワークに出ずにそのまま返す（2xx / 3xx は LINK_CACHE_POSITIVE_TTL_SECONDS、
+  404 は LINK_CACHE_NEGATIVE_TTL_SECONDS）。それ以外（403・429・5xx 等の一時的な失敗の可能性があるもの）は
+  記録せず、次回も確認する
+- 期限切れで ETag / Last-Modified がある URL は条件付き HEAD（If-None-Match / If-Modified-Since）で再確認し、
+  304 なら前回のステータスのまま確認時刻だけ更新する
+- refresh（--refresh-links / 環境変数 LINK_CACHE_REFRESH_ENV）指定時はキャッシュを使わず全件確認し直す
+- 確認できなかった URL（ネットワークエラー等で None）は記録しない
+- 送信先を差し替えている（LINK_CHECK_BASE_URL_ENV）間は、差し替え先ごとに別のキーで記録する
+"""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+import link_check
+from config import (
+    LINK_CACHE_NEGATIVE_TTL_SECONDS,
+    LINK_CACHE_POSITIVE_TTL_SECONDS,
+    LINK_CACHE_REFRESH_ENV,
+    LINK_CACHE_SQLITE,
+)
+from paths import get_build_cache_dir
+
+# このプロセスでの内訳。hits: キャッシュから返した / revalidated: 304 で再利用 / fetched: 確認した
+_stats = {'hits': 0, 'revalidated': 0, 'fetched': 0}
+
+
+def get_cache_path() -> Path:
+    """キャッシュファイルの絶対パス"""
+    return get_build_cache_dir() / LINK_CACHE_SQLITE
+
+
+def refresh_requested() -> bool:
+    """環境変数でキャッシュを使わない再確認が指定されているか"""
+    return bool(os.environ.get(LINK_CACHE_REFRESH_ENV))
+
+
+def open_cache(path: Optional[Path] = None) -> sqlite3.Connection:
+    """キャッシュを開く（無ければ作る）。--jobs のワーカー等が同時に書き込めるよう待ち時間付きで開く"""
+    path = path or get_cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS links ("
+        " url TEXT PRIMARY KEY,"
+        " status INTEGER NOT NULL,"
+        " checked_at REAL NOT NULL,"
+        " etag TEXT,"
+        " last_modified TEXT)"
+    )
+    return conn
+
+
+def _ttl(status: int) -> Optional[float]:
+    """ステータスの有効期間（秒）。キャッシュしないステータスは None"""
+    if 200 <= status < 400:
+        return LINK_CACHE_POSITIVE_TTL_SECONDS
+    if status == 404:
+        return LINK_CACHE_NEGATIVE_TTL_SECONDS
+    return None
+
+
+def _cache_key(url: str, base_url: Optional[str]) -> str:
+    """キャッシュのキー。送信先を差し替えているときは本物の結果と混ざらないよう差し替え先を前に付ける"""
+    return f"{base_url} {url}" if base_url else url
+
+
+def check_urls(
+    urls,
+    timeout: float = 5,
+    refresh: bool = False,
+    cache_path: Optional[Path] = None,
+) -> dict[str, Optional[int]]:
+    """
+    URL → HTTP ステータス（確認できなければ None）をキャッシュ経由で返す。
+    有効期間内の URL はキャッシュから、期限切れは条件付きで、未記録・refresh 時は通常の HEAD で確認する。
+    cache_path を省略すると .yaml-bridge/linkcache.sqlite を使う。
+    """
+    unique = list(dict.fromkeys(urls))
+    if not unique:
+        return {}
+    refresh = refresh or refresh_requested()
+    base_url = link_check.get_base_url_override()
+    now = time.time()
+    statuses: dict[str, Optional[int]] = {}
+    cached: dict[str, tuple[int, Optional[str], Optional[str]]] = {}
+    conditional: dict[str, dict[str, str]] = {}
+    try:
+        conn = open_cache(cache_path)
+    except (sqlite3.Error, OSError):
+        conn = None  # キャッシュを開けない（.yaml-bridge/ を作れない等）場合はキャッシュなしで確認する
+    if conn is not None and not refresh:
+        for url in unique:
+            try:
+                row = conn.execute(
+                    "SELECT status, checked_at, etag, last_modified FROM links WHERE url = ?",
+                    (_cache_key(url, base_url),),
+                ).fetchone()
+            except (sqlite3.Error, OSError):
+                conn.close()
+                conn = None  # 読めないキャッシュは使わない（残りはキャッシュなしで確認する）
+                break
+            if row is None:
+                continue
+            status, checked_at, etag, last_modified = row
+            ttl = _ttl(status)
+            if ttl is None:
+                continue  # 以前の版で記録した一時的な失敗等は使わずに確認し直す
+            if now - checked_at < ttl:
+                statuses[url] = status
+                _stats['hits'] += 1
+                continue
+            cached[url] = (status, etag, last_modified)
+            headers = {}
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+            if headers:
+                conditional[url] = headers
+
+    to_check = [url for url in unique if url not in statuses]
+    results = {}
+    if to_check:
+        checker = link_check.LinkChecker(timeout=timeout, base_url=base_url)
+        results = checker.check_detailed(to_check, conditional)
+    rows = []
+    for url in to_check:
+        result = results.get(url)
+        if result is None:
+            statuses[url] = None
+            continue
+        status, headers = result
+        etag, last_modified = headers.get('etag'), headers.get('last-modified')
+        if status == 304 and url in cached:
+            status = cached[url][0]
+            etag = etag or cached[url][1]
+            last_modified = last_modified or cached[url][2]
+            _stats['revalidated'] += 1
+        else:
+            _stats['fetched'] += 1
+        statuses[url] = status
+        if _ttl(status) is not None:
+            rows.append((_cache_key(url, base_url), status, now, etag, last_modified))
+    if conn is not None:
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO links (url, status, checked_at, etag, last_modified) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except (sqlite3.Error, OSError):
+            pass  # 記録できなくても次回確認し直すだけ
+        conn.close()
+    return statuses
+
+
+def get_stats() -> dict[str, int]:
+    """{'hits', 'revalidated', 'fetched'}（このプロセスでの件数）"""
+    return dict(_stats)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+GitHub リンク（references[].url 等）の HEAD チェックを並列に行うエンジン。
+validate.py の run_github_link_check / check_github_url_not_404 から利用する。
+
+- 同時実行数は LINK_CHECK_CONCURRENCY まで（ワーカースレッド数で制限）
+- ワーカーごと・ホストごとに http.client の接続を保持し、HTTP/1.1 keep-alive で使い回す
+- 全体の制限時間（LINK_CHECK_DEADLINE_SECONDS）を超えた URL は確認せず「未確認」（None）とする
+- 固定の sleep ではなく、Retry-After / X-RateLimit-Remaining / X-RateLimit-Reset を見てホスト単位で待つ
+- 環境変数 LINK_CHECK_BASE_URL_ENV（または base_url 引数）で送信先をローカルの代替サーバーに差し替えられる
+
+結果は URL → HTTP ステータス（リダイレクトは追跡後のもの）。ネットワークエラー・タイムアウト・制限時間切れは None。
+check_detailed() は条件付きリクエスト（If-None-Match / If-Modified-Since）を送り、ETag 等も返す（link_cache が利用）。
+"""
+
+import email.utils
+import http.client
+import os
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import urljoin, urlsplit
+
+from config import (
+    LINK_CHECK_BASE_URL_ENV,
+    LINK_CHECK_CONCURRENCY,
+    LINK_CHECK_DEADLINE_SECONDS,
+    LINK_CHECK_MAX_RETRIES,
+)
+
+USER_AGENT = 'Mozilla/5.0 (compatible; doc-validate-link-check/1.0)'
+
+# 追跡するリダイレクトの最大回数
+MAX_REDIRECTS = 5
+
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+# 再利用した keep-alive 接続がサーバー側で閉じられていたときに出る例外（新しい接続で 1 回だけやり直す）
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+def get_base_url_override() -> Optional[str]:
+    """環境変数で指定された送信先（ローカルの代替サーバー等）。未指定なら None"""
+    return os.environ.get(LINK_CHECK_BASE_URL_ENV) or None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After（秒数または HTTP 日付）を待ち秒数にする。解釈できなければ None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def rate_limit_wait(status: int, headers: dict[str, str]) -> Optional[float]:
+    """
+    レート制限の応答なら待つべき秒数を返す（レート制限でなければ None）。
+    429 / 503 + Retry-After、または 403 / 429 で X-RateLimit-Remaining が 0 の応答を対象とする。
+    """
+    retry_after = parse_retry_after(headers.get('retry-after'))
+    exhausted = headers.get('x-ratelimit-remaining') == '0'
+    if status not in (403, 429, 503) or (retry_after is None and not exhausted and status != 429):
+        return None
+    if retry_after is not None:
+        return retry_after
+    reset = headers.get('x-ratelimit-reset', '')
+    if reset.isdigit():
+        return max(0.0, int(reset) - time.time())
+    return 1.0
+
+
+class _HostPacer:
+    """ホストごとの「この時刻まで送らない」を管理する（全ワーカーで共有）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._not_before: dict[str, float] = {}
+
+    def hold(self, host: str, seconds: float) -> None:
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._not_before.get(host, 0.0):
+                self._not_before[host] = until
+
+    def wait(self, host: str, deadline: float) -> bool:
+        """送信可能になるまで待つ。制限時間までに送信可能にならなければ False"""
+        while True:
+            with self._lock:
+                delay = self._not_before.get(host, 0.0) - time.monotonic()
+            if delay <= 0:
+                return True
+            if time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+
+
+class LinkChecker:
+    """
+    URL 群を HEAD で並列に確認する。1 回の check() の間、ワーカーごと・ホストごとの接続を使い回す。
+    base_url を指定すると、URL のパス・クエリはそのままにスキーム・ホスト・ポートだけを差し替えて送る。
+    """
+
+    def __init__(
+        self,
+        concurrency: int = LINK_CHECK_CONCURRENCY,
+        timeout: float = 5,
+        deadline_seconds: float = LINK_CHECK_DEADLINE_SECONDS,
+        max_retries: int = LINK_CHECK_MAX_RETRIES,
+        base_url: Optional[str] = None,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.deadline_seconds = deadline_seconds
+        self.max_retries = max_retries
+        self.base_url = base_url
+        self.connections_opened = 0
+        self.requests_sent = 0
+        self._pacer = _HostPacer()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all_connections: list[http.client.HTTPConnection] = []
+        self._deadline = 0.0
+
+    def check(self, urls) -> dict[str, Optional[int]]:
+        """URL → HTTP ステータス（確認できなければ None）。重複する URL は 1 回だけ確認する"""
+        return {url: result[0] if result else None for url, result in self.check_detailed(urls).items()}
+
+    def check_detailed(
+        self,
+        urls,
+        conditional: Optional[dict[str, dict[str, str]]] = None,
+    ) -> dict[str, Optional[tuple[int, dict[str, str]]]]:
+        """
+        URL → (HTTP ステータス, 最終応答のヘッダー（小文字キー）)。確認できなければ None。
+        conditional に URL → 追加ヘッダー（If-None-Match 等）を渡すと条件付きリクエストにする（304 はそのまま返す）。
+        """
+        unique = list(dict.fromkeys(urls))
+        if not unique:
+            return {}
+        conditional = conditional or {}
+        self._deadline = time.monotonic() + self.deadline_seconds
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(unique))) as executor:
+                results = list(executor.map(lambda url: self._check_one(url, conditional.get(url)), unique))
+        finally:
+            self._close_all()
+        return dict(zip(unique, results))
+
+    def _target(self, url: str) -> tuple[str, str, Optional[int], str]:
+        """(scheme, host, port, パス+クエリ)。base_url 指定時は送信先を差し替える"""
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        origin = urlsplit(self.base_url) if self.base_url else parts
+        return origin.scheme or 'https', origin.hostname or '', origin.port, path
+
+    def _connection(self, scheme: str, host: str, port: Optional[int], fresh: bool = False):
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        key = (scheme, host, port)
+        conn = connections.get(key)
+        if conn is not None and not fresh:
+            return conn, True
+        if conn is not None:
+            conn.close()
+        if scheme == 'https':
+            conn = http.client.HTTPSConnection(host, port, timeout=self.timeout, context=ssl.create_default_context())
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        connections[key] = conn
+        with self._lock:
+            self._all_connections.append(conn)
+            self.connections_opened += 1
+        return conn, False
+
+    def _drop_connection(self, scheme: str, host: str, port: Optional[int]) -> None:
+        conn = self._local.connections.pop((scheme, host, port), None)
+        if conn is not None:
+            conn.close()
+
+    def _head(self, url: str, timeout: float, extra_headers: Optional[dict[str, str]] = None) -> tuple[int, dict[str, str]]:
+        scheme, host, port, path = self._target(url)
+        headers = {'User-Agent': USER_AGENT, 'Connection': 'keep-alive', **(extra_headers or {})}
+        conn, reused = self._connection(scheme, host, port)
+        while True:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            try:
+                with self._lock:
+                    self.requests_sent += 1
+                conn.request('HEAD', path, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+            except _STALE_CONNECTION_ERRORS:
+                if not reused:
+                    self._drop_connection(scheme, host, port)
+                    raise
+                conn, reused = self._connection(scheme, host, port, fresh=True)
+                continue
+            except (OSError, http.client.HTTPException):
+                self._drop_connection(scheme, host, port)
+                raise
+            if resp.will_close:
+                self._drop_connection(scheme, host, port)
+            return resp.status, {k.lower(): v for k, v in resp.getheaders()}
+
+    def _check_one(self, url: str, extra_headers: Optional[dict[str, str]] = None) -> Optional[tuple[int, dict[str, str]]]:
+        current = url
+        redirects = 0
+        retries = 0
+        while True:
+            host = self._target(current)[1]
+            if not self._pacer.wait(host, self._deadline):
+                return None
+            remaining = self._deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                status, headers = self._head(current, min(self.timeout, remaining), extra_headers)
+            except (OSError, http.client.HTTPException):
+                return None
+            wait = rate_limit_wait(status, headers)
+            if wait is not None:
+                self._pacer.hold(host, wait)
+                if retries >= self.max_retries:
+                    return None
+                retries += 1
+                continue
+            if headers.get('x-ratelimit-remaining') == '0':
+                # 残りが 0 になった時点で、以降のリクエストをリセット時刻まで止める
+                self._pacer.hold(host, rate_limit_wait(429, headers) or 0.0)
+            location = headers.get('location')
+            if status in _REDIRECT_STATUSES and location and redirects < MAX_REDIRECTS:
+                redirects += 1
+                current = urljoin(current, location)
+                continue
+            return status, headers
+
+    def _close_all(self) -> None:
+        with self._lock:
+            connections, self._all_connections = self._all_connections, []
+        for conn in connections:
+            conn.close()
+
+
+def check_urls(
+    urls,
+    timeout: float = 5,
+    concurrency: int = LINK_CHECK_CONCURRENCY,
+    deadline_seconds: float = LINK_CHECK_DEADLINE_SECONDS,
+    base_url: Optional[str] = None,
+) -> dict[str, Optional[int]]:
+    """URL 群を並列に HEAD で確認し、URL → HTTP ステータス（確認できなければ None）を返す"""
+    checker = LinkChecker(
+        concurrency=concurrency,
+        timeout=timeout,
+        deadline_seconds=deadline_seconds,
+        base_url=base_url or get_base_url_override(),
+    )
+    return checker.check(urls)
@@ -4,70 +4,82 @@ Markdown生成用の共通ヘルパー関数
 各タイプの create_human_document.py から利用されます。
 """
 
-import argparse
+import functools
 import os
-import yaml
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Callable, Optional
 
-from config import HUMAN_DOCUMENT_MD
+import build_trace
+from config import AI_DOCUMENT_YAML, HUMAN_DOCUMENT_MD
+from doc_store import load_document, load_meta
 from paths import DOC_CATEGORIES, get_category_label
 
-# (category, doc_type) → この doc_type の役割（1行説明）
-DOC_TYPE_ROLE_DESCRIPTIONS: dict[tuple[str, str], str] = {
-    ("overview", "acceptance_sign_off"): "受入条件のサインオフ結果を記録する。",
-    ("overview", "change_log"): "スコープ・計画・体制の変更履歴を記録する。いつ・何を・なぜ変更したか、承認有無を残す。本番リリースの日時・バージョン・変更内容はリリースログを参照する。",
-    ("overview", "decisions"): "プロジェクトで行った重要な決定と理由を記録する。",
-    ("overview", "dependency_external"): "外部システム・サービス・組織への依存を一覧し、リスクを把握する。",
-    ("overview", "document"): "そのカテゴリで他 doc_type に当てはまらない情報用の汎用ドキュメント。",
-    ("overview", "glossary"): "プロジェクトで使う用語の定義を一覧にし、認識のズレを防ぐ。",
-    ("overview", "lessons_learned"): "振り返りで得た教訓を記録し、次に活かす。",
-    ("overview", "open_items"): "プロジェクト全体の検討事項・不明点の目次として使う。各カテゴリの未決事項へリンクする。",
-    ("overview", "project_summary"): "プロジェクトの概要・ゴール・スコープ・ステークホルダー・タイムライン・リスクを一覧にする。",
-    ("overview", "quality_criteria"): "品質・受入基準を明文化する。",
-    ("overview", "release_log"): "本番リリースの日時・バージョン・変更内容を記録する。",
-    ("overview", "risk_register"): "プロジェクトリスクを登録し、影響度と対策を管理する。",
-    ("overview", "stakeholder_raci"): "ステークホルダーと RACI を明示する。",
-    ("overview", "wbs"): "作業分解構成とタスク・マイルストーンを管理する。",
-    ("design", "api_spec"): "API の仕様（エンドポイント・リクエスト/レスポンス）を定義する。",
-    ("design", "architecture"): "システム全体像・コンポーネント境界を明文化する。",
-    ("design", "data_model"): "エンティティとその関係を定義し、要件・アーキテクチャと整合させる。",
-    ("design", "document"): "設計カテゴリで他 doc_type に当てはまらない情報用の汎用ドキュメント。",
-    ("design", "open_items"): "設計フェーズの検討事項・不明点を記録する。",
-    ("design", "requirements"): "要件を整理し、優先度・受け入れ条件を明示する。",
-    ("design", "security_design"): "脅威と対策を明文化し、セキュリティリスクを低減する。",
-    ("design", "tasks"): "設計フェーズの詳細タスクを一覧にする。",
-    ("development", "dependencies"): "ライブラリ・ツール等の依存関係を一覧にする。",
-    ("development", "document"): "開発カテゴリで他 doc_type に当てはまらない情報用の汎用ドキュメント。",
-    ("development", "environment"): "環境・インフラの構成と手順を記述する。",
-    ("development", "implementation_detail"): "実装の詳細（アルゴリズム・処理フロー等）を記述する。",
-    ("development", "implementation_plan"): "実装の計画・手順を記述する。",
-    ("development", "implementation_result"): "実装の結果・変更内容を記録する。",
-    ("development", "incident_postmortem"): "障害の振り返りと再発防止策を記録する。",
-    ("development", "open_items"): "開発フェーズの検討事項・不明点を記録する。",
-    ("development", "pull_request"): "PR の概要・変更内容・レビュー観点を記録する。",
-    ("development", "runbook"): "運用時の手順・トラブルシュートを記述する。",
-    ("development", "tasks"): "開発フェーズの詳細タスクを一覧にする。",
-    ("development", "technical_debt"): "技術的負債を一覧にし、対応方針を管理する。",
-    ("investigation", "code_understanding"): "コードの理解・解析結果を記録する。",
-    ("investigation", "document"): "調査カテゴリで他 doc_type に当てはまらない情報用の汎用ドキュメント。",
-    ("investigation", "domain_knowledge"): "ドメイン知識・業務理解の調査結果を記録する。",
-    ("investigation", "investigation_summary"): "調査のサマリと結論を記録する。",
-    ("investigation", "open_items"): "調査フェーズの検討事項・不明点を記録する。",
-    ("investigation", "related_code_research"): "関連コードの調査結果を記録する。",
-    ("investigation", "tasks"): "調査フェーズの詳細タスクを一覧にする。",
-    ("verification", "document"): "検証カテゴリで他 doc_type に当てはまらない情報用の汎用ドキュメント。",
-    ("verification", "open_items"): "検証フェーズの検討事項・不明点を記録する。",
-    ("verification", "tasks"): "検証フェーズの詳細タスクを一覧にする。",
-    ("verification", "verification_plan"): "動作確認・検証の計画を記述する。",
-    ("verification", "verification_procedure"): "動作確認・検証の手順を記述する。",
-    ("verification", "verification_result"): "動作確認・検証の結果を記録する。",
-}
+
+@functools.lru_cache(maxsize=None)
+def _doc_type_role_descriptions() -> dict[tuple[str, str], str]:
+    """(category, doc_type) → この doc_type の役割（1行説明）。役割の行を出すときに初めて作る（import 時には作らない）"""
+    return {
+        ("overview", "acceptance_sign_off"): "受入条件のサインオフ結果を記録する。",
+        ("overview", "change_log"): "スコープ・計画・体制の変更履歴を記録する。いつ・何を・なぜ変更したか、承認有無を残す。本番リリースの日時・バージョン・変更内容はリリースログを参照する。",
+        ("overview", "decisions"): "プロジェクトで行った重要な決定と理由を記録する。",
+        ("overview", "dependency_external"): "外部システム・サービス・組織への依存を一覧し、リスクを把握する。",
+        ("overview", "document"): "そのカテゴリで他 doc_type に当てはまらない情報用の汎用ドキュメント。",
+        ("overview", "glossary"): "プロジェクトで使う用語の定義を一覧にし、認識のズレを防ぐ。",
+        ("overview", "lessons_learned"): "振り返りで得た教訓を記録し、次に活かす。",
+        ("overview", "open_items"): "プロジェクト全体の検討事項・不明点の目次として使う。各カテゴリの未決事項へリンクする。",
+        ("overview", "project_summary"): "プロジェクトの概要・ゴール・スコープ・ステークホルダー・タイムライン・リスクを一覧にする。",
+        ("overview", "quality_criteria"): "品質・受入基準を明文化する。",
+        ("overview", "release_log"): "本番リリースの日時・バージョン・変更内容を記録する。",
+        ("overview", "risk_register"): "プロジェクトリスクを登録し、影響度と対策を管理する。",
+        ("overview", "stakeholder_raci"): "ステークホルダーと RACI を明示する。",
+        ("overview", "wbs"): "作業分解構成とタスク・マイルストーンを管理する。",
+        ("design", "api_spec"): "API の仕様（エンドポイント・リクエスト/レスポンス）を定義する。",
+        ("design", "architecture"): "システム全体像・コンポーネント境界を明文化する。",
+        ("design", "data_model"): "エンティティとその関係を定義し、要件・アーキテクチャと整合させる。",
+        ("design", "document"): "設計カテゴリで他 doc_type に当てはまらない情報用の汎用ドキュメント。",
+        ("design", "open_items"): "設計フェーズの検討事項・不明点を記録する。",
+        ("design", "requirements"): "要件を整理し、優先度・受け入れ条件を明示する。",
+        ("design", "security_design"): "脅威と対策を明文化し、セキュリティリスクを低減する。",
+        ("design", "tasks"): "設計フェーズの詳細タスクを一覧にする。",
+        ("development", "dependencies"): "ライブラリ・ツール等の依存関係を一覧にする。",
+        ("development", "document"): "開発カテゴリで他 doc_type に当てはまらない情報用の汎用ドキュメント。",
+        ("development", "environment"): "環境・インフラの構成と手順を記述する。",
+        ("development", "implementation_detail"): "実装の詳細（アルゴリズム・処理フロー等）を記述する。",
+        ("development", "implementation_plan"): "実装の計画・手順を記述する。",
+        ("development", "implementation_result"): "実装の結果・変更内容を記録する。",
+        ("development", "incident_postmortem"): "障害の振り返りと再発防止策を記録する。",
+        ("development", "open_items"): "開発フェーズの検討事項・不明点を記録する。",
+        ("development", "pull_request"): "PR の概要・変更内容・レビュー観点を記録する。",
+        ("development", "runbook"): "運用時の手順・トラブルシュートを記述する。",
+        ("development", "tasks"): "開発フェーズの詳細タスクを一覧にする。",
+        ("development", "technical_debt"): "技術的負債を一覧にし、対応方針を管理する。",
+        ("investigation", "code_understanding"): "コードの理解・解析結果を記録する。",
+        ("investigation", "document"): "調査カテゴリで他 doc_type に当てはまらない情報用の汎用ドキュメント。",
+        ("investigation", "domain_knowledge"): "ドメイン知識・業務理解の調査結果を記録する。",
+        ("investigation", "investigation_summary"): "調査のサマリと結論を記録する。",
+        ("investigation", "open_items"): "調査フェーズの検討事項・不明点を記録する。",
+        ("investigation", "related_code_research"): "関連コードの調査結果を記録する。",
+        ("investigation", "tasks"): "調査フェーズの詳細タスクを一覧にする。",
+        ("verification", "document"): "検証カテゴリで他 doc_type に当てはまらない情報用の汎用ドキュメント。",
+        ("verification", "open_items"): "検証フェーズの検討事項・不明点を記録する。",
+        ("verification", "tasks"): "検証フェーズの詳細タスクを一覧にする。",
+        ("verification", "verification_plan"): "動作確認・検証の計画を記述する。",
+        ("verification", "verification_procedure"): "動作確認・検証の手順を記述する。",
+        ("verification", "verification_result"): "動作確認・検証の結果を記録する。",
+    }
+
+
+def __getattr__(name: str):
+    # 以前のモジュール変数 DOC_TYPE_ROLE_DESCRIPTIONS は参照されたときに作る
+    if name == 'DOC_TYPE_ROLE_DESCRIPTIONS':
+        return _doc_type_role_descriptions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_doc_type_role_description(category: str, doc_type: str) -> str:
     """(category, doc_type) に対応する「この doc_type の役割」の 1 行を返す。"""
-    return DOC_TYPE_ROLE_DESCRIPTIONS.get((category, doc_type), "")
+    return _doc_type_role_descriptions().get((category, doc_type), "")
 
 
 def format_empty_section_hint(yaml_key: str = "") -> str:
@@ -122,10 +134,66 @@ def format_meta_dates(meta: dict) -> str:
     return "\n".join(lines) + "\n"
 
 
+# track_document_reads() 実行中の記録先（入れ子可）。(load_yaml で読んだパス, meta だけを読んだパス) の組
+_document_read_trackers: list[tuple[set[str], set[str]]] = []
+
+
+def _record_document_read(file_path, meta_only: bool = False) -> None:
+    if _document_read_trackers:
+        abs_path = os.path.abspath(file_path)
+        for reads, meta_reads in _document_read_trackers:
+            (meta_reads if meta_only else reads).add(abs_path)
+
+
+@contextmanager
+def track_document_reads():
+    """
+    ブロック内で読み込まれた YAML の絶対パスを (load_yaml で全体を読んだもの, meta だけを読んだもの) の組で集める。
+    build.py が変換中に読まれた他ドキュメント（WBS・project_summary の集約等）を依存として記録するのに使う
+    （meta だけを読んだものは meta が変わったときだけ再ビルドする）。
+    """
+    reads: set[str] = set()
+    meta_reads: set[str] = set()
+    tracker = (reads, meta_reads)
+    _document_read_trackers.append(tracker)
+    try:
+        yield tracker
+    finally:
+        _document_read_trackers.remove(tracker)
+
+
 def load_yaml(file_path: str) -> dict:
-    """YAMLファイルを読み込む"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    """
+    YAMLファイルを読み込む。
+    解析結果は doc_store で共有されるため、呼び出し側で変更しないこと。
+    """
+    _record_document_read(file_path)
+    return load_document(file_path)
+
+
+def load_yaml_meta(file_path: str) -> dict:
+    """
+    YAML の meta だけを読み込む（meta.title 等の一覧を作るとき用。先頭の meta の後ろは解析しない）。
+    track_document_reads() には meta だけを読んだものとして記録する。meta がマッピングでなければ {} を返す。
+    """
+    _record_document_read(file_path, meta_only=True)
+    meta = load_meta(file_path)
+    return meta if isinstance(meta, dict) else {}
+
+
+def list_ai_documents() -> list[dict]:
+    """
+    DOC_CATEGORIES の各 doc_type の ai/document.yaml を {'category', 'doc_type', 'path', 'meta'} の一覧で返す
+    （DOC_CATEGORIES 順・doc_type 名順。meta は doc_type・title・status・version・updated_at だけ、解析できなければ None）。
+    ワークスペースのマニフェスト（workspace_index、.yaml-bridge/workspace-index.json）から作るため、ディレクトリを走査せず、
+    変わっていない YAML は解析しない。返したパスは track_document_reads() に meta だけを読んだものとして記録する。
+    """
+    import workspace_index
+
+    documents = workspace_index.get_documents(Path(AI_DOCUMENT_YAML).name)
+    for document in documents:
+        _record_document_read(document['path'], meta_only=True)
+    return documents
 
 
 def format_status(status: str) -> str:
@@ -489,24 +557,71 @@ def generate_document_markdown(data: dict, output_path: Optional[Path] = None) -
     return '\n'.join(lines)
 
 
+def write_text_if_changed(path: Path, text: str) -> bool:
+    """
+    text を UTF-8 で書き込む（テキストモードの改行変換は write_text と同じ）。
+    既存ファイルとサイズ → 内容の順に比較し、同じなら書き込まずに False を返す（mtime を変えない）。
+    異なる場合は同じディレクトリの一時ファイルに書いて os.replace で置き換え、True を返す
+    （中断されても書きかけのファイルが残らない）。
+    """
+    path = Path(path)
+    data = text.replace('\n', os.linesep).encode('utf-8')
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+def render_human_document(
+    generate_markdown_fn: Callable[[dict], str],
+    input_path: str,
+    output: Optional[str] = None,
+) -> tuple[str, bool]:
+    """
+    YAML 読み込み → generate_markdown_fn → 出力（output 指定時）を行い、(生成した Markdown, 出力を更新したか) を返す。
+    出力は内容が変わったときだけ書き込む（write_text_if_changed）。
+    run_create_human_document と build.py の in-process ビルドで共通利用し、出力を一致させる。
+    """
+    data = load_yaml(input_path)
+    output_path = Path(output).resolve() if output else None
+    with build_trace.span('generate'):
+        md = generate_markdown_fn(data, output_path=output_path)
+    changed = False
+    if output:
+        with build_trace.span('write'):
+            changed = write_text_if_changed(Path(output), md)
+    return md, changed
+
+
 def run_create_human_document(generate_markdown_fn: Callable[[dict], str]) -> None:
     """
     create_human_document の共通エントリポイント。
     argparse で input / -o を取得し、YAML 読み込み → generate_markdown_fn → 出力を行う。
     """
+    import argparse
+
     parser = argparse.ArgumentParser()
     parser.add_argument('input')
     parser.add_argument('-o', '--output')
     args = parser.parse_args()
 
-    data = load_yaml(args.input)
-    output_path = Path(args.output).resolve() if args.output else None
-    md = generate_markdown_fn(data, output_path=output_path)
+    md, changed = render_human_document(generate_markdown_fn, args.input, args.output)
 
     if args.output:
-        out_path = Path(args.output)
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(md, encoding='utf-8')
-        print(f"✅ {args.output}")
+        print(f"✅ {args.output}" if changed else f"✅ {args.output}（変更なし）")
     else:
         print(md)
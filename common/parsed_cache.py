@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+解析済み YAML のディスクキャッシュ（.yaml-bridge/parsed/）。
+doc_store.load_document がプロセス内のストアに無い YAML を読むとき、同じ内容の解析結果があれば
+解析せずに読み込む（新しいプロセスでの make build / make validate / 集約の実行でも解析を省ける）。
+
+- キーはファイルの内容とローダーの版（キャッシュ形式・PyYAML の版・ローダー・Python の版）の sha256。
+  内容が同じなら mtime が変わっても（checkout 等）使える。別のファイルでも内容が同じなら同じエントリになる
+- 解析結果は pickle で保存する（日付・集合・エイリアスによる共有もそのまま戻る）。
+  BUILD_CACHE_DIR はプロジェクト内の git 管理外ディレクトリで、このツール以外が書き込む前提はない
+- 合計サイズが PARSED_CACHE_MAX_BYTES を超えたら、最後に使った時刻（エントリの mtime。使うたびに更新する）が
+  古いものから削除する（LRU）
+- 環境変数 PARSED_CACHE_DISABLE_ENV を設定すると使わない
+- 管理は common/tools/cache.py（stats / clear）
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Optional
+
+from config import PARSED_CACHE_DIR, PARSED_CACHE_DISABLE_ENV, PARSED_CACHE_MAX_BYTES
+from paths import get_build_cache_dir
+
+# キャッシュ形式のバージョン（形式を変えたら上げる。キーに含める）
+PARSED_CACHE_VERSION = 1
+
+# エントリの拡張子
+_SUFFIX = '.pickle'
+
+# 上限を超えたとき、合計サイズをこの割合まで減らす（削除のたびに全エントリを見ないよう余裕を持たせる）
+_EVICT_TARGET_RATIO = 0.8
+
+# このプロセスで把握しているキャッシュの合計サイズ（バイト）。None のときは未確認
+_usage: Optional[int] = None
+
+
+def get_cache_dir() -> Path:
+    """キャッシュディレクトリの絶対パス"""
+    return get_build_cache_dir() / PARSED_CACHE_DIR
+
+
+def is_enabled() -> bool:
+    """環境変数で無効にされていないか"""
+    return not os.environ.get(PARSED_CACHE_DISABLE_ENV)
+
+
+def cache_key(content: bytes, loader_version: str) -> str:
+    """ファイルの内容とローダーの版からキーを作る"""
+    version = f"{PARSED_CACHE_VERSION}|{loader_version}|{sys.version_info[0]}.{sys.version_info[1]}"
+    digest = hashlib.sha256(version.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(content)
+    return digest.hexdigest()[:40]
+
+
+def _entry_path(key: str) -> Path:
+    return get_cache_dir() / f"{key}{_SUFFIX}"
+
+
+def load(key: str) -> tuple[bool, object]:
+    """(見つかったか, 解析結果) を返す。見つかったエントリは最後に使った時刻を更新する"""
+    path = _entry_path(key)
+    try:
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+    except FileNotFoundError:
+        return False, None
+    except Exception:
+        # 書きかけ・壊れたエントリは捨てて解析し直す
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        return False, None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return True, data
+
+
+def store(key: str, data) -> None:
+    """解析結果を保存する。保存できなくても（権限・容量等）何もしない"""
+    global _usage
+    try:
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return  # pickle できない値（通常の YAML では起きない）は保存しない
+    if len(payload) > PARSED_CACHE_MAX_BYTES * _EVICT_TARGET_RATIO:
+        return
+    path = _entry_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+    except OSError:
+        return
+    if _usage is None:
+        _usage = sum(size for _, size, _ in _scan_entries())
+    else:
+        _usage += len(payload)
+    if _usage > PARSED_CACHE_MAX_BYTES:
+        evict(int(PARSED_CACHE_MAX_BYTES * _EVICT_TARGET_RATIO))
+
+
+def _scan_entries() -> list[tuple[int, int, str]]:
+    """(最後に使った時刻 mtime_ns, サイズ, パス) の一覧"""
+    entries = []
+    try:
+        with os.scandir(get_cache_dir()) as it:
+            for entry in it:
+                if not entry.name.endswith(_SUFFIX):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def evict(max_bytes: int) -> int:
+    """合計サイズが max_bytes 以下になるまで、最後に使った時刻が古いエントリから削除する。削除した数を返す"""
+    global _usage
+    entries = sorted(_scan_entries())
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass  # 別プロセスが削除済み
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    _usage = total
+    return removed
+
+
+def clear() -> int:
+    """全エントリを削除し、削除した数を返す"""
+    return evict(0)
+
+
+def get_summary() -> dict:
+    """{'entries': エントリ数, 'bytes': 合計サイズ, 'max_bytes': 上限, 'oldest': / 'newest': 最後に使った時刻（epoch 秒。空なら None）}"""
+    entries = _scan_entries()
+    used = [mtime_ns / 1e9 for mtime_ns, _, _ in entries]
+    return {
+        'entries': len(entries),
+        'bytes': sum(size for _, size, _ in entries),
+        'max_bytes': PARSED_CACHE_MAX_BYTES,
+        'oldest': min(used) if used else None,
+        'newest': max(used) if used else None,
+    }
@@ -2,13 +2,19 @@
 """
 プロジェクトルート・カテゴリ・doc_type のパス解決。
 build.py / validate.py / 各 create_human_document.py で共通利用。
+
+カテゴリ・doc_type・ai/ 配下の YAML の一覧（カタログ）は categories/ を os.scandir で 1 回走査して作り、
+プロセス内で使い回す。走査したディレクトリ（categories/・各カテゴリ・各 doc_type・各 ai/）の mtime を記録し、
+呼ばれるたびに stat で確認して、どれかが変わっていれば（doc_type・YAML の追加・削除・名前変更）走査し直す。
 """
 
+import os
 from pathlib import Path
-from typing import Iterator
+from types import MappingProxyType
+from typing import Iterator, Mapping, Optional
 
 # config は paths から見て同階層
-from config import AI_DOCUMENT_SCHEME_JSON, AI_DOCUMENT_YAML, HUMAN_DOCUMENT_MD
+from config import AI_DOCUMENT_SCHEME_JSON, AI_DOCUMENT_YAML, BUILD_CACHE_DIR, HUMAN_DOCUMENT_MD
 
 # カテゴリの表示順・処理順（project_summary / wbs 等で共通利用）
 DOC_CATEGORIES = ('overview', 'design', 'development', 'investigation', 'verification')
@@ -22,6 +28,10 @@ DOC_CATEGORY_LABELS = {
     'verification': '動作確認',
 }
 
+# categories/ の走査結果。None のときは未作成
+# (categories ディレクトリ, ((走査したディレクトリ, mtime_ns), ...), {category: {doc_type: YAML のファイル名}})
+_catalog: Optional[tuple[str, tuple[tuple[str, int], ...], Mapping]] = None
+
 
 def get_project_root() -> Path:
     """common/ の親 = プロジェクトルート"""
@@ -33,33 +43,104 @@ def get_categories_dir() -> Path:
     return get_project_root() / 'categories'
 
 
+def get_build_cache_dir() -> Path:
+    """ビルドキャッシュ（マニフェスト等）を置くディレクトリの絶対パス（.yaml-bridge）"""
+    return get_project_root() / BUILD_CACHE_DIR
+
+
+def _scan_catalog(categories_dir: str) -> tuple[tuple[tuple[str, int], ...], Mapping]:
+    """
+    categories/ を走査し、(走査したディレクトリと mtime_ns, カタログ) を返す。
+    カタログは {category: {doc_type: ai/ 配下の YAML のファイル名（ソート済み）}}（読み取り専用）。
+    ai/scheme.json が無いディレクトリは doc_type に含めない。
+    """
+    scheme_name = os.path.basename(AI_DOCUMENT_SCHEME_JSON)
+    mtimes = []
+    catalog = {}
+    with os.scandir(categories_dir) as it:
+        category_entries = sorted((e.name, e.path) for e in it if e.is_dir())
+    mtimes.append((categories_dir, os.stat(categories_dir).st_mtime_ns))
+    for category, category_path in category_entries:
+        try:
+            with os.scandir(category_path) as it:
+                doc_type_entries = sorted((e.name, e.path) for e in it if e.is_dir())
+            mtimes.append((category_path, os.stat(category_path).st_mtime_ns))
+        except OSError:
+            continue
+        doc_types = {}
+        for doc_type, doc_type_path in doc_type_entries:
+            ai_path = os.path.join(doc_type_path, 'ai')
+            try:
+                with os.scandir(ai_path) as it:
+                    names = [(e.name, e.is_file()) for e in it]
+                mtimes.append((ai_path, os.stat(ai_path).st_mtime_ns))
+            except OSError:
+                # ai/ が無い（作成途中等）。作成を検知するため doc_type ディレクトリの mtime を記録する
+                # （ai/ がある doc_type は ai/ の mtime と存在だけを確認すればよい）
+                try:
+                    mtimes.append((doc_type_path, os.stat(doc_type_path).st_mtime_ns))
+                except OSError:
+                    pass
+                continue
+            if (scheme_name, True) not in names:
+                continue
+            doc_types[doc_type] = tuple(sorted(
+                name for name, is_file in names
+                if is_file and not name.startswith('.') and name.endswith(('.yaml', '.yml'))
+            ))
+        catalog[category] = MappingProxyType(doc_types)
+    return tuple(mtimes), MappingProxyType(catalog)
+
+
+def is_catalog_dirs_fresh(mtimes) -> bool:
+    """(ディレクトリ, mtime_ns) の記録（get_catalog_with_dirs() 等）がすべて今と同じか"""
+    for path, mtime_ns in mtimes:
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def get_catalog() -> Mapping:
+    """
+    {category: {doc_type: ai/ 配下の YAML のファイル名}} を返す（読み取り専用。categories/ が無ければ空）。
+    走査済みのカタログが最新（記録したディレクトリの mtime が同じ）ならそれを返し、そうでなければ走査し直す。
+    """
+    global _catalog
+    categories_dir = str(get_categories_dir())
+    if _catalog is not None and _catalog[0] == categories_dir and is_catalog_dirs_fresh(_catalog[1]):
+        return _catalog[2]
+    try:
+        mtimes, catalog = _scan_catalog(categories_dir)
+    except OSError:
+        _catalog = None
+        return MappingProxyType({})
+    _catalog = (categories_dir, mtimes, catalog)
+    return catalog
+
+
+def get_catalog_with_dirs() -> tuple[Mapping, tuple[tuple[str, int], ...]]:
+    """(get_catalog() の結果, その走査で記録したディレクトリ（絶対パス）と mtime_ns)。カタログが最新かを後で確認するとき用"""
+    catalog = get_catalog()
+    return catalog, (_catalog[1] if _catalog is not None else ())
+
+
+def clear_catalog() -> None:
+    """メモリ上のカタログを破棄する（次に使うときに走査し直す）"""
+    global _catalog
+    _catalog = None
+
+
 def get_available_categories() -> list[str]:
     """ai_document_scheme.json が存在する doc_type を持つカテゴリのみ返す"""
-    categories_dir = get_categories_dir()
-    if not categories_dir.exists():
-        return []
-
-    categories = []
-    for d in categories_dir.iterdir():
-        if d.is_dir() and not d.name.startswith('_'):
-            for sub in d.iterdir():
-                if sub.is_dir() and (sub / AI_DOCUMENT_SCHEME_JSON).exists():
-                    categories.append(d.name)
-                    break
-    return sorted(categories)
+    return [category for category, doc_types in get_catalog().items() if doc_types and not category.startswith('_')]
 
 
 def get_doc_types(category: str) -> list[str]:
     """指定カテゴリ内の doc_type 一覧（スキーマが存在するもののみ）"""
-    category_dir = get_categories_dir() / category
-    if not category_dir.exists():
-        return []
-
-    doc_types = []
-    for d in category_dir.iterdir():
-        if d.is_dir() and (d / AI_DOCUMENT_SCHEME_JSON).exists():
-            doc_types.append(d.name)
-    return sorted(doc_types)
+    return list(get_catalog().get(category, ()))
 
 
 def get_category_label(category: str) -> str:
@@ -69,14 +150,8 @@ def get_category_label(category: str) -> str:
 
 def get_all_category_doc_type_pairs() -> list[tuple[str, str]]:
     """全 (category, doc_type) を DOC_CATEGORIES 順で返す（存在するもののみ）"""
-    available = set(get_available_categories())
-    pairs = []
-    for category in DOC_CATEGORIES:
-        if category not in available:
-            continue
-        for doc_type in get_doc_types(category):
-            pairs.append((category, doc_type))
-    return pairs
+    catalog = get_catalog()
+    return [(category, doc_type) for category in DOC_CATEGORIES for doc_type in catalog.get(category, ())]
 
 
 def get_doc_type_dir(category: str, doc_type: str) -> Path:
@@ -99,8 +174,37 @@ def get_human_document_path(category: str, doc_type: str) -> Path:
     return get_doc_type_dir(category, doc_type) / HUMAN_DOCUMENT_MD
 
 
+def _yaml_files(catalog: Mapping, category: str, doc_type: str) -> list[Path]:
+    ai_dir = get_doc_type_dir(category, doc_type) / 'ai'
+    return [ai_dir / name for name in catalog.get(category, {}).get(doc_type, ()) if not name.startswith("invalid_")]
+
+
+def get_doc_type_yaml_files(category: str, doc_type: str) -> list[Path]:
+    """doc_type の ai/ 配下の検証・ビルド対象 YAML（invalid_ で始まるものを除く）をソートして返す"""
+    return _yaml_files(get_catalog(), category, doc_type)
+
+
+def get_category_yaml_files(category: str) -> list[Path]:
+    """カテゴリ内の全 doc_type の検証・ビルド対象 YAML を doc_type 順に返す"""
+    catalog = get_catalog()
+    return [f for doc_type in catalog.get(category, ()) for f in _yaml_files(catalog, category, doc_type)]
+
+
+def get_all_yaml_files() -> list[Path]:
+    """全カテゴリ（categories/*/*/ai/*.yaml）の検証・ビルド対象 YAML をカテゴリ・doc_type 順に返す"""
+    catalog = get_catalog()
+    return [
+        f
+        for category, doc_types in catalog.items() if doc_types and not category.startswith('_')
+        for doc_type in doc_types
+        for f in _yaml_files(catalog, category, doc_type)
+    ]
+
+
 def iter_doc_type_dirs() -> Iterator[tuple[str, str, Path]]:
     """全 (category, doc_type) について (category, doc_type, 絶対パス) を yield する"""
-    for category in get_available_categories():
-        for doc_type in get_doc_types(category):
+    for category, doc_types in get_catalog().items():
+        if category.startswith('_'):
+            continue
+        for doc_type in doc_types:
             yield category, doc_type, get_doc_type_dir(category, doc_type)
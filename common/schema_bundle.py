@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+$ref を展開済みのスキーマ束（バンドル）。
+各 doc_type の ai/scheme.json を、$ref 先（common/scheme.json#/definitions/... 等）を埋め込んだ 1 つの JSON にして
+BUILD_CACHE_DIR/SCHEMA_BUNDLE_DIR/{category}/{doc_type}.json に書き出す（common/tools/bundle_schemas.py）。
+
+- バンドルには元ファイル（scheme.json と $ref 先）のプロジェクトルート相対パス・sha256・mtime_ns・size を記録する
+- load_fresh_bundle() は mtime・サイズ、違えば sha256 で元ファイルと突き合わせ、最新のときだけスキーマを返す
+  （古い・無い場合は None を返し、呼び出し側は従来どおり scheme.json と $ref を解決して使う）
+- バンドルのスキーマは外部 $ref を含まないため、検証中に Registry の参照やファイルの読み込みが起きない
+- 循環する $ref は埋め込めないため、参照先をバンドルの definitions に移してローカルの $ref（#/definitions/...）にする
+"""
+
+import copy
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+from urllib.parse import unquote, urldefrag, urljoin, urlparse
+
+from config import AI_DOCUMENT_SCHEME_JSON, SCHEMA_BUNDLE_DIR
+from paths import get_all_category_doc_type_pairs, get_build_cache_dir, get_categories_dir, get_doc_type_dir, get_project_root
+
+# バンドルの形式のバージョン（形式を変えたら上げる）
+BUNDLE_VERSION = 1
+
+# 値がスキーマ（またはスキーマの配列・辞書）になるキーワード。これ以外の値（enum・const 等）はそのまま写す
+_SCHEMA_KEYWORDS = ('items', 'additionalItems', 'additionalProperties', 'contains', 'propertyNames', 'not', 'if', 'then', 'else')
+_SCHEMA_LIST_KEYWORDS = ('allOf', 'anyOf', 'oneOf')
+_SCHEMA_MAP_KEYWORDS = ('properties', 'patternProperties', 'definitions', 'dependencies')
+
+# 循環する $ref の参照先を置く definitions のキーの接頭辞
+_BUNDLED_DEFINITION_PREFIX = '__bundled_'
+
+
+def get_bundle_path(category: str, doc_type: str) -> Path:
+    """バンドルの絶対パス（.yaml-bridge/schemas/{category}/{doc_type}.json）"""
+    return get_build_cache_dir() / SCHEMA_BUNDLE_DIR / category / f"{doc_type}.json"
+
+
+def _doc_type_of_schema(schema_path: Path) -> Optional[tuple[str, str]]:
+    """categories/{category}/{doc_type}/ai/scheme.json なら (category, doc_type)。それ以外は None"""
+    try:
+        rel = schema_path.resolve().relative_to(get_categories_dir().resolve())
+    except ValueError:
+        return None
+    parts = rel.parts
+    if len(parts) != 4 or Path(*parts[2:]) != Path(AI_DOCUMENT_SCHEME_JSON):
+        return None
+    return parts[0], parts[1]
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _file_record(path: Path) -> dict:
+    st = path.stat()
+    return {
+        'path': path.resolve().relative_to(get_project_root()).as_posix(),
+        'sha256': _sha256(path),
+        'mtime_ns': st.st_mtime_ns,
+        'size': st.st_size,
+    }
+
+
+def _resolve_pointer(document, pointer: str):
+    value = document
+    if pointer:
+        for token in pointer.lstrip('/').split('/'):
+            token = unquote(token).replace('~1', '/').replace('~0', '~')
+            value = value[int(token)] if isinstance(value, list) else value[token]
+    return value
+
+
+class _Bundler:
+    def __init__(self, root_path: Path):
+        self.root_uri = root_path.resolve().as_uri()
+        self.documents: dict[str, object] = {}
+        self.definitions: dict[str, object] = {}
+        self.cyclic: dict[tuple[str, str], str] = {}
+
+    def document(self, uri: str):
+        if uri not in self.documents:
+            parsed = urlparse(uri)
+            if parsed.scheme != 'file':
+                raise ValueError(f"ファイル以外の $ref は埋め込めません: {uri}")
+            with open(unquote(parsed.path), 'r', encoding='utf-8') as f:
+                self.documents[uri] = json.load(f)
+        return self.documents[uri]
+
+    def inline(self, schema, doc_uri: str, stack: tuple) -> object:
+        if isinstance(schema, list):
+            return [self.inline(item, doc_uri, stack) for item in schema]
+        if not isinstance(schema, dict):
+            return copy.deepcopy(schema)
+        ref = schema.get('$ref')
+        if isinstance(ref, str):
+            # Draft 7 では $ref と並ぶキーワードは無視されるため、参照先で置き換える
+            uri, fragment = urldefrag(urljoin(doc_uri, ref))
+            key = (uri, fragment)
+            if key in self.cyclic and self.cyclic[key] in self.definitions:
+                return {'$ref': f"#/definitions/{self.cyclic[key]}"}
+            if key in stack:
+                if key not in self.cyclic:
+                    self.cyclic[key] = f"{_BUNDLED_DEFINITION_PREFIX}{len(self.cyclic) + 1}"
+                return {'$ref': f"#/definitions/{self.cyclic[key]}"}
+            target = _resolve_pointer(self.document(uri), fragment)
+            inlined = self.inline(target, uri, stack + (key,))
+            if key in self.cyclic and self.cyclic[key] not in self.definitions:
+                self.definitions[self.cyclic[key]] = inlined
+                return {'$ref': f"#/definitions/{self.cyclic[key]}"}
+            return inlined
+        result = {}
+        for keyword, value in schema.items():
+            if keyword in _SCHEMA_KEYWORDS:
+                result[keyword] = self.inline(value, doc_uri, stack)
+            elif keyword in _SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+                result[keyword] = [self.inline(item, doc_uri, stack) for item in value]
+            elif keyword in _SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+                result[keyword] = {name: self.inline(sub, doc_uri, stack) for name, sub in value.items()}
+            else:
+                result[keyword] = copy.deepcopy(value)
+        return result
+
+
+def bundle_schema(schema_path: Path) -> tuple[dict, list[Path]]:
+    """scheme.json の $ref を埋め込んだスキーマと、元ファイル（scheme.json と $ref 先）の一覧を返す"""
+    bundler = _Bundler(schema_path)
+    root = bundler.document(bundler.root_uri)
+    schema = bundler.inline(root, bundler.root_uri, ((bundler.root_uri, ''),))
+    if bundler.definitions:
+        schema.setdefault('definitions', {}).update(bundler.definitions)
+    sources = [Path(unquote(urlparse(uri).path)) for uri in bundler.documents]
+    return schema, sources
+
+
+def write_bundle(category: str, doc_type: str) -> Path:
+    """(category, doc_type) のバンドルを書き出してそのパスを返す"""
+    schema_path = get_doc_type_dir(category, doc_type) / AI_DOCUMENT_SCHEME_JSON
+    schema, sources = bundle_schema(schema_path)
+    data = {
+        'version': BUNDLE_VERSION,
+        'sources': [_file_record(path) for path in sources],
+        'schema': schema,
+    }
+    path = get_bundle_path(category, doc_type)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding='utf-8')
+    os.replace(tmp, path)
+    return path
+
+
+def _read_bundle(category: str, doc_type: str) -> Optional[dict]:
+    try:
+        data = json.loads(get_bundle_path(category, doc_type).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != BUNDLE_VERSION or not isinstance(data.get('schema'), dict):
+        return None
+    return data
+
+
+def _check_sources(data: dict) -> tuple[bool, bool]:
+    """
+    記録された元ファイルと今のファイルを比べ、(内容が同じか, mtime・サイズも同じか) を返す。
+    mtime・サイズが違うファイルだけ sha256 で内容を確認する（checkout 等で mtime だけ変わった場合は内容が同じ）。
+    """
+    root = get_project_root()
+    stat_matched = True
+    try:
+        for source in data['sources']:
+            path = root / source['path']
+            st = path.stat()
+            if (st.st_mtime_ns, st.st_size) == (source['mtime_ns'], source['size']):
+                continue
+            stat_matched = False
+            if st.st_size != source['size'] or _sha256(path) != source['sha256']:
+                return False, False
+    except (OSError, KeyError, TypeError):
+        return False, False
+    return True, stat_matched
+
+
+def is_bundle_fresh(category: str, doc_type: str) -> bool:
+    """バンドルがあり、元ファイルと内容が同じか"""
+    data = _read_bundle(category, doc_type)
+    return data is not None and _check_sources(data)[0]
+
+
+def load_fresh_bundle(schema_path: Path) -> Optional[tuple[dict, list[Path]]]:
+    """
+    scheme.json に対応するバンドルが最新なら (スキーマ, 監視するファイル（バンドルと元ファイル）) を返す。
+    doc_type の scheme.json でない・バンドルが無い・元ファイルが変わっている場合は None。
+    """
+    pair = _doc_type_of_schema(schema_path)
+    if pair is None:
+        return None
+    data = _read_bundle(*pair)
+    if data is None or not _check_sources(data)[0]:
+        return None
+    root = get_project_root()
+    watched = [get_bundle_path(*pair)] + [root / source['path'] for source in data['sources']]
+    return data['schema'], watched
+
+
+def bundle_all(force: bool = False) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+    """
+    全 doc_type のバンドルを最新にし、(書き出した (category, doc_type), 最新だった (category, doc_type)) を返す。
+    元ファイルの mtime だけが変わったバンドルも記録を更新するため書き直す。
+    force なら全件書き出す。doc_type が無くなったバンドルは削除する。
+    """
+    written = []
+    fresh = []
+    expected = set()
+    for category, doc_type in get_all_category_doc_type_pairs():
+        if not (get_doc_type_dir(category, doc_type) / AI_DOCUMENT_SCHEME_JSON).exists():
+            continue
+        expected.add(get_bundle_path(category, doc_type))
+        data = None if force else _read_bundle(category, doc_type)
+        if data is not None and _check_sources(data) == (True, True):
+            fresh.append((category, doc_type))
+            continue
+        write_bundle(category, doc_type)
+        written.append((category, doc_type))
+    bundle_dir = get_build_cache_dir() / SCHEMA_BUNDLE_DIR
+    if bundle_dir.exists():
+        for path in bundle_dir.glob('*/*.json'):
+            if path not in expected:
+                path.unlink()
+    return written, fresh
+
+
+def stale_bundles() -> list[tuple[str, str]]:
+    """バンドルが無い・古い (category, doc_type) の一覧"""
+    return [
+        (category, doc_type)
+        for category, doc_type in get_all_category_doc_type_pairs()
+        if (get_doc_type_dir(category, doc_type) / AI_DOCUMENT_SCHEME_JSON).exists()
+        and not is_bundle_fresh(category, doc_type)
+    ]
@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+JSON Schema（Draft 7）を専用の Python 検証コードに変換するコンパイラ。
+validate.py の get_validator が Draft7Validator の代わりに使う。
+
+- scheme.json と $ref 先（common/scheme.json 等）を読み、キーワードごとの検査を展開した関数群を生成する
+  （$ref 先・oneOf / anyOf / not の分岐は関数、それ以外はインライン展開）
+- 生成コードは BUILD_CACHE_DIR/VALIDATOR_CACHE_DIR に「スキーマ一式のハッシュ.py」として保存し、次回は読み込むだけ
+- エラーの順序・パス（absolute_path）・メッセージ・context は jsonschema の Draft7Validator.iter_errors と同じにする
+  （format は Draft7Validator の既定と同じく検査しない）
+- 対応していないキーワード・解決できない $ref を含むスキーマは UnsupportedSchema を送出する（呼び出し側で jsonschema に戻す）
+- エラーメッセージは jsonschema JSONSCHEMA_MESSAGES_VERSION の文言を写している。それより古い jsonschema では
+  UnsupportedSchema を送出し、jsonschema で検証する（環境によってコンパイル版と jsonschema の出力が食い違わないように）
+
+jsonschema との一致は python3 common/tools/check_schema_compiler.py で確認できる。
+"""
+
+import functools
+import hashlib
+import importlib.util
+import json
+import marshal
+import os
+import re
+import sys
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import unquote, urldefrag, urljoin
+
+# 生成コードの形式のバージョン（生成内容を変えたら上げる。キャッシュのハッシュに含める）
+COMPILER_VERSION = 2
+
+# エラーメッセージの文言を写した jsonschema の版（requirements.txt の下限 4.0 より新しい）。
+# これより古い jsonschema では文言が違うことがあるため、コンパイラを使わず jsonschema で検証する
+JSONSCHEMA_MESSAGES_VERSION = (4, 26)
+
+# Draft 7 で検査に使われるキーワード（これ以外は注釈として無視する。jsonschema の Draft7Validator.VALIDATORS と同じ）
+DRAFT7_KEYWORDS = frozenset({
+    '$ref', 'additionalItems', 'additionalProperties', 'allOf', 'anyOf', 'const', 'contains', 'dependencies',
+    'enum', 'exclusiveMaximum', 'exclusiveMinimum', 'format', 'if', 'items', 'maxItems', 'maxLength',
+    'maxProperties', 'maximum', 'minItems', 'minLength', 'minProperties', 'minimum', 'multipleOf', 'oneOf',
+    'not', 'pattern', 'patternProperties', 'properties', 'propertyNames', 'required', 'type', 'uniqueItems',
+})
+
+# type → 判定式（{v} を値の式に置き換える）。Draft 7 の integer は 1.0 のような整数値の float も含む
+_TYPE_CHECKS = {
+    'string': 'isinstance({v}, str)',
+    'object': 'isinstance({v}, dict)',
+    'array': 'isinstance({v}, list)',
+    'boolean': 'isinstance({v}, bool)',
+    'null': '{v} is None',
+    'integer': '(isinstance({v}, int) and not isinstance({v}, bool) or isinstance({v}, float) and {v}.is_integer())',
+    'number': '(isinstance({v}, _Number) and not isinstance({v}, bool))',
+}
+
+# ネストがこれより深くなる位置では、インライン展開をやめて関数に分ける（Python のブロックのネスト上限対策）
+_MAX_INLINE_DEPTH = 30
+
+
+class UnsupportedSchema(Exception):
+    """コンパイラが扱えないスキーマ（jsonschema で検証する）"""
+
+
+@functools.lru_cache(maxsize=None)
+def _jsonschema_version_supported() -> bool:
+    """インストールされている jsonschema が JSONSCHEMA_MESSAGES_VERSION 以上か"""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        installed = tuple(int(part) for part in re.findall(r'\d+', version('jsonschema'))[:2])
+    except (PackageNotFoundError, ValueError):
+        return False
+    return installed >= JSONSCHEMA_MESSAGES_VERSION
+
+
+class CompiledError:
+    """生成コードが返すエラー。validate.py が使う属性（message / absolute_path / context）は ValidationError と同じ"""
+
+    __slots__ = ('message', 'absolute_path', 'context')
+
+    def __init__(self, message: str, absolute_path: list, context: list):
+        self.message = message
+        self.absolute_path = absolute_path
+        self.context = context
+
+    def __repr__(self):
+        return f"<CompiledError {self.absolute_path!r}: {self.message}>"
+
+
+def make_error(path, message: str, context=()) -> CompiledError:
+    """path は (親, キー) の入れ子タプル（ルートは None）。エラーになったときだけリストに展開する"""
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(key)
+    keys.reverse()
+    return CompiledError(message, keys, list(context))
+
+
+def equal(one, two) -> bool:
+    """jsonschema の const / enum と同じ比較（True と 1 を区別し、配列・オブジェクトは再帰的に比較する）"""
+    if one is two:
+        return True
+    if isinstance(one, str) or isinstance(two, str):
+        return one == two
+    if isinstance(one, Sequence) and isinstance(two, Sequence):
+        return len(one) == len(two) and all(equal(i, j) for i, j in zip(one, two))
+    if isinstance(one, Mapping) and isinstance(two, Mapping):
+        return len(one) == len(two) and all(key in two and equal(value, two[key]) for key, value in one.items())
+    if isinstance(one, bool) or isinstance(two, bool):
+        return isinstance(one, bool) and isinstance(two, bool) and one == two
+    return one == two
+
+
+def is_valid_with(check, instance) -> bool:
+    """生成した検査関数 check でエラーが出ないか"""
+    errors = []
+    check(instance, None, errors)
+    return not errors
+
+
+class CompiledValidator:
+    """生成コードのモジュールを包み、Draft7Validator と同じ iter_errors / is_valid を提供する"""
+
+    def __init__(self, validate: Callable, source_path: Optional[Path] = None):
+        self._validate = validate
+        self.source_path = source_path
+
+    def iter_errors(self, instance):
+        return iter(self._validate(instance))
+
+    def collect_errors(self, instance, errors) -> None:
+        """
+        見つけた順にエラーを errors.append で渡す（errors はリストでなくてもよい）。
+        errors.append が例外を送出すると検証はそこで打ち切られる（validate.py の --max-errors / --fail-fast）。
+        """
+        self._validate(instance, errors)
+
+    def is_valid(self, instance) -> bool:
+        return not self._validate(instance)
+
+
+def _resolve_pointer(document, pointer: str):
+    """JSON Pointer（#/definitions/x の # 以降）で document 内の値を返す"""
+    if not pointer:
+        return document
+    if not pointer.startswith('/'):
+        raise UnsupportedSchema(f"未対応の $ref フラグメント: #{pointer}")
+    value = document
+    for token in pointer[1:].split('/'):
+        token = unquote(token).replace('~1', '/').replace('~0', '~')
+        if isinstance(value, list):
+            try:
+                value = value[int(token)]
+            except (ValueError, IndexError):
+                raise UnsupportedSchema(f"$ref の参照先がありません: #{pointer}")
+        elif isinstance(value, dict) and token in value:
+            value = value[token]
+        else:
+            raise UnsupportedSchema(f"$ref の参照先がありません: #{pointer}")
+    return value
+
+
+class _Compiler:
+    def __init__(self, documents: dict[str, object]):
+        self.documents = documents
+        self.constants: dict[str, str] = {}
+        self.tables: list[str] = []
+        self.functions: list[list[str]] = []
+        self.ref_functions: dict[tuple[str, str], str] = {}
+        self.pending: list[tuple[str, object, str]] = []
+        self.counter = 0
+
+    def name(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def constant(self, value, source: Optional[str] = None) -> str:
+        """モジュール先頭に定数を置き、その名前を返す（同じ値は 1 つにまとめる）。source で式を直接指定できる"""
+        source = source or repr(value)
+        if source not in self.constants:
+            self.constants[source] = self.name('_C')
+        return self.constants[source]
+
+    def function_for(self, schema, doc_uri: str) -> str:
+        """schema を検査する関数を（後で）生成し、その名前を返す"""
+        name = self.name('_f')
+        self.pending.append((name, schema, doc_uri))
+        return name
+
+    def ref_function(self, ref: str, doc_uri: str) -> str:
+        uri, fragment = urldefrag(urljoin(doc_uri, ref))
+        key = (uri, unquote(fragment))
+        if key not in self.ref_functions:
+            if uri not in self.documents:
+                raise UnsupportedSchema(f"$ref を解決できません: {ref}")
+            target = _resolve_pointer(self.documents[uri], key[1])
+            self.ref_functions[key] = self.function_for(target, uri)
+        return self.ref_functions[key]
+
+    def compile(self, root_uri: str) -> str:
+        root = self.ref_function('', root_uri)
+        while self.pending:
+            name, schema, doc_uri = self.pending.pop(0)
+            body = self.emit(schema, 'v', 'p', 'E', doc_uri, 1)
+            self.functions.append([f"def {name}(v, p, E):"] + (body or ['    pass']))
+        lines = [
+            f"# schema_compiler が生成した検証コード（COMPILER_VERSION = {COMPILER_VERSION}）。編集しないこと",
+            "import re",
+            "from numbers import Number as _Number",
+            "from schema_compiler import equal as _equal, is_valid_with as _valid, make_error as _error",
+            "",
+        ]
+        lines.extend(f"{name} = {source}" for source, name in self.constants.items())
+        for function in self.functions:
+            lines.append("")
+            lines.extend(function)
+        if self.tables:
+            lines.append("")
+            lines.extend(self.tables)
+        lines.extend([
+            "",
+            "def validate(instance, E=None):",
+            "    if E is None:",
+            "        E = []",
+            f"    {root}(instance, None, E)",
+            "    return E",
+            "",
+        ])
+        return "\n".join(lines)
+
+    def emit(self, schema, v: str, p: str, E: str, doc_uri: str, depth: int, parent_p: Optional[str] = None) -> list[str]:
+        """
+        値 v（パス p）に対する schema の検査を、depth 段インデントした行で返す（検査が無ければ空リスト）。
+        parent_p は properties / items で 1 段降りたときの親のパス（jsonschema は false スキーマのエラーに親のパスを付ける）。
+        """
+        pad = '    ' * depth
+        if schema is True:
+            return []
+        if schema is False:
+            return [f"{pad}{E}.append(_error({parent_p or p}, 'False schema does not allow ' + repr({v})))"]
+        if not isinstance(schema, dict):
+            raise UnsupportedSchema(f"スキーマがオブジェクトではありません: {schema!r}")
+        if depth > _MAX_INLINE_DEPTH:
+            return [f"{pad}{self.function_for(schema, doc_uri)}({v}, {p}, {E})"]
+        keywords = [('$ref', schema['$ref'])] if '$ref' in schema else schema.items()
+        lines: list[str] = []
+        for keyword, value in keywords:
+            if keyword not in DRAFT7_KEYWORDS or keyword == 'format':
+                continue
+            handler = getattr(self, '_kw_' + keyword.lstrip('$'), None)
+            if handler is None:
+                raise UnsupportedSchema(f"未対応のキーワード: {keyword}")
+            lines.extend(handler(value, schema, v, p, E, doc_uri, depth))
+        return lines
+
+    def _kw_ref(self, ref, schema, v, p, E, doc_uri, depth):
+        if not isinstance(ref, str):
+            raise UnsupportedSchema(f"$ref が文字列ではありません: {ref!r}")
+        pad = '    ' * depth
+        return [f"{pad}{self.ref_function(ref, doc_uri)}({v}, {p}, {E})"]
+
+    def _kw_type(self, types, schema, v, p, E, doc_uri, depth):
+        types = [types] if isinstance(types, str) else list(types)
+        if any(t not in _TYPE_CHECKS for t in types):
+            raise UnsupportedSchema(f"未対応の type: {types!r}")
+        pad = '    ' * depth
+        check = ' or '.join(_TYPE_CHECKS[t].format(v=v) for t in types) or 'False'
+        if len(types) > 1:
+            check = f"({check})"
+        message = self.constant(' is not of type ' + ', '.join(repr(t) for t in types))
+        return [
+            f"{pad}if not {check}:",
+            f"{pad}    {E}.append(_error({p}, repr({v}) + {message}))",
+        ]
+
+    def _kw_required(self, required, schema, v, p, E, doc_uri, depth):
+        if not isinstance(required, list):
+            raise UnsupportedSchema(f"required が配列ではありません: {required!r}")
+        if not required:
+            return []
+        pad = '    ' * depth
+        lines = [f"{pad}if isinstance({v}, dict):"]
+        for prop in required:
+            lines.append(f"{pad}    if {prop!r} not in {v}:")
+            lines.append(f"{pad}        {E}.append(_error({p}, {f'{prop!r} is a required property'!r}))")
+        return lines
+
+    def _kw_properties(self, properties, schema, v, p, E, doc_uri, depth):
+        if not isinstance(properties, dict):
+            raise UnsupportedSchema(f"properties がオブジェクトではありません: {properties!r}")
+        pad = '    ' * depth
+        lines = []
+        for prop, subschema in properties.items():
+            child = self.name('x')
+            body = self.emit(subschema, child, f"({p}, {prop!r})", E, doc_uri, depth + 2, p)
+            if body:
+                lines.append(f"{pad}    if {prop!r} in {v}:")
+                lines.append(f"{pad}        {child} = {v}[{prop!r}]")
+                lines.extend(body)
+        if not lines:
+            return []
+        return [f"{pad}if isinstance({v}, dict):"] + lines
+
+    def _kw_items(self, items, schema, v, p, E, doc_uri, depth):
+        pad = '    ' * depth
+        if isinstance(items, list):
+            lines = []
+            for index, subschema in enumerate(items):
+                child = self.name('x')
+                body = self.emit(subschema, child, f"({p}, {index})", E, doc_uri, depth + 2, p)
+                if body:
+                    lines.append(f"{pad}    if len({v}) > {index}:")
+                    lines.append(f"{pad}        {child} = {v}[{index}]")
+                    lines.extend(body)
+            return [f"{pad}if isinstance({v}, list):"] + lines if lines else []
+        if not isinstance(items, (dict, bool)):
+            raise UnsupportedSchema(f"items が未対応の形式です: {items!r}")
+        index, child = self.name('i'), self.name('x')
+        body = self.emit(items, child, f"({p}, {index})", E, doc_uri, depth + 2, p)
+        if not body:
+            return []
+        return [
+            f"{pad}if isinstance({v}, list):",
+            f"{pad}    for {index}, {child} in enumerate({v}):",
+        ] + body
+
+    def _kw_const(self, const, schema, v, p, E, doc_uri, depth):
+        pad = '    ' * depth
+        value = self.constant(const)
+        message = self.constant(f"{const!r} was expected")
+        check = f"{v} != {value}" if isinstance(const, str) else f"not _equal({v}, {value})"
+        return [f"{pad}if {check}:", f"{pad}    {E}.append(_error({p}, {message}))"]
+
+    def _kw_enum(self, enums, schema, v, p, E, doc_uri, depth):
+        pad = '    ' * depth
+        message = self.constant(f" is not one of {enums!r}")
+        if isinstance(enums, list) and all(isinstance(each, str) for each in enums):
+            values = self.constant(None, f"frozenset({sorted(set(enums))!r})")
+            check = f"not (isinstance({v}, str) and {v} in {values})"
+        else:
+            values = self.constant(enums)
+            check = f"all(not _equal(each, {v}) for each in {values})"
+        return [f"{pad}if {check}:", f"{pad}    {E}.append(_error({p}, repr({v}) + {message}))"]
+
+    def _length_check(self, limit, kind, too_small: bool, v, p, E, depth):
+        if not isinstance(limit, int) or isinstance(limit, bool):
+            raise UnsupportedSchema(f"長さの指定が整数ではありません: {limit!r}")
+        pad = '    ' * depth
+        if too_small:
+            text = 'should be non-empty' if limit == 1 else 'is too short'
+            compare = f"len({v}) < {limit}"
+        else:
+            text = 'is expected to be empty' if limit == 0 else 'is too long'
+            compare = f"len({v}) > {limit}"
+        return [
+            f"{pad}if isinstance({v}, {kind}) and {compare}:",
+            f"{pad}    {E}.append(_error({p}, repr({v}) + {' ' + text!r}))",
+        ]
+
+    def _kw_minItems(self, limit, schema, v, p, E, doc_uri, depth):
+        return self._length_check(limit, 'list', True, v, p, E, depth)
+
+    def _kw_maxItems(self, limit, schema, v, p, E, doc_uri, depth):
+        return self._length_check(limit, 'list', False, v, p, E, depth)
+
+    def _kw_minLength(self, limit, schema, v, p, E, doc_uri, depth):
+        return self._length_check(limit, 'str', True, v, p, E, depth)
+
+    def _kw_maxLength(self, limit, schema, v, p, E, doc_uri, depth):
+        return self._length_check(limit, 'str', False, v, p, E, depth)
+
+    def _kw_pattern(self, pattern, schema, v, p, E, doc_uri, depth):
+        if not isinstance(pattern, str):
+            raise UnsupportedSchema(f"pattern が文字列ではありません: {pattern!r}")
+        try:
+            re.compile(pattern)
+        except re.error:
+            raise UnsupportedSchema(f"pattern を解釈できません: {pattern!r}")
+        pad = '    ' * depth
+        regex = self.constant(None, f"re.compile({pattern!r})")
+        message = self.constant(f" does not match {pattern!r}")
+        return [
+            f"{pad}if isinstance({v}, str) and not {regex}.search({v}):",
+            f"{pad}    {E}.append(_error({p}, repr({v}) + {message}))",
+        ]
+
+    def _kw_allOf(self, subschemas, schema, v, p, E, doc_uri, depth):
+        if not isinstance(subschemas, list):
+            raise UnsupportedSchema(f"allOf が配列ではありません: {subschemas!r}")
+        lines = []
+        for subschema in subschemas:
+            lines.extend(self.emit(subschema, v, p, E, doc_uri, depth))
+        return lines
+
+    def _branches(self, subschemas, doc_uri) -> tuple[str, str]:
+        if not isinstance(subschemas, list):
+            raise UnsupportedSchema(f"anyOf / oneOf が配列ではありません: {subschemas!r}")
+        checks = self.name('_B')
+        names = [self.function_for(subschema, doc_uri) for subschema in subschemas]
+        self.tables.append(f"{checks} = ({''.join(name + ', ' for name in names)})")  # 関数の定義後に置く
+        return checks, self.constant(tuple(repr(subschema) for subschema in subschemas))
+
+    def _kw_anyOf(self, subschemas, schema, v, p, E, doc_uri, depth):
+        pad = '    ' * depth
+        checks, _ = self._branches(subschemas, doc_uri)
+        context, branch, errors = self.name('c'), self.name('b'), self.name('e')
+        return [
+            f"{pad}{context} = []",
+            f"{pad}for {branch} in {checks}:",
+            f"{pad}    {errors} = []",
+            f"{pad}    {branch}({v}, {p}, {errors})",
+            f"{pad}    if not {errors}:",
+            f"{pad}        break",
+            f"{pad}    {context}.extend({errors})",
+            f"{pad}else:",
+            f"{pad}    {E}.append(_error({p}, repr({v}) + ' is not valid under any of the given schemas', {context}))",
+        ]
+
+    def _kw_oneOf(self, subschemas, schema, v, p, E, doc_uri, depth):
+        pad = '    ' * depth
+        checks, reprs = self._branches(subschemas, doc_uri)
+        context, index, branch, errors, more = (self.name(prefix) for prefix in ('c', 'i', 'b', 'e', 'm'))
+        return [
+            f"{pad}{context} = []",
+            f"{pad}for {index}, {branch} in enumerate({checks}):",
+            f"{pad}    {errors} = []",
+            f"{pad}    {branch}({v}, {p}, {errors})",
+            f"{pad}    if not {errors}:",
+            f"{pad}        break",
+            f"{pad}    {context}.extend({errors})",
+            f"{pad}else:",
+            f"{pad}    {index} = -1",
+            f"{pad}    {E}.append(_error({p}, repr({v}) + ' is not valid under any of the given schemas', {context}))",
+            f"{pad}if {index} >= 0:",
+            f"{pad}    {more} = [{reprs}[j] for j in range({index} + 1, len({checks})) if _valid({checks}[j], {v})]",
+            f"{pad}    if {more}:",
+            f"{pad}        {more}.append({reprs}[{index}])",
+            f"{pad}        {E}.append(_error({p}, repr({v}) + ' is valid under each of ' + ', '.join({more})))",
+        ]
+
+    def _kw_not(self, not_schema, schema, v, p, E, doc_uri, depth):
+        pad = '    ' * depth
+        check = self.function_for(not_schema, doc_uri)
+        message = self.constant(f" should not be valid under {not_schema!r}")
+        return [f"{pad}if _valid({check}, {v}):", f"{pad}    {E}.append(_error({p}, repr({v}) + {message}))"]
+
+
+def _collect_documents(schema: dict, root_uri: str, load_document: Callable[[str], object]) -> dict[str, object]:
+    """ルートのスキーマと、$ref でたどれる外部ドキュメントを URI → 内容で集める"""
+    documents: dict[str, object] = {root_uri: schema}
+    pending = [(schema, root_uri)]
+    while pending:
+        node, doc_uri = pending.pop()
+        if isinstance(node, dict):
+            ref = node.get('$ref')
+            if isinstance(ref, str):
+                uri = urldefrag(urljoin(doc_uri, ref))[0]
+                if uri not in documents:
+                    try:
+                        documents[uri] = load_document(uri)
+                    except Exception as e:
+                        raise UnsupportedSchema(f"$ref を読み込めません: {ref}（{e}）")
+                    pending.append((documents[uri], uri))
+            if '$id' in node and node is not documents[doc_uri]:
+                raise UnsupportedSchema("入れ子の $id には未対応です")
+            pending.extend((value, doc_uri) for value in node.values())
+        elif isinstance(node, list):
+            pending.extend((value, doc_uri) for value in node)
+    return documents
+
+
+def schema_digest(documents: dict[str, object], root_uri: str) -> str:
+    """生成コードのキャッシュキー（コンパイラのバージョン・ルート URI・全ドキュメントの内容。キーの順序も含む）"""
+    payload = json.dumps(
+        {'version': COMPILER_VERSION, 'root': root_uri, 'documents': documents},
+        ensure_ascii=False,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def generate_source(schema: dict, root_uri: str, load_document: Callable[[str], object]) -> str:
+    """スキーマから検証コード（validate(instance) -> エラーのリスト を定義するモジュール）のソースを生成する"""
+    documents = _collect_documents(schema, root_uri, load_document)
+    return _Compiler(documents).compile(root_uri)
+
+
+def _load_validate(source: Optional[str], path: Optional[Path], digest: str) -> Callable:
+    """
+    生成コードを実行して validate 関数を返す。path があれば、コンパイル済みのコードオブジェクトも
+    「ハッシュ.{cache_tag}.code」（marshal 形式）として隣に保存し、次回はソースのコンパイルを省く
+    （PYTHONDONTWRITEBYTECODE の環境でも効くよう、__pycache__ には頼らない）。
+    """
+    code = None
+    code_path = None
+    if path is not None:
+        code_path = path.with_name(f"{path.stem}.{sys.implementation.cache_tag}.code")
+        try:
+            data = code_path.read_bytes()
+            if data[:len(importlib.util.MAGIC_NUMBER)] == importlib.util.MAGIC_NUMBER:
+                code = marshal.loads(data[len(importlib.util.MAGIC_NUMBER):])
+        except (OSError, ValueError, EOFError, TypeError):
+            code = None
+    if code is None:
+        if source is None:
+            source = path.read_text(encoding='utf-8')
+        code = compile(source, str(path) if path is not None else f"<validator {digest[:16]}>", 'exec')
+        if code_path is not None:
+            try:
+                tmp = code_path.with_name(f".{code_path.name}.{os.getpid()}.tmp")
+                tmp.write_bytes(importlib.util.MAGIC_NUMBER + marshal.dumps(code))
+                os.replace(tmp, code_path)
+            except OSError:
+                pass
+    namespace = {'__name__': f"_yaml_bridge_validator_{digest[:16]}"}
+    exec(code, namespace)
+    return namespace['validate']
+
+
+def compile_validator(
+    schema: dict,
+    root_uri: str,
+    load_document: Callable[[str], object],
+    cache_dir: Optional[Path] = None,
+) -> CompiledValidator:
+    """
+    スキーマを検証コードにコンパイルして CompiledValidator を返す。
+    root_uri はスキーマ自身の URI（相対 $ref の基準）、load_document は外部 $ref の URI → 内容。
+    cache_dir を指定すると生成コードを「ハッシュ.py」として保存し、同じスキーマ一式なら生成を省いて読み込む
+    （保存できなければメモリ上で実行する）。扱えないスキーマは UnsupportedSchema を送出する。
+    jsonschema が JSONSCHEMA_MESSAGES_VERSION より古い（エラーの文言が違う）場合も UnsupportedSchema を送出する。
+    """
+    if not _jsonschema_version_supported():
+        raise UnsupportedSchema(f"jsonschema {'.'.join(map(str, JSONSCHEMA_MESSAGES_VERSION))} 未満はエラーの文言が違うため未対応")
+    documents = _collect_documents(schema, root_uri, load_document)
+    digest = schema_digest(documents, root_uri)
+    path = None
+    source = None
+    if cache_dir is not None:
+        path = Path(cache_dir) / f"{digest[:40]}.py"
+        if not path.exists():
+            source = _Compiler(documents).compile(root_uri)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                tmp.write_text(source, encoding='utf-8')
+                os.replace(tmp, path)
+            except OSError:
+                path = None
+    if source is None and path is None:
+        source = _Compiler(documents).compile(root_uri)
+    return CompiledValidator(_load_validate(source, path, digest), path)
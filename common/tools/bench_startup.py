@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+起動時の import 時間を `python3 -X importtime` で計測し、予算（ms）と読み込んではいけないモジュールを確認する。
+
+validate.py の --list / --check-md-links や、md_base の import はスキーマ検証・YAML 解析・HTTP を使わないため、
+jsonschema・referencing・yaml・ssl 等を読み込まないことを確認し、import 時間の合計を予算と比べる。
+読み込んではいけないモジュールを読み込んだら終了コード 1。import 時間はマシンの負荷でぶれるため、
+予算（計測値のおよそ 2 倍）の超過は警告だけにする（--strict-timing で終了コード 1 にする。make bench-startup は --strict-timing で実行する）。
+
+使い方:
+  python3 common/tools/bench_startup.py
+  python3 common/tools/bench_startup.py --runs 10      # 各ケースを 10 回計測し最小値で判定する
+  python3 common/tools/bench_startup.py --top 15       # import 時間の大きいモジュールを 15 件表示する
+  python3 common/tools/bench_startup.py --strict-timing  # 予算の超過も失敗にする
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+# common/ を import するため
+_common_dir = Path(__file__).resolve().parent.parent
+if str(_common_dir) not in sys.path:
+    sys.path.insert(0, str(_common_dir))
+from paths import get_project_root
+
+# (名前, python3 に渡す引数, 作業ディレクトリ（プロジェクトルート相対）, import 時間の予算（ms）, 読み込んではいけないモジュール)
+# 予算は計測値（validate.py 約 45〜80 ms、md_base 約 55〜65 ms）の 2 倍以上の余裕を持たせる
+# import 時間はトップレベルの import の累積時間の合計（インタプリタ自身の起動分を含む）
+STARTUP_CASES = [
+    (
+        'validate.py --list',
+        ['common/tools/validate.py', '--list'],
+        '.',
+        180,
+        ('jsonschema', 'referencing', 'yaml', 'link_cache', 'link_check', 'http.client', 'ssl', 'sqlite3',
+         'schema_bundle', 'schema_compiler'),
+    ),
+    (
+        'validate.py --check-md-links --all',
+        ['common/tools/validate.py', '--check-md-links', '--all'],
+        '.',
+        180,
+        ('jsonschema', 'referencing', 'yaml', 'link_cache', 'link_check', 'http.client', 'ssl', 'sqlite3',
+         'schema_bundle', 'schema_compiler'),
+    ),
+    (
+        'import md_base',
+        ['-c', 'import md_base'],
+        'common',
+        150,
+        ('yaml', 'argparse', 'jsonschema', 'referencing'),
+    ),
+]
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int, int]]:
+    """
+    -X importtime の出力を モジュール名 → (自身の時間 μs, 累積時間 μs, 入れ子の深さ) にする。
+    深さ 0 がトップレベルの import（累積時間の合計が import 時間の合計になる）。
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        modules[name.strip()] = (self_us, cumulative_us, depth)
+    return modules
+
+
+def measure(args: list[str], cwd: Path) -> dict[str, tuple[int, int, int]]:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def total_ms(modules: dict[str, tuple[int, int, int]]) -> float:
+    return sum(cumulative for _, cumulative, depth in modules.values() if depth == 0) / 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='起動時の import 時間を計測し、予算を超えていないか確認する')
+    parser.add_argument('--runs', type=int, default=5, help='各ケースの計測回数（最小値で判定する）')
+    parser.add_argument('--top', type=int, default=5, help='import 時間の大きいトップレベルのモジュールを表示する件数')
+    parser.add_argument('--strict-timing', action='store_true', help='import 時間の予算超過も失敗（終了コード 1）にする')
+    args = parser.parse_args()
+
+    root = get_project_root()
+    failures = 0
+    warnings = 0
+    for name, case_args, cwd, budget_ms, forbidden in STARTUP_CASES:
+        runs = [measure(case_args, root / cwd) for _ in range(max(args.runs, 1))]
+        best = min(runs, key=total_ms)
+        elapsed = total_ms(best)
+        loaded = [f for f in forbidden if any(module == f or module.startswith(f + '.') for module in best)]
+        over_budget = elapsed > budget_ms
+        ok = not loaded and not (over_budget and args.strict_timing)
+        mark = '❌' if not ok else '⚠️ ' if over_budget else '✅'
+        print(f"{mark} {name}: {elapsed:.1f} ms（予算 {budget_ms} ms）")
+        if over_budget:
+            warnings += 1
+        if loaded:
+            print(f"    読み込んではいけないモジュール: {', '.join(loaded)}")
+        top = sorted(((c, m) for m, (_, c, d) in best.items() if d == 0), reverse=True)[:args.top]
+        for cumulative, module in top:
+            print(f"    {cumulative / 1000:6.1f} ms  {module}")
+        if not ok:
+            failures += 1
+
+    print()
+    print("=" * 40)
+    if failures:
+        print(f"❌ 起動時間の確認に失敗（{failures} 件）")
+        return 1
+    if warnings:
+        print(f"⚠️  予算を超えたケースがあります（{warnings} 件。負荷によるぶれの可能性があるため失敗にはしません）")
+    print("✅ 読み込んではいけないモジュールの読み込みはありません")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
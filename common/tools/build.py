@@ -15,12 +15,40 @@ YAMLファイルのバリデーション → Markdown生成（Mermaid図含む
 
   # バリデーションのみ
   python3 common/tools/build.py --all --validate-only
+
+  # 並列数を指定（既定は CPU 数。出力順・成功/失敗数は直列実行と同じ）
+  python3 common/tools/build.py --all --jobs 8
+
+  # 変更のない YAML もすべて再ビルド（既定では .yaml-bridge/build-manifest.json を見てスキップ）
+  python3 common/tools/build.py --all --force
+
+  # 変更を監視し、変更された YAML と依存する YAML（WBS・project_summary 等）だけを再ビルドし続ける
+  python3 common/tools/build.py --watch
+
+  # git の ref（例: PR のベースブランチ）以降に変更されたファイルの影響を受ける YAML だけを処理
+  python3 common/tools/build.py --changed-since origin/main
+
+  # 従来どおり validate.py / create_human_document.py をサブプロセスで実行
+  python3 common/tools/build.py --all --engine subprocess
+
+  # フェーズ別の所要時間（遅いドキュメント / フェーズ）を表示し、Chrome trace 形式でも保存（Perfetto で開ける）
+  python3 common/tools/build.py --all --force --timings
+  python3 common/tools/build.py --all --force --trace build-trace.json
+
+既定（--engine inprocess）では validate.py と各 doc_type の create_human_document.py を
+importlib で読み込み、1 プロセス内でバリデーション・Markdown 生成を行う。
+読み込めない場合はその YAML だけサブプロセス実行にフォールバックする。
 """
 
 import argparse
+import contextlib
+import importlib.util
+import io
+import os
 import subprocess
 import sys
-import yaml
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -33,21 +61,42 @@ from config import (
     CREATE_HUMAN_DOCUMENT_SCRIPT,
     HUMAN_DOCUMENT_MD,
     AI_DOCUMENT_YAML,
+    LINK_CACHE_REFRESH_ENV,
 )
 from paths import (
     get_project_root,
     get_categories_dir,
     get_available_categories,
+    get_category_yaml_files,
+    get_doc_type_dir,
+    get_doc_type_yaml_files,
     get_doc_types,
 )
+from md_base import render_human_document, track_document_reads
+import build_manifest
+import build_trace
+import doc_store
+import file_index
+import workspace_index
+
+# ビルドエンジン: inprocess（既定）/ subprocess（従来方式）
+ENGINES = ('inprocess', 'subprocess')
+
+# create_human_document.py のパス → ((mtime_ns, size), 読み込んだモジュール)（in-process 時に再利用）
+_renderer_module_cache: dict[Path, tuple[tuple[int, int], object]] = {}
+
+# YAML パス → in-process 変換中に読まれた他ドキュメントの絶対パスの組（全体を読んだもの, meta だけを読んだもの）。
+# マニフェストの依存記録用
+_document_reads: dict[Path, tuple[set[str], set[str]]] = {}
+
+# 生成した Markdown のうち、内容が変わって書き込んだ数 / 変わらず書き込まなかった数
+_output_stats = {'changed': 0, 'unchanged': 0}
 
 
 def detect_doc_type_from_yaml(yaml_path: Path) -> Optional[tuple[str, str]]:
-    """YAMLファイルからcategory, doc_typeを検出"""
+    """YAMLファイルからcategory, doc_typeを検出（meta だけを解析する。doc_store.load_meta）"""
     try:
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-        meta = data.get('meta', {})
+        meta = doc_store.load_meta(yaml_path)
         return meta.get('category'), meta.get('doc_type')
     except Exception:
         return None, None
@@ -69,10 +118,213 @@ def run_command(cmd: list[str], description: str) -> bool:
         return False
 
 
-def process_yaml(yaml_path: Path, validate_only: bool = False) -> bool:
-    project_root = get_project_root()
-    
+def _load_validate_document():
+    """validate.py の validate_document を返す。依存パッケージ不足等で読み込めなければ None。"""
+    try:
+        from validate import require_jsonschema, validate_document
+        require_jsonschema()
+    except (ImportError, SystemExit):
+        return None
+    return validate_document
+
+
+def run_md_link_check(engine: str) -> bool:
+    """
+    全 human/document.md の相対リンクを検証する。inprocess では validate.run_md_links_check をこのプロセスで呼び
+    （読み込み済みの validate とファイルインデックスを使い回す）、subprocess または validate.py を読み込めない場合は
+    validate.py --check-md-links --all を起動する。
+    """
+    if engine == 'inprocess':
+        try:
+            from validate import run_md_links_check
+        except ImportError:
+            run_md_links_check = None
+        if run_md_links_check is not None:
+            print("  MD リンク検証...", end=" ", flush=True)
+            errors = run_md_links_check(get_project_root())
+            if not errors:
+                print("✅")
+                return True
+            print("❌")
+            print(f"    エラー: MD リンク検証失敗（{len(errors)} 件。詳細は validate.py --check-md-links --all）")
+            return False
+    validate_script = get_project_root() / 'common' / 'tools' / 'validate.py'
+    return run_command([sys.executable, str(validate_script), '--check-md-links', '--all'], "MD リンク検証")
+
+
+def prefetch_links(yaml_files: list[Path]) -> None:
+    """
+    処理する全 YAML の GitHub リンクを重複なく 1 回ずつ確認し、各ドキュメントのバリデーションで結果を使い回す。
+    404 の URL があれば参照元の YAML をまとめて表示する。validate.py を読み込めなければ何もしない
+    （各ドキュメントのバリデーションで従来どおり確認する）。
+    """
+    try:
+        import validate
+    except (ImportError, SystemExit):
+        return
+    with build_trace.span('link_prefetch'):
+        citations = validate.prefetch_github_links(yaml_files)
+    if not citations:
+        return
+    print(f"\n{validate.format_link_prefetch_summary(citations)}")
+    for line in validate.format_broken_link_report(citations):
+        print(f"  {line}")
+
+
+def _load_renderer_module(script_path: Path):
+    """
+    create_human_document.py を import する（プロセス内でキャッシュ）。
+    mtime・サイズが変わっていれば読み直す（デーモン・watch で編集後の変換スクリプトを使うため）。
+    """
+    st = os.stat(script_path)
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _renderer_module_cache.get(script_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    doc_type_dir = script_path.parent.parent
+    module_name = f"_create_human_document_{doc_type_dir.parent.name}_{doc_type_dir.name}"
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _renderer_module_cache[script_path] = (signature, module)
+    return module
+
+
+def _load_renderer(script_path: Path):
+    """create_human_document.py の generate_markdown を返す"""
+    return _load_renderer_module(script_path).generate_markdown
+
+
+def get_declared_dependencies(script_path: Path, attribute: str = 'DOCUMENT_DEPENDENCIES') -> tuple[str, ...]:
+    """
+    create_human_document.py が DOCUMENT_DEPENDENCIES で宣言した他ドキュメントの glob（なければ空）。
+    attribute='DOCUMENT_META_DEPENDENCIES' なら meta だけを読む他ドキュメントの glob。
+    """
+    try:
+        module = _load_renderer_module(script_path)
+    except Exception:
+        return ()
+    return tuple(getattr(module, attribute, ()))
+
+
+def run_validation(yaml_path: Path, engine: str, skip_link_check: bool = False) -> bool:
+    """YAML をバリデーションする。inprocess で validate.py を読み込めなければサブプロセスで実行する。"""
+    with build_trace.span('validate'):
+        return _run_validation(yaml_path, engine, skip_link_check)
+
+
+def _run_validation(yaml_path: Path, engine: str, skip_link_check: bool) -> bool:
+    validate_document = _load_validate_document() if engine == 'inprocess' else None
+    if validate_document is None:
+        validate_script = get_project_root() / 'common' / 'tools' / 'validate.py'
+        cmd = [sys.executable, str(validate_script), str(yaml_path)]
+        if skip_link_check:
+            cmd.append('--skip-link-check')
+        return run_command(cmd, "バリデーション")
+    print("  バリデーション...", end=" ", flush=True)
+    try:
+        ok, lines = validate_document(yaml_path, skip_link_check=skip_link_check)
+    except Exception as e:
+        print("❌")
+        print(f"    エラー: {str(e)[:200]}")
+        return False
+    if ok:
+        print("✅")
+        return True
+    print("❌")
+    from validate import VALIDATION_FAILED_PREFIX
+
+    # 「バリデーション失敗（N 件）」のまとめ行を除き、エラー・警告行とそれに続く字下げした詳細行を表示する
+    in_detail = False
+    for line in lines:
+        if line.startswith(VALIDATION_FAILED_PREFIX):
+            in_detail = False
+        elif line.startswith("❌") or line.startswith("⚠️"):
+            print(f"    エラー: {line}")
+            in_detail = True
+        elif in_detail and line.startswith(" ") and line.strip():
+            for part in line.splitlines():  # YAML の解析エラー等は 1 行に複数行のメッセージを含む
+                print(f"    {part}")
+        else:
+            in_detail = False
+    return False
+
+
+def run_render(yaml_path: Path, to_md_script: Path, md_output: Path, engine: str) -> bool:
+    """Markdown を生成する。inprocess で create_human_document.py を読み込めなければサブプロセスで実行する。"""
+    with build_trace.span('render'):
+        return _run_render(yaml_path, to_md_script, md_output, engine)
+
+
+def _run_render(yaml_path: Path, to_md_script: Path, md_output: Path, engine: str) -> bool:
+    description = f"Markdown生成 → {md_output.name}"
+    renderer = None
+    if engine == 'inprocess':
+        try:
+            renderer = _load_renderer(to_md_script)
+        except Exception:
+            renderer = None
+    if renderer is None:
+        cmd = [sys.executable, str(to_md_script), str(yaml_path), '-o', str(md_output)]
+        return run_command(cmd, description)
+    print(f"  {description}...", end=" ", flush=True)
+    try:
+        with track_document_reads() as reads:
+            render_human_document(renderer, str(yaml_path), str(md_output))
+        for paths in reads:
+            paths.discard(os.path.abspath(yaml_path))
+        _document_reads[yaml_path] = reads
+    except Exception as e:
+        print("❌")
+        print(f"    エラー: {str(e)[:200]}")
+        return False
+    print("✅")
+    return True
+
+
+def _output_signature(yaml_path: Path) -> Optional[tuple[int, int, int]]:
+    """
+    YAML に対応する出力 Markdown の (mtime_ns, size, inode)。無ければ None。
+    出力は内容が変わったときだけ一時ファイル + os.replace で置き換わるため、前後で比べれば書き換えの有無が分かる
+    （--engine subprocess でも同じ）。
+    """
     category, doc_type = detect_doc_type_from_yaml(yaml_path)
+    if not category or not doc_type:
+        return None
+    try:
+        st = os.stat(get_output_path(yaml_path, category, doc_type))
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _trace_document(yaml_path: Path):
+    """フェーズ計測でスパンを yaml_path に紐づける（計測無効時はパス変換もしない）"""
+    if not build_trace.is_enabled():
+        return contextlib.nullcontext()
+    return build_trace.document(build_manifest.to_manifest_key(yaml_path))
+
+
+def get_output_path(yaml_path: Path, category: str, doc_type: str) -> Path:
+    """YAML に対応する出力 Markdown のパス（ai/document.yaml → human/document.md、それ以外は {stem}.md）"""
+    stem = yaml_path.stem
+    md_name = HUMAN_DOCUMENT_MD if stem == Path(AI_DOCUMENT_YAML).stem else f"{stem}.md"
+    return get_categories_dir() / category / doc_type / md_name
+
+
+def process_yaml(
+    yaml_path: Path,
+    validate_only: bool = False,
+    engine: str = 'inprocess',
+    skip_link_check: bool = False,
+) -> bool:
+    with _trace_document(yaml_path):
+        return _process_yaml(yaml_path, validate_only, engine, skip_link_check)
+
+
+def _process_yaml(yaml_path: Path, validate_only: bool, engine: str, skip_link_check: bool) -> bool:
+    with build_trace.span('detect'):
+        category, doc_type = detect_doc_type_from_yaml(yaml_path)
     if not category or not doc_type:
         print(f"  ⚠️  category/doc_typeを検出できません: {yaml_path}")
         return False
@@ -82,9 +334,7 @@ def process_yaml(yaml_path: Path, validate_only: bool = False) -> bool:
         print(f"  ⚠️  doc_typeディレクトリが見つかりません: {doc_type_dir}")
         return False
     
-    stem = yaml_path.stem
-    md_name = HUMAN_DOCUMENT_MD if stem == Path(AI_DOCUMENT_YAML).stem else f"{stem}.md"
-    md_output = doc_type_dir / md_name
+    md_output = get_output_path(yaml_path, category, doc_type)
     
     print(f"\n📄 処理中: {yaml_path.name} ({category}/{doc_type})")
     print("-" * 40)
@@ -92,9 +342,7 @@ def process_yaml(yaml_path: Path, validate_only: bool = False) -> bool:
     success = True
     
     # 1. バリデーション
-    validate_script = project_root / 'common' / 'tools' / 'validate.py'
-    cmd = [sys.executable, str(validate_script), str(yaml_path)]
-    if not run_command(cmd, "バリデーション"):
+    if not run_validation(yaml_path, engine, skip_link_check):
         success = False
         if validate_only:
             return False
@@ -105,8 +353,7 @@ def process_yaml(yaml_path: Path, validate_only: bool = False) -> bool:
     # 2. Markdown生成（Mermaid図含む）
     to_md_script = doc_type_dir / CREATE_HUMAN_DOCUMENT_SCRIPT
     if to_md_script.exists():
-        cmd = [sys.executable, str(to_md_script), str(yaml_path), '-o', str(md_output)]
-        if not run_command(cmd, f"Markdown生成 → {md_output.name}"):
+        if not run_render(yaml_path, to_md_script, md_output, engine):
             success = False
     else:
         print(f"  ⚠️  {CREATE_HUMAN_DOCUMENT_SCRIPT} が見つかりません")
@@ -115,54 +362,417 @@ def process_yaml(yaml_path: Path, validate_only: bool = False) -> bool:
     return success
 
 
-def process_doc_type(category: str, doc_type: str, validate_only: bool = False) -> tuple[int, int]:
-    doc_type_dir = get_categories_dir() / category / doc_type
-    ai_dir = doc_type_dir / "ai"
-    yaml_files = (
-        list(ai_dir.glob("*.yaml")) + list(ai_dir.glob("*.yml"))
-        if ai_dir.exists() else []
-    )
-    yaml_files = [f for f in yaml_files if not f.name.startswith("invalid_")]
+def _process_yaml_buffered(job: tuple[Path, bool, str, bool, bool]) -> tuple[bool, str, set[str], dict]:
+    """
+    process_yaml のコンソール出力をバッファし、(成功可否, 出力, 変換中に読まれた他ドキュメント, 計測値) を返す
+    （--jobs のワーカー用）。計測値は {'parse_stats': YAML 解析統計, 'trace_events': フェーズ計測のイベント}。
+    """
+    yaml_path, validate_only, engine, skip_link_check, trace = job
+    if trace:
+        # fork で引き継いだ親プロセスのイベントを捨て、このジョブの分だけを返す
+        build_trace.enable()
+    before = doc_store.get_stats()
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        ok = process_yaml(yaml_path, validate_only, engine, skip_link_check)
+    metrics = {
+        'parse_stats': {key: value - before[key] for key, value in doc_store.get_stats().items()},
+        'trace_events': build_trace.take_events(),
+    }
+    return ok, buf.getvalue(), _document_reads.pop(yaml_path, (set(), set())), metrics
 
-    if not yaml_files:
-        return 0, 0
-    
+
+def _collect_file_path_targets(yaml_path: Path) -> list[Path]:
+    """
+    YAML の references / related_docs のファイルパス（バリデーションで実在を確認するもの）の絶対パス。
+    スキップした YAML でも参照先が消えていれば再検証するため、マニフェストに記録する。解析できなければ空
+    """
+    try:
+        from validate import collect_file_path_targets
+        yaml_data = doc_store.load_document(str(yaml_path))
+    except Exception:
+        return []
+    if not isinstance(yaml_data, dict):
+        return []
+    return collect_file_path_targets(yaml_data, get_project_root())
+
+
+def _plan_manifest_inputs(
+    yaml_path: Path,
+) -> tuple[Optional[dict], Optional[Path], tuple[str, ...], tuple[str, ...]]:
+    """
+    ビルド前に入力ファイルのハッシュを計算し、(入力ハッシュ, 出力パス, 宣言された依存 glob, meta だけの依存 glob) を返す。
+    宣言された依存（DOCUMENT_DEPENDENCIES）に一致する他ドキュメントも入力に含め、
+    DOCUMENT_META_DEPENDENCIES に一致する他ドキュメントは meta のハッシュを、
+    references / related_docs のファイルパスは存在するかを入力に含める。
+    category/doc_type を検出できなければ (None, None, (), ())。
+    """
+    category, doc_type = detect_doc_type_from_yaml(yaml_path)
+    if not category or not doc_type or not get_doc_type_dir(category, doc_type).exists():
+        return None, None, (), ()
+    input_files = build_manifest.collect_input_files(yaml_path, category, doc_type)
+    script_path = get_doc_type_dir(category, doc_type) / CREATE_HUMAN_DOCUMENT_SCRIPT
+    dependency_globs = get_declared_dependencies(script_path)
+    meta_dependency_globs = get_declared_dependencies(script_path, 'DOCUMENT_META_DEPENDENCIES')
+    input_files.extend(build_manifest.expand_dependency_globs(dependency_globs))
+    inputs = build_manifest.hash_input_files(input_files)
+    inputs.update(build_manifest.hash_meta_inputs(build_manifest.expand_dependency_globs(meta_dependency_globs)))
+    inputs.update(build_manifest.hash_exists_inputs(_collect_file_path_targets(yaml_path)))
+    return inputs, get_output_path(yaml_path, category, doc_type), dependency_globs, meta_dependency_globs
+
+
+def process_yaml_files(
+    groups: list[tuple[Optional[str], list[Path]]],
+    validate_only: bool = False,
+    engine: str = 'inprocess',
+    jobs: int = 1,
+    manifest: Optional[dict] = None,
+    force: bool = False,
+    skip_link_check: bool = False,
+) -> tuple[int, int, int]:
+    """
+    (見出し, YAML 一覧) のグループを順に処理し、(成功数, 失敗数, スキップ数) を返す。
+    jobs > 1 のときはプロセスプールで並列処理し、各 YAML の出力をバッファして直列実行と同じ順序で表示する。
+    manifest を渡すと、前回成功時から入力・出力が変わっていない YAML はスキップし（force 時を除く）、
+    結果をマニフェストに記録する。
+    """
+    # ワークスペースのマニフェスト（--list・project_summary・WBS の集約が使う一覧と meta）を最新にする
+    workspace_index.refresh(persist=True)
+    skipped = 0
+    planned_groups = []
+    plans: dict[Path, tuple[Optional[dict], Optional[Path], tuple[str, ...]]] = {}
+    for header, files in groups:
+        todo = []
+        for f in files:
+            with _trace_document(f), build_trace.span('manifest'):
+                if manifest is not None and not force and build_manifest.is_up_to_date(
+                    manifest, f, validate_only, link_check=not skip_link_check
+                ):
+                    skipped += 1
+                    continue
+                if manifest is not None:
+                    plans[f] = _plan_manifest_inputs(f)
+            todo.append(f)
+        if todo:
+            planned_groups.append((header, todo))
+
+    yaml_files = [f for _, files in planned_groups for f in files]
+    if yaml_files:
+        file_index.refresh(persist=True)  # ファイルパス確認用。デーモンでは前回からの変更だけ反映する
+    if not skip_link_check and len(yaml_files) > 1:
+        prefetch_links(yaml_files)
     success_count = 0
     fail_count = 0
-    
-    for yaml_file in sorted(yaml_files):
-        if process_yaml(yaml_file, validate_only):
-            success_count += 1
-        else:
-            fail_count += 1
-    
-    return success_count, fail_count
+    output_before = {} if validate_only else {f: _output_signature(f) for f in yaml_files}
+    if jobs > 1 and len(yaml_files) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(yaml_files)))
+        results = executor.map(
+            _process_yaml_buffered,
+            [(f, validate_only, engine, skip_link_check, build_trace.is_enabled()) for f in yaml_files],
+        )
+    else:
+        executor = None
+        results = None
+    try:
+        for header, files in planned_groups:
+            if header:
+                print(header)
+            for yaml_file in files:
+                if results is None:
+                    ok = process_yaml(yaml_file, validate_only, engine, skip_link_check)
+                    reads = _document_reads.pop(yaml_file, (set(), set()))
+                else:
+                    ok, output, reads, metrics = next(results)
+                    doc_store.add_stats(metrics['parse_stats'])
+                    build_trace.add_events(metrics['trace_events'])
+                    print(output, end="", flush=True)
+                if ok:
+                    success_count += 1
+                else:
+                    fail_count += 1
+                if ok and not validate_only:
+                    after = _output_signature(yaml_file)
+                    _output_stats['changed' if after != output_before[yaml_file] else 'unchanged'] += 1
+                if manifest is None:
+                    continue
+                inputs, md_output, dependency_globs, meta_dependency_globs = plans[yaml_file]
+                if ok and inputs is not None:
+                    document_reads, document_meta_reads = reads
+                    build_manifest.record_success(
+                        manifest, yaml_file, inputs, None if validate_only else md_output,
+                        dependency_globs=dependency_globs, document_reads=document_reads,
+                        link_checked=not skip_link_check,
+                        meta_dependency_globs=meta_dependency_globs, document_meta_reads=document_meta_reads,
+                    )
+                else:
+                    build_manifest.forget(manifest, yaml_file)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return success_count, fail_count, skipped
 
 
-def process_category(category: str, validate_only: bool = False) -> tuple[int, int]:
-    total_success = 0
-    total_fail = 0
-    
-    for doc_type in get_doc_types(category):
-        success, fail = process_doc_type(category, doc_type, validate_only)
-        total_success += success
-        total_fail += fail
-    
-    return total_success, total_fail
+def process_doc_type(
+    category: str,
+    doc_type: str,
+    validate_only: bool = False,
+    engine: str = 'inprocess',
+    jobs: int = 1,
+    manifest: Optional[dict] = None,
+    force: bool = False,
+    skip_link_check: bool = False,
+) -> tuple[int, int, int]:
+    yaml_files = get_doc_type_yaml_files(category, doc_type)
+    return process_yaml_files([(None, yaml_files)], validate_only, engine, jobs, manifest, force, skip_link_check)
 
 
-def process_all(validate_only: bool = False) -> tuple[int, int]:
-    total_success = 0
-    total_fail = 0
-    
+def process_category(
+    category: str,
+    validate_only: bool = False,
+    engine: str = 'inprocess',
+    jobs: int = 1,
+    manifest: Optional[dict] = None,
+    force: bool = False,
+    skip_link_check: bool = False,
+) -> tuple[int, int, int]:
+    yaml_files = get_category_yaml_files(category)
+    return process_yaml_files([(None, yaml_files)], validate_only, engine, jobs, manifest, force, skip_link_check)
+
+
+def process_all(
+    validate_only: bool = False,
+    engine: str = 'inprocess',
+    jobs: int = 1,
+    manifest: Optional[dict] = None,
+    force: bool = False,
+    skip_link_check: bool = False,
+) -> tuple[int, int, int]:
+    groups = []
     for category in get_available_categories():
-        print(f"\n📦 カテゴリ: {category}")
-        print("=" * 50)
-        success, fail = process_category(category, validate_only)
-        total_success += success
-        total_fail += fail
-    
-    return total_success, total_fail
+        header = f"\n📦 カテゴリ: {category}\n" + "=" * 50
+        groups.append((header, get_category_yaml_files(category)))
+    return process_yaml_files(groups, validate_only, engine, jobs, manifest, force, skip_link_check)
+
+
+def format_result_summary(success: int, fail: int, skipped: int) -> str:
+    """「📊 結果」行。スキップ（変更なし）は前回成功済みなので成功に含め、内訳を併記する"""
+    line = f"📊 結果: 成功 {success + skipped} / 失敗 {fail}"
+    if skipped:
+        line += f"（再ビルド {success + fail} 件 / スキップ {skipped} 件）"
+    return line
+
+
+def format_build_stats() -> list[str]:
+    """
+    結果欄に添える統計行。Markdown を生成した場合は実際に書き換えたファイル数、
+    YAML 解析回数（--jobs のワーカー分を含む。--engine subprocess の子プロセス分は含まない）。
+    """
+    lines = []
+    if _output_stats['changed'] or _output_stats['unchanged']:
+        lines.append(f"📝 Markdown 更新: {_output_stats['changed']} ファイル（変更なし {_output_stats['unchanged']} ファイル）")
+    stats = doc_store.get_stats()
+    line = f"🧮 YAML 解析: {stats['parses']} 回（共有ストアから再利用 {stats['hits']} 回"
+    if stats['disk_hits']:
+        line += f"、ディスクキャッシュ {stats['disk_hits']} 回"
+    if stats['probes']:
+        line += f"、meta のみ {stats['probes']} 回"
+    lines.append(line + "）")
+    return lines
+
+
+def report_timings(trace_path: Optional[str]) -> None:
+    """--timings / --trace 指定時: 遅いドキュメント・フェーズの表を表示し、--trace なら Chrome trace を書き出す"""
+    if not build_trace.is_enabled():
+        return
+    print("\n" + "=" * 50)
+    for line in build_trace.format_summary():
+        print(line)
+    if trace_path:
+        build_trace.write_chrome_trace(Path(trace_path))
+        print(f"📝 Chrome trace を保存しました: {trace_path}（Perfetto / chrome://tracing で開けます）")
+
+
+def default_jobs() -> int:
+    """--jobs の既定値（CPU 数）"""
+    return os.cpu_count() or 1
+
+
+# --watch の監視対象（プロジェクトルート相対の glob）
+WATCH_PATTERNS = (
+    'categories/*/*/ai/*.yaml',
+    'categories/*/*/ai/*.yml',
+    f'categories/*/*/{AI_DOCUMENT_SCHEME_JSON}',
+    f'categories/*/*/{Path(CREATE_HUMAN_DOCUMENT_SCRIPT).parent}/*.py',
+    'common/scheme.json',
+    'common/*.py',
+    'common/tools/*.py',
+)
+
+
+def snapshot_watched_files() -> dict[Path, tuple[int, int]]:
+    """監視対象ファイルの {パス: (mtime_ns, size)} を返す"""
+    root = get_project_root()
+    snapshot = {}
+    for pattern in WATCH_PATTERNS:
+        for path in root.glob(pattern):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+def _changed_paths(before: dict[Path, tuple[int, int]], after: dict[Path, tuple[int, int]]) -> set[Path]:
+    """2 つのスナップショット間で追加・変更・削除されたパス"""
+    return {p for p in before.keys() | after.keys() if before.get(p) != after.get(p)}
+
+
+def _matches_declared_dependencies(category: str, doc_type: str, changed: set[Path]) -> bool:
+    """
+    doc_type の DOCUMENT_DEPENDENCIES・DOCUMENT_META_DEPENDENCIES（categories 相対の glob）に
+    変更ファイル（削除を含む）が一致するか（meta が変わったかはマニフェストの is_up_to_date が判定する）
+    """
+    script_path = get_doc_type_dir(category, doc_type) / CREATE_HUMAN_DOCUMENT_SCRIPT
+    patterns = get_declared_dependencies(script_path) + get_declared_dependencies(
+        script_path, 'DOCUMENT_META_DEPENDENCIES'
+    )
+    if not patterns:
+        return False
+    categories_dir = get_categories_dir()
+    for path in changed:
+        try:
+            rel = path.relative_to(categories_dir)
+        except ValueError:
+            continue
+        if any(rel.match(pattern) for pattern in patterns):
+            return True
+    return False
+
+
+def collect_affected_targets(changed: set[Path], manifest: dict) -> list[Path]:
+    """
+    変更されたファイル（絶対パス）から処理対象の YAML をカテゴリ・doc_type 順で返す。
+    - 変更された YAML 自身
+    - マニフェストの依存グラフで影響を受ける YAML（変換中に読まれた他ドキュメント）
+    - DOCUMENT_DEPENDENCIES・DOCUMENT_META_DEPENDENCIES の宣言に一致する doc_type
+      （WBS・project_summary 等。マニフェストが無くても判定できる）
+    - scheme.json / 変換スクリプトが変わった doc_type の YAML
+    - common/ 配下（共通モジュール・共通スキーマ）が変わった場合は全 YAML
+    """
+    common_dir = get_project_root() / 'common'
+    everything = any(common_dir in p.parents for p in changed)
+    affected = build_manifest.affected_documents(manifest, changed)
+    changed_dirs = {p.parent.parent for p in changed if p.suffix in ('.json', '.py')}
+    targets = []
+    for category in get_available_categories():
+        for doc_type in get_doc_types(category):
+            doc_type_dir = get_doc_type_dir(category, doc_type)
+            whole_doc_type = (
+                everything
+                or doc_type_dir in changed_dirs
+                or _matches_declared_dependencies(category, doc_type, changed)
+            )
+            for yaml_file in get_doc_type_yaml_files(category, doc_type):
+                if (
+                    whole_doc_type
+                    or yaml_file in changed
+                    or build_manifest.to_manifest_key(yaml_file) in affected
+                ):
+                    targets.append(yaml_file)
+    return targets
+
+
+def git_changed_files(ref: str) -> set[Path]:
+    """
+    ref から作業ツリーまでに変更されたファイル（コミット済み・未コミット・未追跡、削除を含む）の絶対パスを返す。
+    git diff --name-only（リネームは旧・新パスの両方）と git ls-files --others で取得する。
+    git の実行に失敗した場合は subprocess.CalledProcessError / OSError を送出する。
+    """
+    root = get_project_root()
+    commands = [
+        ['git', 'diff', '--name-only', '--no-renames', '--relative', '-z', ref, '--'],
+        ['git', 'ls-files', '--others', '--exclude-standard', '-z'],
+    ]
+    changed = set()
+    for cmd in commands:
+        result = subprocess.run(cmd, cwd=root, capture_output=True, text=True, check=True)
+        changed.update(root / name for name in result.stdout.split('\0') if name)
+    return changed
+
+
+def process_changed_since(
+    ref: str,
+    validate_only: bool = False,
+    engine: str = 'inprocess',
+    jobs: int = 1,
+    manifest: Optional[dict] = None,
+    force: bool = False,
+    skip_link_check: bool = False,
+) -> tuple[int, int, int]:
+    """git の ref 以降の変更から影響を受ける YAML だけをカテゴリごとに処理する"""
+    changed = git_changed_files(ref)
+    targets = collect_affected_targets(changed, manifest or {'documents': {}})
+    print(f"\n🔀 {ref} からの変更: {len(changed)} ファイル → 対象 YAML {len(targets)} 件")
+    groups = []
+    for category in get_available_categories():
+        files = [f for f in targets if f.parent.parent.parent.name == category]
+        if files:
+            header = f"\n📦 カテゴリ: {category}\n" + "=" * 50
+            groups.append((header, files))
+    return process_yaml_files(groups, validate_only, engine, jobs, manifest, force, skip_link_check)
+
+
+def watch(
+    validate_only: bool = False,
+    engine: str = 'inprocess',
+    manifest: Optional[dict] = None,
+    skip_link_check: bool = True,
+    interval: float = 0.1,
+    debounce: float = 0.15,
+) -> None:
+    """
+    監視対象をポーリングし、変更があれば変更された YAML と依存する YAML だけを再ビルドする。
+    書き込みが続く間は debounce 秒静まるまで待ってからまとめて再ビルドする。
+    common/ の Python が変わったときはモジュールを読み直すためプロセスごと再起動する。
+    skip_link_check（既定）で成功した YAML はマニフェストにリンク未確認として記録し、リンクを確認するビルドでは再検証させる。
+    """
+    if manifest is None:
+        manifest = build_manifest.load_manifest()
+    snapshot = snapshot_watched_files()
+    print(f"\n👀 監視中（{len(snapshot)} ファイル、Ctrl+C で終了）")
+    while True:
+        time.sleep(interval)
+        current = snapshot_watched_files()
+        changed = _changed_paths(snapshot, current)
+        if not changed:
+            continue
+        # デバウンス: 連続した書き込みが落ち着くまで待つ
+        while True:
+            time.sleep(debounce)
+            settled = snapshot_watched_files()
+            more = _changed_paths(current, settled)
+            if not more:
+                break
+            changed |= more
+            current = settled
+        snapshot = current
+
+        common_dir = get_project_root() / 'common'
+        if any(p.suffix == '.py' and common_dir in p.parents for p in changed):
+            print("\n🔄 common/ の Python が変更されたため再起動します")
+            build_manifest.save_manifest(manifest)
+            os.execv(sys.executable, [sys.executable] + sys.argv)
+
+        started = time.perf_counter()
+        targets = collect_affected_targets(changed, manifest)
+        success, fail, skipped = process_yaml_files(
+            [(None, targets)], validate_only, engine, 1, manifest, False, skip_link_check
+        )
+        build_manifest.save_manifest(manifest)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"\n{format_result_summary(success, fail, skipped)}（{elapsed_ms:.0f} ms）")
+        print(f"👀 監視中（Ctrl+C で終了）")
 
 
 def main():
@@ -172,6 +782,24 @@ def main():
     parser.add_argument('--category', '-c', default=None, help='特定カテゴリのみ処理')
     parser.add_argument('--validate-only', '-v', action='store_true', help='バリデーションのみ')
     parser.add_argument('--list', action='store_true', help='カテゴリ/doc_type一覧を表示')
+    parser.add_argument('--engine', choices=ENGINES, default='inprocess',
+                        help='inprocess: 1 プロセス内で実行（既定） / subprocess: YAML ごとにサブプロセスで実行')
+    parser.add_argument('--jobs', '-j', type=int, default=default_jobs(),
+                        help='並列ワーカー数（既定: CPU 数。1 で直列実行）')
+    parser.add_argument('--force', '-f', action='store_true',
+                        help='ビルドマニフェストを無視し、変更のない YAML も再ビルドする')
+    parser.add_argument('--skip-link-check', action='store_true', help='GitHub リンクの 404 チェックをスキップ')
+    parser.add_argument('--refresh-links', action='store_true',
+                        help='GitHub リンクのキャッシュ（.yaml-bridge/linkcache.sqlite）を使わず再確認する')
+    parser.add_argument('--watch', '-w', action='store_true',
+                        help='YAML・スキーマ・変換スクリプトを監視し、変更された YAML と依存先だけを再ビルドし続ける')
+    parser.add_argument('--watch-interval', type=float, default=0.1, help='--watch のポーリング間隔（秒）')
+    parser.add_argument('--debounce', type=float, default=0.15, help='--watch で連続した書き込みをまとめる待ち時間（秒）')
+    parser.add_argument('--changed-since', metavar='REF', default=None,
+                        help='git の REF 以降に変更されたファイル（YAML・スキーマ・変換スクリプト・common/）の影響を受ける YAML だけを処理')
+    parser.add_argument('--timings', action='store_true', help='フェーズ別の所要時間を計測し、遅いドキュメント / フェーズを表示する')
+    parser.add_argument('--trace', metavar='OUT_JSON', default=None,
+                        help='フェーズ別の計測結果を Chrome trace-event 形式の JSON に書き出す（--timings を含む）')
     
     args = parser.parse_args()
     
@@ -181,28 +809,73 @@ def main():
     
     if args.list:
         print("\n利用可能なカテゴリ/doc_type:")
-        for category in get_available_categories():
+        for category, doc_types in workspace_index.get_doc_types_by_category().items():
             print(f"\n📦 {category}")
-            for doc_type in get_doc_types(category):
+            for doc_type in doc_types:
                 print(f"   └─ {doc_type}")
         sys.exit(0)
     
+    if args.timings or args.trace:
+        build_trace.enable()
+    if args.refresh_links:
+        # in-process・--jobs のワーカー・サブプロセスの validate.py のいずれにも伝わるよう環境変数で渡す
+        os.environ[LINK_CACHE_REFRESH_ENV] = '1'
+    
+    manifest = build_manifest.load_manifest()
+    
+    if args.watch:
+        # 監視中は応答速度を優先し GitHub リンクの 404 チェック（ネットワーク）は行わない。
+        # マニフェストにはリンク未確認（link_checked: false）として記録されるため、次の make build ではスキップせずに検証する
+        success, fail, skipped = process_all(args.validate_only, args.engine, args.jobs, manifest, args.force, True)
+        build_manifest.save_manifest(manifest)
+        print("\n" + "=" * 50)
+        print(format_result_summary(success, fail, skipped))
+        for line in format_build_stats():
+            print(line)
+        print("=" * 50)
+        try:
+            watch(args.validate_only, args.engine, manifest, True, args.watch_interval, args.debounce)
+        except KeyboardInterrupt:
+            build_manifest.save_manifest(manifest)
+            print("\n👋 監視を終了しました")
+        sys.exit(0)
+    
     if args.all:
-        success, fail = process_all(args.validate_only)
+        success, fail, skipped = process_all(args.validate_only, args.engine, args.jobs, manifest, args.force, args.skip_link_check)
+        build_manifest.save_manifest(manifest)
         # 全 human/document.md 作成後に MD 内相対リンクを検証
         print("\n" + "=" * 50)
         print("🔍 MD リンク検証（human/document.md 内の相対リンク）")
         print("=" * 50)
-        validate_script = get_project_root() / 'common' / 'tools' / 'validate.py'
-        md_link_ok = run_command(
-            [sys.executable, str(validate_script), '--check-md-links', '--all'],
-            "MD リンク検証"
-        )
+        with build_trace.span('md_links'):
+            md_link_ok = run_md_link_check(args.engine)
+        report_timings(args.trace)
         print("\n" + "=" * 50)
-        print(f"📊 結果: 成功 {success} / 失敗 {fail}" + (" / MD リンク OK" if md_link_ok else " / MD リンク NG"))
+        print(format_result_summary(success, fail, skipped) + (" / MD リンク OK" if md_link_ok else " / MD リンク NG"))
+        for line in format_build_stats():
+            print(line)
         print("=" * 50)
         sys.exit(0 if (fail == 0 and md_link_ok) else 1)
     
+    elif args.changed_since:
+        try:
+            success, fail, skipped = process_changed_since(
+                args.changed_since, args.validate_only, args.engine, args.jobs, manifest, args.force, args.skip_link_check
+            )
+        except (subprocess.CalledProcessError, OSError) as e:
+            detail = (getattr(e, 'stderr', None) or str(e)).strip()
+            print(f"❌ git で変更ファイルを取得できません: {args.changed_since}")
+            print(f"   {detail}")
+            sys.exit(1)
+        build_manifest.save_manifest(manifest)
+        report_timings(args.trace)
+        print("\n" + "=" * 50)
+        print(format_result_summary(success, fail, skipped))
+        for line in format_build_stats():
+            print(line)
+        print("=" * 50)
+        sys.exit(0 if fail == 0 else 1)
+    
     elif args.category:
         available = get_available_categories()
         if args.category not in available:
@@ -210,9 +883,15 @@ def main():
             print(f"   利用可能: {', '.join(available)}")
             sys.exit(1)
         
-        success, fail = process_category(args.category, args.validate_only)
+        success, fail, skipped = process_category(
+            args.category, args.validate_only, args.engine, args.jobs, manifest, args.force, args.skip_link_check
+        )
+        build_manifest.save_manifest(manifest)
+        report_timings(args.trace)
         print("\n" + "=" * 50)
-        print(f"📊 結果: 成功 {success} / 失敗 {fail}")
+        print(format_result_summary(success, fail, skipped))
+        for line in format_build_stats():
+            print(line)
         print("=" * 50)
         sys.exit(0 if fail == 0 else 1)
     
@@ -222,16 +901,26 @@ def main():
             print(f"❌ ファイルが見つかりません: {yaml_path}")
             sys.exit(1)
         
-        success = process_yaml(yaml_path, args.validate_only)
+        _, fail, skipped = process_yaml_files(
+            [(None, [yaml_path])], args.validate_only, args.engine, 1, manifest, args.force, args.skip_link_check
+        )
+        build_manifest.save_manifest(manifest)
+        if skipped:
+            print(f"\n⏭️  変更がないためスキップしました: {yaml_path}（--force で再ビルド）")
+        report_timings(args.trace)
         print("\n" + "=" * 50)
-        print("✅ 完了" if success else "❌ エラーあり")
+        print("✅ 完了" if not fail else "❌ エラーあり")
         print("=" * 50)
-        sys.exit(0 if success else 1)
+        sys.exit(0 if not fail else 1)
     
     else:
-        success, fail = process_all(args.validate_only)
+        success, fail, skipped = process_all(args.validate_only, args.engine, args.jobs, manifest, args.force, args.skip_link_check)
+        build_manifest.save_manifest(manifest)
+        report_timings(args.trace)
         print("\n" + "=" * 50)
-        print(f"📊 結果: 成功 {success} / 失敗 {fail}")
+        print(format_result_summary(success, fail, skipped))
+        for line in format_build_stats():
+            print(line)
         print("=" * 50)
         sys.exit(0 if fail == 0 else 1)
 
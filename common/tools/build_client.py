@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+ビルドデーモンのクライアント（起動の軽い CLI）
+デーモン（common/tools/build_daemon.py）が起動していればソケット経由で処理を依頼し、
+起動していなければ同じ処理をこのプロセス内で実行する。
+
+使い方:
+  python3 common/tools/build_client.py build categories/overview/wbs/ai/document.yaml
+  python3 common/tools/build_client.py validate categories/overview/wbs/ai/document.yaml
+  python3 common/tools/build_client.py render categories/overview/wbs/ai/document.yaml
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from build_daemon import handle_request, send_request, wait_for_daemon
+
+# デーモンへの接続を待つ秒数（起動していないときにすぐフォールバックするため短くする）
+CONNECT_TIMEOUT = 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ビルドデーモンに validate / render / build を依頼する（未起動ならこのプロセスで実行）')
+    parser.add_argument('op', choices=('build', 'validate', 'render'), help='実行する処理')
+    parser.add_argument('input', help='処理するYAMLファイルのパス')
+    parser.add_argument('--validate-only', '-v', action='store_true', help='build 時: バリデーションのみ')
+    parser.add_argument('--force', '-f', action='store_true', help='build 時: 変更がなくても再ビルドする')
+    parser.add_argument('--skip-link-check', action='store_true', help='GitHub リンクの 404 チェックをスキップ')
+    parser.add_argument('--no-daemon', action='store_true', help='デーモンを使わずこのプロセスで実行する')
+    parser.add_argument('--timeout', type=float, default=300, help='デーモンの応答を待つ秒数（既定: 300）')
+    args = parser.parse_args()
+
+    request = {
+        'op': args.op,
+        'path': str(Path(args.input).resolve()),
+        'validate_only': args.validate_only,
+        'force': args.force,
+        'skip_link_check': args.skip_link_check,
+    }
+    response = None
+    if not args.no_daemon:
+        try:
+            response = send_request(request, timeout=args.timeout, connect_timeout=CONNECT_TIMEOUT)
+            if response.get('restart'):
+                # 共通モジュールの変更でデーモンが再起動した。起動を待って送り直す
+                print(response.get('output', ''))
+                if not wait_for_daemon():
+                    raise OSError("再起動したデーモンが応答しません")
+                response = send_request(request, timeout=args.timeout, connect_timeout=CONNECT_TIMEOUT)
+        except (FileNotFoundError, ConnectionRefusedError):
+            response = None  # デーモンが起動していない
+        except (OSError, ValueError) as e:
+            # 送信後の失敗（デーモンが処理中に終了した・応答がない等）はやり直さない（二重にビルドしないため）
+            print(f"❌ ビルドデーモンとの通信に失敗しました: {e}")
+            sys.exit(1)
+    if response is None:
+        response = handle_request(request)
+    output = response.get('output', '')
+    if output:
+        print(output, end='' if output.endswith('\n') else '\n')
+    sys.exit(0 if response.get('ok') else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+ビルドデーモン（常駐プロセス）
+検証器・読み込み済みの変換スクリプト等をメモリに保持したまま、Unix ドメインソケット経由で
+validate / render / build リクエストを受け付ける。クライアントは common/tools/build_client.py。
+
+使い方:
+  python3 common/tools/build_daemon.py start     # バックグラウンドで起動
+  python3 common/tools/build_daemon.py status    # 起動しているか確認
+  python3 common/tools/build_daemon.py stop      # 停止
+  python3 common/tools/build_daemon.py serve     # フォアグラウンドで起動
+
+プロトコル（1 接続 1 リクエスト、UTF-8 の JSON 1 行ずつ）:
+  → {"op": "build", "path": "/abs/.../ai/document.yaml", "validate_only": false, "force": false, "skip_link_check": false}
+  ← {"ok": true, "output": "...コンソール出力..."}
+  op は ping / validate / render / build / shutdown。
+  変換スクリプトは mtime・サイズが変わっていれば読み直す。common の共通モジュール（build_manifest.COMMON_INPUT_FILES）が
+  起動時から変わっていればリクエストを処理せず {"ok": false, "restart": true, ...} を返して自身を再起動する
+  （クライアントは再起動を待って送り直す）。
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# common/ を import するため
+_common_dir = Path(__file__).resolve().parent.parent
+if str(_common_dir) not in sys.path:
+    sys.path.insert(0, str(_common_dir))
+from config import BUILD_DAEMON_SOCKET, CREATE_HUMAN_DOCUMENT_SCRIPT
+from paths import get_build_cache_dir, get_doc_type_dir, get_project_root, iter_doc_type_dirs
+
+# AF_UNIX のパス長上限（Linux 108 / macOS 104 バイト）に余裕を持たせた値
+_MAX_SOCKET_PATH_LEN = 100
+
+# serve() で起動したときの共通モジュールのハッシュ（{マニフェストキー: sha256}）
+_common_digests: dict = {}
+
+
+def get_daemon_socket_path() -> Path:
+    """デーモンのソケットパス。.yaml-bridge 配下が長すぎる場合は一時ディレクトリに置く"""
+    path = get_build_cache_dir() / BUILD_DAEMON_SOCKET
+    if len(os.fsencode(path)) <= _MAX_SOCKET_PATH_LEN:
+        return path
+    digest = hashlib.sha1(os.fsencode(get_project_root())).hexdigest()[:12]
+    return Path(tempfile.gettempdir()) / f"yaml-bridge-{digest}.sock"
+
+
+def get_daemon_log_path() -> Path:
+    """start で起動したデーモンの出力先"""
+    return get_build_cache_dir() / 'build-daemon.log'
+
+
+def send_request(request: dict, timeout: float = None, connect_timeout: float = None) -> dict:
+    """
+    デーモンにリクエストを送り、レスポンスを返す。
+    起動していない場合は接続時の FileNotFoundError / ConnectionRefusedError を送出する。
+    送信後の失敗（応答なし・timeout 秒以内に応答がない等）も OSError を送出する。
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        raise OSError("Unix ドメインソケットが使えない環境です")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(connect_timeout if connect_timeout is not None else timeout)
+        sock.connect(str(get_daemon_socket_path()))
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as f:
+            line = f.readline()
+    if not line:
+        raise OSError("デーモンから応答がありません")
+    return json.loads(line.decode('utf-8'))
+
+
+def wait_for_daemon(timeout: float = 10) -> bool:
+    """デーモンが ping に応答するまで最大 timeout 秒待つ。応答すれば True"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            send_request({'op': 'ping'}, timeout=1)
+        except OSError:
+            time.sleep(0.1)
+            continue
+        return True
+    return False
+
+
+def _hash_common_inputs() -> dict:
+    import build_manifest
+
+    root = get_project_root()
+    return build_manifest.hash_input_files([root / p for p in build_manifest.COMMON_INPUT_FILES])
+
+
+def _changed_common_inputs() -> list[str]:
+    """起動時から変わった共通モジュール（マニフェストキー）"""
+    current = _hash_common_inputs()
+    return sorted(key for key, digest in current.items() if _common_digests.get(key) != digest)
+
+
+def handle_request(request: dict) -> dict:
+    """
+    リクエスト 1 件を処理して {"ok", "output"} を返す。
+    デーモンとクライアントのフォールバック（in-process 実行）で共通利用する。
+    """
+    import build
+    import build_manifest
+
+    op = request.get('op')
+    if op == 'ping':
+        return {'ok': True, 'output': 'pong'}
+    if op not in ('validate', 'render', 'build'):
+        return {'ok': False, 'output': f"❌ 未知の op: {op}"}
+
+    yaml_path = Path(request.get('path') or '')
+    if not yaml_path.is_file():
+        return {'ok': False, 'output': f"❌ ファイルが見つかりません: {yaml_path}"}
+    skip_link_check = bool(request.get('skip_link_check'))
+
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        if op == 'validate':
+            from validate import validate_document
+            ok, lines = validate_document(yaml_path, skip_link_check=skip_link_check)
+            print('\n'.join(lines))
+        elif op == 'render':
+            category, doc_type = build.detect_doc_type_from_yaml(yaml_path)
+            if not category or not doc_type:
+                print(f"  ⚠️  category/doc_typeを検出できません: {yaml_path}")
+                ok = False
+            else:
+                script = get_doc_type_dir(category, doc_type) / CREATE_HUMAN_DOCUMENT_SCRIPT
+                md_output = build.get_output_path(yaml_path, category, doc_type)
+                ok = build.run_render(yaml_path, script, md_output, 'inprocess')
+        else:
+            manifest = build_manifest.load_manifest()
+            _, fail, skipped = build.process_yaml_files(
+                [(None, [yaml_path])],
+                bool(request.get('validate_only')),
+                'inprocess',
+                1,
+                manifest,
+                bool(request.get('force')),
+                skip_link_check,
+            )
+            build_manifest.save_manifest(manifest)
+            if skipped:
+                print(f"⏭️  変更がないためスキップしました: {yaml_path}（--force で再ビルド）")
+            ok = not fail
+    return {'ok': ok, 'output': buf.getvalue()}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line.decode('utf-8'))
+        except ValueError:
+            request = None
+        if not isinstance(request, dict):
+            response = {'ok': False, 'output': "❌ リクエストが JSON オブジェクトではありません"}
+        elif request.get('op') == 'shutdown':
+            response = {'ok': True, 'output': '停止します'}
+            # serve_forever と同じスレッドから shutdown() を呼ぶと待ち続けるため別スレッドで呼ぶ
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif request.get('op') != 'ping' and (changed := _changed_common_inputs()):
+            # 読み込み済みの共通モジュールが古いため、処理せずに再起動する（serve() が停止後に execv する）
+            response = {
+                'ok': False,
+                'restart': True,
+                'output': f"🔄 共通モジュールが変更されたため再起動します: {', '.join(changed)}",
+            }
+            print(response['output'], flush=True)
+            self.server.restart = True
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            started = time.perf_counter()
+            try:
+                response = handle_request(request)
+            except Exception as e:
+                response = {'ok': False, 'output': f"❌ {type(e).__name__}: {e}"}
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            status = 'ok' if response['ok'] else 'NG'
+            print(f"{request.get('op')} {request.get('path', '')} → {status} ({elapsed_ms:.0f} ms)", flush=True)
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+
+
+def serve() -> int:
+    """フォアグラウンドでデーモンを起動する"""
+    if not hasattr(socket, 'AF_UNIX'):
+        print("❌ Unix ドメインソケットが使えない環境ではデーモンを起動できません")
+        return 1
+    sock_path = get_daemon_socket_path()
+    sock_path.parent.mkdir(parents=True, exist_ok=True)
+    if sock_path.exists():
+        try:
+            send_request({'op': 'ping'}, timeout=1)
+        except OSError:
+            sock_path.unlink()  # 前回異常終了したときのソケットファイル
+        else:
+            print(f"❌ すでに起動しています: {sock_path}")
+            return 1
+
+    # 重いモジュール（jsonschema・変換スクリプト等）を先に読み込んでおく
+    _common_digests.update(_hash_common_inputs())
+    import build
+    build._load_validate_document()
+    for _, _, doc_type_dir in iter_doc_type_dirs():
+        try:
+            build._load_renderer_module(doc_type_dir / CREATE_HUMAN_DOCUMENT_SCRIPT)
+        except Exception:
+            pass
+
+    # UnixStreamServer はリクエストを 1 件ずつ処理する（変換スクリプトやマニフェストを同時に触らない）
+    with socketserver.UnixStreamServer(str(sock_path), _RequestHandler) as server:
+        server.restart = False
+        print(f"🚀 ビルドデーモン起動: {sock_path}（pid {os.getpid()}）", flush=True)
+        try:
+            server.serve_forever(poll_interval=0.2)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            with contextlib.suppress(OSError):
+                sock_path.unlink()
+    if server.restart:
+        os.execv(sys.executable, [sys.executable, str(Path(__file__).resolve()), 'serve'])
+    print("👋 ビルドデーモンを停止しました", flush=True)
+    return 0
+
+
+def start() -> int:
+    """デーモンをバックグラウンドで起動し、応答するまで待つ"""
+    try:
+        send_request({'op': 'ping'}, timeout=1)
+    except OSError:
+        pass
+    else:
+        print(f"✅ すでに起動しています: {get_daemon_socket_path()}")
+        return 0
+    log_path = get_daemon_log_path()
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, 'ab') as log:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), 'serve'],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    if wait_for_daemon():
+        print(f"✅ ビルドデーモン起動: {get_daemon_socket_path()}")
+        return 0
+    print(f"❌ ビルドデーモンが起動しませんでした（ログ: {log_path}）")
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ビルドデーモン（Unix ドメインソケットで validate/render/build を受け付ける）')
+    parser.add_argument('command', choices=('serve', 'start', 'stop', 'status'), help='serve: フォアグラウンド起動 / start: バックグラウンド起動 / stop: 停止 / status: 状態表示')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        sys.exit(serve())
+    if args.command == 'start':
+        sys.exit(start())
+    try:
+        send_request({'op': 'shutdown' if args.command == 'stop' else 'ping'}, timeout=5)
+    except OSError:
+        print("⬜ ビルドデーモンは起動していません")
+        sys.exit(0 if args.command == 'stop' else 1)
+    print("✅ 停止しました" if args.command == 'stop' else f"✅ 起動中: {get_daemon_socket_path()}")
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
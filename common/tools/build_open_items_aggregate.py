@@ -15,7 +15,7 @@ _common_dir = Path(__file__).resolve().parent.parent
 if str(_common_dir) not in sys.path:
     sys.path.insert(0, str(_common_dir))
 from paths import get_categories_dir, get_available_categories, get_doc_types, get_project_root
-from md_base import load_yaml, generate_open_items_markdown
+from md_base import load_yaml, generate_open_items_markdown, write_text_if_changed
 
 
 def build_open_items_aggregate(output_path: Path | None = None) -> str:
@@ -65,10 +65,8 @@ def main() -> None:
     output_path = Path(args.output).resolve() if args.output else None
     md = build_open_items_aggregate(output_path=output_path)
     if args.output:
-        out = Path(args.output)
-        out.parent.mkdir(parents=True, exist_ok=True)
-        out.write_text(md, encoding="utf-8")
-        print(f"✅ {args.output}")
+        changed = write_text_if_changed(Path(args.output), md)
+        print(f"✅ {args.output}" if changed else f"✅ {args.output}（変更なし）")
     else:
         print(md)
 
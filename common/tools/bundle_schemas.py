@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+各 doc_type の ai/scheme.json を $ref 展開済みの 1 ファイル（.yaml-bridge/schemas/{category}/{doc_type}.json）に書き出す。
+validate.py / build.py は最新のバンドルがあればそれを読み込み、$ref の解決（Registry・参照先ファイルの読み込み）を省く。
+元ファイル（scheme.json・common/scheme.json 等）が変わったバンドルだけを書き直す。
+
+使い方:
+  python3 common/tools/bundle_schemas.py            # 古い・無いバンドルを書き出す
+  python3 common/tools/bundle_schemas.py --force    # 全件書き直す
+  python3 common/tools/bundle_schemas.py --check    # 古い・無いバンドルがあれば一覧を表示して終了コード 1（書き出さない）
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# common/ を import するため
+_common_dir = Path(__file__).resolve().parent.parent
+if str(_common_dir) not in sys.path:
+    sys.path.insert(0, str(_common_dir))
+import schema_bundle
+
+
+def main():
+    parser = argparse.ArgumentParser(description='scheme.json を $ref 展開済みのバンドルに書き出す')
+    parser.add_argument('--force', action='store_true', help='最新のバンドルも書き直す')
+    parser.add_argument('--check', action='store_true', help='古い・無いバンドルがあれば終了コード 1（書き出さない）')
+    args = parser.parse_args()
+
+    if args.check:
+        stale = schema_bundle.stale_bundles()
+        for category, doc_type in stale:
+            print(f"❌ {category}/{doc_type}: バンドルが古いか存在しません")
+        if stale:
+            print(f"   python3 common/tools/bundle_schemas.py で書き出してください")
+            sys.exit(1)
+        print("✅ スキーマのバンドルはすべて最新です")
+        sys.exit(0)
+
+    written, fresh = schema_bundle.bundle_all(force=args.force)
+    for category, doc_type in written:
+        print(f"✅ {schema_bundle.get_bundle_path(category, doc_type)}")
+    print(f"📦 スキーマのバンドル: 書き出し {len(written)} 件（最新のため省略 {len(fresh)} 件）")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+解析済み YAML のディスクキャッシュ（.yaml-bridge/parsed/、common/parsed_cache.py）を管理する。
+
+使い方:
+  python3 common/tools/cache.py stats    # エントリ数・合計サイズ・上限・最後に使った時刻を表示
+  python3 common/tools/cache.py clear    # 全エントリを削除
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# common/ を import するため
+_common_dir = Path(__file__).resolve().parent.parent
+if str(_common_dir) not in sys.path:
+    sys.path.insert(0, str(_common_dir))
+import parsed_cache
+from config import PARSED_CACHE_DISABLE_ENV
+
+
+def _format_bytes(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size} B"
+
+
+def _format_time(epoch) -> str:
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(epoch)) if epoch is not None else '-'
+
+
+def show_stats() -> None:
+    summary = parsed_cache.get_summary()
+    print(f"📁 {parsed_cache.get_cache_dir()}")
+    print(f"🗂️  エントリ: {summary['entries']} 件")
+    print(f"💾 サイズ: {_format_bytes(summary['bytes'])} / 上限 {_format_bytes(summary['max_bytes'])}")
+    print(f"🕒 最後に使った時刻: 最古 {_format_time(summary['oldest'])} / 最新 {_format_time(summary['newest'])}")
+    if not parsed_cache.is_enabled():
+        print(f"⚠️  環境変数 {PARSED_CACHE_DISABLE_ENV} が設定されているため、キャッシュは使われません")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='解析済み YAML のディスクキャッシュを管理する')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('stats', help='エントリ数・合計サイズ・上限・最後に使った時刻を表示')
+    subparsers.add_parser('clear', help='全エントリを削除')
+    args = parser.parse_args()
+
+    if args.command == 'stats':
+        show_stats()
+    elif args.command == 'clear':
+        removed = parsed_cache.clear()
+        print(f"🗑️  解析済み YAML のキャッシュを削除しました: {removed} 件")
+
+
+if __name__ == '__main__':
+    main()
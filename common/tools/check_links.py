@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+GitHub リンクチェック（common/link_check.py）の CLI。
+
+使い方:
+  # URL を並列に HEAD で確認し、ステータスを表示
+  python3 common/tools/check_links.py https://github.com/owner/repo https://github.com/owner/repo/pull/1
+
+  # ローカルの代替 HTTP サーバーを立てて、並列化・keep-alive・リダイレクト・レート制限・制限時間の動作を確認
+  python3 common/tools/check_links.py --self-test
+
+環境変数 YAML_BRIDGE_LINK_CHECK_BASE_URL（config.LINK_CHECK_BASE_URL_ENV）を設定すると、
+validate.py を含むすべてのリンクチェックの送信先をそのサーバーに差し替えられる。
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# common/ を import するため
+_common_dir = Path(__file__).resolve().parent.parent
+if str(_common_dir) not in sys.path:
+    sys.path.insert(0, str(_common_dir))
+import link_cache
+import link_check
+from config import LINK_CHECK_BASE_URL_ENV
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """GitHub の代わりに応答するテスト用ハンドラ（パスで応答を切り替える）"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_HEAD(self):
+        path = urlsplit(self.path).path
+        with self.server.lock:
+            self.server.hits[path] = self.server.hits.get(path, 0) + 1
+            hits = self.server.hits[path]
+        headers = {}
+        if path.startswith('/ok'):
+            status = 200
+        elif path == '/missing':
+            status = 404
+        elif path == '/etag':
+            status = 304 if self.headers.get('If-None-Match') == '"v1"' else 200
+            headers = {'ETag': '"v1"'}
+        elif path == '/unavailable':
+            status = 503
+        elif path == '/moved':
+            status, headers = 301, {'Location': '/missing'}
+        elif path == '/limited':
+            status, headers = (429, {'Retry-After': '1'}) if hits == 1 else (200, {})
+        elif path == '/quota':
+            if hits == 1:
+                status = 403
+                headers = {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(int(time.time()) + 1)}
+            else:
+                status = 200
+        elif path.startswith('/slow'):
+            time.sleep(0.5 if path.startswith('/slow-half') else 3)
+            status = 200
+        else:
+            status = 404
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_stand_in_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.hits = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_self_test() -> int:
+    """ローカルの代替サーバーに対して link_check の動作を確認し、失敗があれば 1 を返す"""
+    server = _start_stand_in_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    failures = 0
+
+    def expect(label: str, ok: bool, detail: str = '') -> None:
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {label}" + (f"（{detail}）" if detail else ''))
+        if not ok:
+            failures += 1
+
+    try:
+        gh = 'https://github.com'
+        checker = link_check.LinkChecker(concurrency=4, deadline_seconds=10, base_url=base_url)
+        statuses = checker.check([f'{gh}/ok', f'{gh}/missing', f'{gh}/moved', f'{gh}/limited', f'{gh}/quota', f'{gh}/ok'])
+        expect("200 はそのまま返す", statuses.get(f'{gh}/ok') == 200, str(statuses.get(f'{gh}/ok')))
+        expect("404 を検出する", statuses.get(f'{gh}/missing') == 404, str(statuses.get(f'{gh}/missing')))
+        expect("リダイレクトを追跡する（301 → 404）", statuses.get(f'{gh}/moved') == 404, str(statuses.get(f'{gh}/moved')))
+        expect("429 + Retry-After の後に再試行する", statuses.get(f'{gh}/limited') == 200, str(statuses.get(f'{gh}/limited')))
+        expect("X-RateLimit-Remaining: 0 ならリセットまで待って再試行する",
+               statuses.get(f'{gh}/quota') == 200, str(statuses.get(f'{gh}/quota')))
+        expect("重複した URL は 1 回だけ確認する", server.hits.get('/ok') == 1, f"{server.hits.get('/ok')} 回")
+
+        server.connections = 0
+        checker = link_check.LinkChecker(concurrency=2, deadline_seconds=10, base_url=base_url)
+        checker.check([f'{gh}/ok/{i}' for i in range(20)])
+        expect("keep-alive で接続を使い回す（20 URL / 同時 2）",
+               checker.connections_opened <= 2 and server.connections <= 2,
+               f"接続 {server.connections} 本 / リクエスト {checker.requests_sent} 件")
+
+        checker = link_check.LinkChecker(concurrency=4, deadline_seconds=10, base_url=base_url)
+        started = time.monotonic()
+        checker.check([f'{gh}/slow-half/{i}' for i in range(8)])
+        elapsed = time.monotonic() - started
+        expect("同時実行数の上限で並列に確認する（0.5 秒 × 8 件 / 同時 4）", 0.9 <= elapsed < 2.0, f"{elapsed:.2f} 秒")
+
+        checker = link_check.LinkChecker(concurrency=2, deadline_seconds=1, base_url=base_url)
+        started = time.monotonic()
+        statuses = checker.check([f'{gh}/slow/1', f'{gh}/ok/after-deadline'])
+        elapsed = time.monotonic() - started
+        expect("全体の制限時間を超えた URL は未確認（None）にする",
+               statuses.get(f'{gh}/slow/1') is None and elapsed < 2.0, f"{elapsed:.2f} 秒")
+
+        # link_cache: 一時ファイルのキャッシュで、有効期間内の再利用・ETag による条件付き再確認・一時的な失敗を記録しないことを確認する
+        previous_base_url = os.environ.get(LINK_CHECK_BASE_URL_ENV)
+        os.environ[LINK_CHECK_BASE_URL_ENV] = base_url
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / 'linkcache.sqlite'
+            urls = [f'{gh}/etag', f'{gh}/missing']
+            link_cache.check_urls(urls, cache_path=cache_path)
+            hits_before = dict(server.hits)
+            statuses = link_cache.check_urls(urls, cache_path=cache_path)
+            expect("有効期間内はキャッシュから返す（リクエストなし）",
+                   server.hits == hits_before and statuses == {f'{gh}/etag': 200, f'{gh}/missing': 404}, str(statuses))
+            with sqlite3.connect(str(cache_path)) as conn:
+                conn.execute("UPDATE links SET checked_at = 0")
+            before = link_cache.get_stats()['revalidated']
+            statuses = link_cache.check_urls(urls, cache_path=cache_path)
+            expect("期限切れは ETag で条件付き再確認し、304 なら前回のステータスを使う",
+                   link_cache.get_stats()['revalidated'] == before + 1 and statuses[f'{gh}/etag'] == 200, str(statuses))
+            link_cache.check_urls([f'{gh}/unavailable'], cache_path=cache_path)
+            hits_before = server.hits.get('/unavailable')
+            statuses = link_cache.check_urls([f'{gh}/unavailable'], cache_path=cache_path)
+            expect("5xx 等の一時的な失敗はキャッシュせず次回も確認する",
+                   server.hits.get('/unavailable', 0) > hits_before, str(statuses))
+            hits_before = server.hits.get('/missing')
+            link_cache.check_urls(urls, cache_path=cache_path, refresh=True)
+            expect("refresh 時はキャッシュを使わず確認し直す", server.hits.get('/missing') == hits_before + 1)
+            blocker = Path(tmp) / 'blocker'
+            blocker.write_text('')
+            try:
+                statuses = link_cache.check_urls([f'{gh}/ok'], cache_path=blocker / 'linkcache.sqlite')
+            except OSError as e:
+                statuses = {'error': str(e)}
+            expect("キャッシュの置き場所を作れなくてもキャッシュなしで確認する", statuses == {f'{gh}/ok': 200}, str(statuses))
+        if previous_base_url is None:
+            os.environ.pop(LINK_CHECK_BASE_URL_ENV, None)
+        else:
+            os.environ[LINK_CHECK_BASE_URL_ENV] = previous_base_url
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print()
+    print("=" * 40)
+    if failures:
+        print(f"❌ セルフテスト失敗（{failures} 件）")
+        return 1
+    print("✅ セルフテスト成功")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GitHub リンクを並列に HEAD で確認する')
+    parser.add_argument('urls', nargs='*', help='確認する URL')
+    parser.add_argument('--self-test', action='store_true', help='ローカルの代替 HTTP サーバーでリンクチェックの動作を確認する')
+    parser.add_argument('--timeout', type=float, default=5, help='1 リクエストのタイムアウト（秒）')
+    args = parser.parse_args()
+
+    if args.self_test:
+        sys.exit(run_self_test())
+    if not args.urls:
+        parser.error('URL を指定するか --self-test を指定してください')
+
+    statuses = link_check.check_urls(args.urls, timeout=args.timeout)
+    broken = 0
+    for url in args.urls:
+        status = statuses.get(url)
+        if status == 404:
+            broken += 1
+        mark = '❌' if status == 404 else ('✅' if status is not None else '⚠️')
+        print(f"{mark} {status if status is not None else '未確認'} {url}")
+    sys.exit(1 if broken else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+schema_compiler（生成した検証コード）と jsonschema（Draft7Validator）の結果が一致するかを確認する。
+
+各 doc_type の scheme.json について、その doc_type の YAML（invalid_ で始まるサンプルを含む）と、
+それらを壊した変種（キーの削除・型の違う値への置き換え・配列を空にする等）を両方で検証し、
+エラーの順序・パス・メッセージ・context と、validate_yaml の出力行（通常 / --verbose）を比較する。
+あわせて両者の検証時間を表示する。
+
+使い方:
+  python3 common/tools/check_schema_compiler.py
+  python3 common/tools/check_schema_compiler.py --mutations 500 --seed 1
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+
+# common/ を import するため
+_common_dir = Path(__file__).resolve().parent.parent
+if str(_common_dir) not in sys.path:
+    sys.path.insert(0, str(_common_dir))
+import schema_compiler
+from config import AI_DOCUMENT_SCHEME_JSON
+from md_base import load_yaml
+from paths import get_all_category_doc_type_pairs, get_doc_type_dir
+from validate import get_validator, validate_yaml
+
+# 壊した変種で差し込む値（型違い・空・真偽値と数値の区別・enum に無い文字列など）
+_MUTATION_VALUES = [None, 0, 1, 1.0, 1.5, True, False, '', 'x', 'todo', '1.0', '1.0.0', [], ['x'], [1], {}, {'id': 'x'}]
+
+
+def _error_key(error) -> tuple:
+    return (list(error.absolute_path), error.message, [sub.message for sub in error.context or ()])
+
+
+def _nodes(instance, path=()):
+    """(パス, 値) を列挙する"""
+    yield path, instance
+    if isinstance(instance, dict):
+        for key, value in instance.items():
+            yield from _nodes(value, path + (key,))
+    elif isinstance(instance, list):
+        for index, value in enumerate(instance):
+            yield from _nodes(value, path + (index,))
+
+
+def _mutate(instance, rng: random.Random):
+    """instance のどこか 1 か所を壊したコピーを返す"""
+    nodes = list(_nodes(instance))
+    path, value = rng.choice(nodes)
+    replacement = copy.deepcopy(rng.choice(_MUTATION_VALUES))
+    if not path:
+        return replacement
+    mutated = copy.deepcopy(instance)
+    parent = mutated
+    for key in path[:-1]:
+        parent = parent[key]
+    op = rng.random()
+    if isinstance(parent, dict) and op < 0.3:
+        del parent[path[-1]]
+    elif isinstance(value, list) and op < 0.5:
+        value = parent[path[-1]]
+        if value and rng.random() < 0.5:
+            value.clear()
+        else:
+            value.append(replacement)
+    else:
+        parent[path[-1]] = replacement
+    return mutated
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='schema_compiler と jsonschema の検証結果を比較する')
+    parser.add_argument('--mutations', type=int, default=100, help='doc_type ごとに作る壊した変種の数')
+    parser.add_argument('--seed', type=int, default=0, help='変種を作る乱数のシード')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    checked = 0
+    mismatches = 0
+    compiled_seconds = 0.0
+    reference_seconds = 0.0
+    for category, doc_type in get_all_category_doc_type_pairs():
+        doc_dir = get_doc_type_dir(category, doc_type)
+        schema_path = doc_dir / AI_DOCUMENT_SCHEME_JSON
+        if not schema_path.exists():
+            continue
+        _, compiled = get_validator(schema_path)
+        _, reference = get_validator(schema_path, compiled=False)
+        label = f"{category}/{doc_type}"
+        if not isinstance(compiled, schema_compiler.CompiledValidator):
+            print(f"⚠️  {label}: コンパイラ未対応のため jsonschema で検証しています")
+            continue
+        samples = []
+        for yaml_path in sorted((doc_dir / 'ai').glob('*.yaml')):
+            try:
+                samples.append(load_yaml(str(yaml_path)))
+            except Exception:
+                continue
+        instances = list(samples)
+        for _ in range(args.mutations if samples else 0):
+            instances.append(_mutate(rng.choice(samples), rng))
+
+        doc_mismatches = 0
+        for instance in instances:
+            started = time.perf_counter()
+            got = [_error_key(e) for e in compiled.iter_errors(instance)]
+            compiled_seconds += time.perf_counter() - started
+            started = time.perf_counter()
+            expected = [_error_key(e) for e in reference.iter_errors(instance)]
+            reference_seconds += time.perf_counter() - started
+            same = got == expected
+            for verbose in (False, True):
+                same = same and (
+                    validate_yaml(instance, {}, verbose=verbose, validator=compiled)
+                    == validate_yaml(instance, {}, verbose=verbose, validator=reference)
+                )
+            checked += 1
+            if same:
+                continue
+            doc_mismatches += 1
+            if doc_mismatches <= 3:
+                print(f"❌ {label}: 結果が一致しません")
+                print(f"   jsonschema : {expected[:5]}")
+                print(f"   コンパイル版: {got[:5]}")
+        mismatches += doc_mismatches
+        mark = '✅' if not doc_mismatches else '❌'
+        print(f"{mark} {label}: {len(instances)} 件（不一致 {doc_mismatches} 件）")
+
+    print()
+    print("=" * 40)
+    if compiled_seconds > 0:
+        print(f"⏱️  検証時間: jsonschema {reference_seconds * 1000:.1f} ms / "
+              f"コンパイル版 {compiled_seconds * 1000:.1f} ms（{reference_seconds / compiled_seconds:.1f} 倍）")
+    if mismatches:
+        print(f"❌ 不一致 {mismatches} 件 / {checked} 件")
+        return 1
+    print(f"✅ すべて一致（{checked} 件）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+YAML の解析（doc_store.parse_yaml）で使う yaml.CSafeLoader（libyaml）と yaml.SafeLoader（純 Python）の
+解析結果が一致するかを確認し、両者の解析時間を比べる。
+
+- categories/ 配下の全 YAML（invalid_ で始まるサンプルを含む）と、日付・整数の表記・日本語・
+  アンカー / エイリアス・マージキー等を含むサンプルを両方で解析し、型・値・キーの順序・
+  エイリアスによる共有（同じオブジェクトか）まで比較する。解析できない YAML は両方がエラーになることを確認する
+- 全 YAML と、リポジトリの WBS を大きく複製した YAML の解析時間を比べる
+- doc_store.load_meta（先頭の meta だけを解析する）の結果が、全体を解析したときの meta と一致するかを確認し、
+  大きな WBS で全体の解析と meta だけの解析の時間を比べる
+- PyYAML が libyaml なしでビルドされている場合は、純 Python のローダーで解析していることを表示して終了する
+
+使い方:
+  python3 common/tools/check_yaml_loader.py
+  python3 common/tools/check_yaml_loader.py --repeat 10 --elements 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# common/ を import するため
+_common_dir = Path(__file__).resolve().parent.parent
+if str(_common_dir) not in sys.path:
+    sys.path.insert(0, str(_common_dir))
+import yaml
+
+import doc_store
+from config import PARSED_CACHE_DISABLE_ENV
+from doc_store import get_yaml_loader, parse_yaml
+from paths import get_categories_dir, get_project_root
+
+# YAML の解釈の違いが出やすい表記（YAML 1.1 の真偽値・8/16/2/60 進数・日付・日本語・アンカー等）
+SAMPLE_DOCUMENTS = {
+    'scalars': """
+date: 2024-01-20
+datetime: 2024-01-20T10:30:00+09:00
+datetime_naive: 2024-01-20 10:30:00.123
+datetime_utc: 2024-01-20T01:30:00Z
+ints: [0, -12, +7, 0o17, 017, 0x1F, 0b101, 1_000, 190:20:30]
+floats: [1.5, -0.0, 1e3, 6.8523015e+5, 1_000.5, 190:20:30.15, .inf, -.Inf, .nan]
+bools: [true, False, yes, No, on, OFF, y, n]
+nulls: [~, null, Null, ]
+strings: ["1.0", '2024-01-20', "0x1F", 1.0.0, "yes", '~']
+""",
+    'japanese': """
+meta:
+  title: "認証機能改修 WBS"
+  author: 山田太郎
+  note: 全角　スペースと　記号「」（）・…
+escaped: "タブ\\tと\\u3042と改行\\n"
+block: |
+  複数行の
+  テキスト（末尾の改行を保つ）
+folded: >-
+  折り返して
+  1 行になる
+keep: |+
+  末尾の空行を残す
+
+""",
+    'anchors': """
+base: &base
+  status: todo
+  owner: 山田太郎
+  tags: &tags [design, 要件]
+task1:
+  <<: *base
+  id: T-001
+task2:
+  <<: [*base, {priority: high}]
+  id: T-002
+shared: [*base, *base, *tags]
+""",
+    'tags': """
+binary: !!binary aGVsbG8g5pel5pys6Kqe
+set: !!set {a, b, 日本}
+omap: !!omap [{a: 1}, {b: 2}]
+pairs: !!pairs [{a: 1}, {a: 2}]
+str: !!str 123
+int: !!int "42"
+float: !!float "1"
+""",
+    'flow_and_keys': """
+? complex key
+: value
+"quoted key": 1
+123: int key
+2024-01-20: date key
+nested: {a: [1, {b: [2, 3]}], c: {}}
+empty: []
+""",
+}
+
+# 両方のローダーで解析エラーになるべき YAML
+BROKEN_DOCUMENTS = {
+    'unclosed_flow': "a: [\n",
+    'bad_indent': "a:\n  b: 1\n c: 2\n",
+    'undefined_alias': "a: *missing\n",
+    'tab_indent': "a:\n\tb: 1\n",
+    'alias_before_anchor': "a: *x\nb: &x 1\n",
+}
+
+
+def compare_trees(expected, actual, path: str = '', seen_expected=None, seen_actual=None):
+    """
+    2 つの解析結果を比べ、最初に見つけた違いの説明を返す（同じなら None）。
+    型・値（.nan や -0.0 も区別するため repr で比べる）・キーの順序に加え、
+    エイリアスで同じオブジェクトを共有している箇所が一致するかも比べる。
+    """
+    if seen_expected is None:
+        seen_expected, seen_actual = {}, {}
+    where = path or '(ルート)'
+    if type(expected) is not type(actual):
+        return f"{where}: 型が違います（{type(expected).__name__} / {type(actual).__name__}）"
+    if isinstance(expected, (dict, list, set)):
+        first_expected = seen_expected.get(id(expected))
+        first_actual = seen_actual.get(id(actual))
+        if first_expected != first_actual:
+            return f"{where}: エイリアスによる共有が違います（{first_expected} / {first_actual}）"
+        if first_expected is not None:
+            return None
+        seen_expected[id(expected)] = seen_actual[id(actual)] = where
+    if isinstance(expected, dict):
+        if [repr(k) for k in expected] != [repr(k) for k in actual]:
+            return f"{where}: キーまたはその順序が違います（{list(expected)[:5]} / {list(actual)[:5]}）"
+        for (key, value), other in zip(expected.items(), actual.values()):
+            diff = compare_trees(value, other, f"{path}/{key}", seen_expected, seen_actual)
+            if diff:
+                return diff
+        return None
+    if isinstance(expected, list):
+        if len(expected) != len(actual):
+            return f"{where}: 要素数が違います（{len(expected)} / {len(actual)}）"
+        for index, (value, other) in enumerate(zip(expected, actual)):
+            diff = compare_trees(value, other, f"{path}/{index}", seen_expected, seen_actual)
+            if diff:
+                return diff
+        return None
+    if isinstance(expected, set):
+        return None if expected == actual else f"{where}: 集合が違います（{expected} / {actual}）"
+    if repr(expected) != repr(actual):
+        return f"{where}: 値が違います（{expected!r} / {actual!r}）"
+    return None
+
+
+def check_parity(label: str, text: str) -> bool:
+    """text を両方のローダーで解析して比べ、結果を表示する。一致すれば True"""
+    results = []
+    for pure_python in (True, False):
+        try:
+            results.append(('ok', parse_yaml(text, pure_python=pure_python)))
+        except yaml.YAMLError as e:
+            results.append(('error', type(e).__name__))
+    (expected_kind, expected), (actual_kind, actual) = results
+    if expected_kind != actual_kind:
+        print(f"❌ {label}: 一方だけ解析エラーになりました（SafeLoader: {expected_kind} / CSafeLoader: {actual_kind}）")
+        return False
+    diff = compare_trees(expected, actual) if expected_kind == 'ok' else None
+    if diff:
+        print(f"❌ {label}: {diff}")
+        return False
+    print(f"✅ {label}" + ('（両方とも解析エラー）' if expected_kind == 'error' else ''))
+    return True
+
+
+# meta だけの解析（load_meta）で、全体を解析したときと同じ meta になるべき YAML
+META_DOCUMENTS = {
+    'meta_anchors': "meta: &m\n  title: &t タイトル\n  base: &b {a: 1}\n  merged: {<<: *b, c: 2}\n  same: [*t, *b]\n"
+                    "  created_at: 2024-01-20\nbody: *m\n",
+    'meta_not_first': "overview: {goal: x}\nmeta: {title: 後ろの meta, category: design}\n",
+    'meta_quoted_key': '"meta": {title: y}\nrest: [1, 2]\n',
+    'meta_null': "meta:\nbody: 1\n",
+    'no_meta': "body: 1\n",
+    'not_mapping': "- meta\n",
+}
+
+
+def check_meta_probe(label: str, path: Path) -> bool:
+    """path を load_meta（先頭の meta だけを解析）と全体の解析で読み、meta が一致するかを表示する"""
+    doc_store.clear()
+    full = parse_yaml(path.read_text(encoding='utf-8'))
+    expected = full.get('meta', {}) if isinstance(full, dict) else {}
+    diff = compare_trees(expected, doc_store.load_meta(path))
+    if diff:
+        print(f"❌ {label}（meta のみ）: {diff}")
+        return False
+    print(f"✅ {label}（meta のみ）")
+    return True
+
+
+def make_large_wbs(elements: int) -> str:
+    """リポジトリの WBS の wbs_elements を複製して elements 件にした YAML を返す"""
+    wbs_path = get_categories_dir() / 'overview' / 'wbs' / 'ai' / 'document.yaml'
+    data = parse_yaml(wbs_path.read_text(encoding='utf-8'))
+    template = data.get('wbs_elements') or [{'id': 'T-001', 'title': 'タスク'}]
+    copies = []
+    for index in range(elements):
+        element = dict(template[index % len(template)])
+        element['id'] = f"T-{index + 1:05d}"
+        copies.append(element)
+    data['wbs_elements'] = copies
+    return yaml.safe_dump(data, allow_unicode=True, sort_keys=False)
+
+
+def time_parse(texts: list[str], pure_python: bool, repeat: int) -> float:
+    """texts を repeat 回解析した最短時間（秒）"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            parse_yaml(text, pure_python=pure_python)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='CSafeLoader（libyaml）と SafeLoader の解析結果・解析時間を比べる')
+    parser.add_argument('--repeat', type=int, default=3, help='解析時間を測る回数（最短時間を表示する）')
+    parser.add_argument('--elements', type=int, default=5000, help='ベンチマーク用に複製する WBS の要素数')
+    args = parser.parse_args()
+    # 解析そのものを比べるため、解析済み YAML のディスクキャッシュ（parsed_cache）は使わない
+    os.environ[PARSED_CACHE_DISABLE_ENV] = '1'
+
+    if get_yaml_loader() is yaml.SafeLoader:
+        print("⚠️  PyYAML が libyaml なしでビルドされているため、純 Python の SafeLoader で解析しています")
+        print("   （libyaml を入れて PyYAML を入れ直すと CSafeLoader を使います）")
+        return 0
+
+    root = get_project_root()
+    mismatches = 0
+    documents = []
+    print("=== categories/ 配下の YAML ===")
+    for path in sorted(get_categories_dir().rglob('*.yaml')):
+        text = path.read_text(encoding='utf-8')
+        documents.append(text)
+        if not check_parity(str(path.relative_to(root)), text):
+            mismatches += 1
+    print()
+    print("=== 表記のサンプル ===")
+    for label, text in {**SAMPLE_DOCUMENTS, **BROKEN_DOCUMENTS}.items():
+        if not check_parity(label, text):
+            mismatches += 1
+    large = make_large_wbs(args.elements)
+    if not check_parity(f"WBS（{args.elements} 要素）", large):
+        mismatches += 1
+
+    print()
+    print("=== meta だけの解析（doc_store.load_meta） ===")
+    for path in sorted(get_categories_dir().rglob('*.yaml')):
+        try:
+            ok = check_meta_probe(str(path.relative_to(root)), path)
+        except yaml.YAMLError:
+            continue  # 解析できない YAML は上で確認済み
+        if not ok:
+            mismatches += 1
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, text in META_DOCUMENTS.items():
+            path = Path(tmp) / f"{label}.yaml"
+            path.write_text(text, encoding='utf-8')
+            if not check_meta_probe(label, path):
+                mismatches += 1
+        large_path = Path(tmp) / 'large_wbs.yaml'
+        large_path.write_text(large, encoding='utf-8')
+        full_seconds = meta_seconds = None
+        for _ in range(args.repeat):
+            doc_store.clear()
+            started = time.perf_counter()
+            doc_store.load_document(large_path)
+            elapsed = time.perf_counter() - started
+            full_seconds = elapsed if full_seconds is None else min(full_seconds, elapsed)
+            doc_store.clear()
+            started = time.perf_counter()
+            doc_store.load_meta(large_path)
+            elapsed = time.perf_counter() - started
+            meta_seconds = elapsed if meta_seconds is None else min(meta_seconds, elapsed)
+        doc_store.clear()
+
+    print()
+    print("=== 解析時間（最短） ===")
+    for label, texts in ((f"categories/ の全 YAML（{len(documents)} 件）", documents),
+                         (f"WBS（{args.elements} 要素、{len(large.encode('utf-8')) // 1024} KB）", [large])):
+        pure = time_parse(texts, True, args.repeat)
+        libyaml = time_parse(texts, False, args.repeat)
+        print(f"⏱️  {label}: SafeLoader {pure * 1000:.1f} ms / CSafeLoader {libyaml * 1000:.1f} ms"
+              f"（{pure / libyaml:.1f} 倍）")
+    print(f"⏱️  WBS（{args.elements} 要素）の meta: 全体の解析 {full_seconds * 1000:.1f} ms / "
+          f"meta だけの解析 {meta_seconds * 1000:.2f} ms")
+
+    print()
+    print("=" * 40)
+    if mismatches:
+        print(f"❌ 解析結果の不一致 {mismatches} 件")
+        return 1
+    print("✅ 解析結果はすべて一致（CSafeLoader と SafeLoader / meta だけの解析と全体の解析）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
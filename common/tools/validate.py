@@ -2,44 +2,75 @@
 """
 設計YAML 汎用バリデーションツール（doc_typeディレクトリ版）
 meta.category + meta.doc_type からスキーマを自動検出して検証します。
+
+使い方:
+  python3 common/tools/validate.py categories/design/tasks/ai/document.yaml
+  python3 common/tools/validate.py --all                # 全 YAML を 1 プロセスで検証（ファイルごとの結果と合計）
+  python3 common/tools/validate.py --all --jobs 4       # プロセスプールで並列に検証
+  python3 common/tools/validate.py document.yaml --max-errors 20   # エラーを見つけた順に 20 件まで表示（--fail-fast で最初の 1 件）
+  python3 common/tools/validate.py --check-md-links --all
 """
 
 import re
-import yaml
 import json
 import argparse
+import os
 import sys
-import time
-import urllib.request
-import urllib.error
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from urllib.parse import urlparse
 
 # common/ を import するため
 _common_dir = Path(__file__).resolve().parent.parent
 if str(_common_dir) not in sys.path:
     sys.path.insert(0, str(_common_dir))
-from config import AI_DOCUMENT_SCHEME_JSON, GITHUB_LINK_CHECK_HOSTS, HUMAN_DOCUMENT_MD
-from paths import get_categories_dir, get_available_categories, get_doc_types, get_project_root
+import build_trace
+import file_index
+from config import (
+    AI_DOCUMENT_SCHEME_JSON,
+    GITHUB_LINK_CHECK_HOSTS,
+    HUMAN_DOCUMENT_MD,
+    SUPPRESSED_ERROR_COUNT_LIMIT,
+    VALIDATOR_CACHE_DIR,
+)
+from paths import (
+    get_build_cache_dir,
+    get_categories_dir,
+    get_all_yaml_files,
+    get_available_categories,
+    get_doc_types,
+    get_project_root,
+)
 from md_base import load_yaml
+import workspace_index
+
+# jsonschema / referencing / yaml / link_cache（http.client・ssl）・schema_bundle・schema_compiler は
+# 使う処理の中で import する（--list や --check-md-links では読み込まない）。
+# 起動時間は common/tools/bench_startup.py（make bench-startup）で確認する
 
-try:
-    import jsonschema
-    from jsonschema import Draft7Validator, ValidationError
-except ImportError:
-    print("❌ jsonschema パッケージがインストールされていません")
-    print("   pip install jsonschema でインストールしてください")
-    sys.exit(1)
 
-try:
-    from referencing import Registry, Resource
-    from referencing.exceptions import NoSuchResource
-    from referencing.jsonschema import DRAFT7
-except ImportError:
-    print("❌ referencing パッケージがインストールされていません")
-    print("   pip install referencing でインストールしてください")
-    sys.exit(1)
+def require_jsonschema():
+    """jsonschema を import して返す。インストールされていなければメッセージを表示して終了する"""
+    try:
+        import jsonschema
+    except ImportError:
+        print("❌ jsonschema パッケージがインストールされていません")
+        print("   pip install jsonschema でインストールしてください")
+        sys.exit(1)
+    return jsonschema
+
+
+def require_referencing():
+    """referencing を import して返す。インストールされていなければメッセージを表示して終了する"""
+    try:
+        import referencing
+        import referencing.exceptions
+        import referencing.jsonschema
+    except ImportError:
+        print("❌ referencing パッケージがインストールされていません")
+        print("   pip install referencing でインストールしてください")
+        sys.exit(1)
+    return referencing
 
 
 def get_schema_path(category: str, doc_type: str) -> Optional[Path]:
@@ -53,16 +84,51 @@ def load_schema(schema_path: Path) -> dict:
         return json.load(f)
 
 
-def _retrieve_file_uri(uri: str):
-    """file: URI で参照される JSON スキーマを読み込み Resource で返す"""
+# file: URI で参照されるスキーマのパス → ((mtime_ns, size), 内容)。$ref のたびに読み直さない
+_ref_document_cache: dict[Path, tuple[tuple[int, int], object]] = {}
+
+# (解決済みスキーマのパス, コンパイル版か) → (スキーマと $ref 先の (パス, mtime_ns, size) 一覧, スキーマ, 検証器)
+_validator_cache: dict[tuple[Path, bool], tuple[tuple, dict, object]] = {}
+
+
+def _file_signature(path: Path) -> Optional[tuple[int, int]]:
+    """(mtime_ns, size)。存在しなければ None"""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_ref_document(uri: str) -> object:
+    """
+    file: URI で参照される JSON スキーマの内容を返す（mtime・サイズが同じ間はキャッシュを返す）。
+    file: 以外の URI・存在しないファイルは LookupError を送出する。
+    """
     parsed = urlparse(uri)
     if parsed.scheme != 'file':
-        raise NoSuchResource(ref=uri)
+        raise LookupError(uri)
     path = Path(parsed.path)
-    if not path.exists():
-        raise NoSuchResource(ref=uri)
-    contents = json.loads(path.read_text(encoding='utf-8'))
-    return Resource.from_contents(contents)
+    signature = _file_signature(path)
+    if signature is None:
+        raise LookupError(uri)
+    cached = _ref_document_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    with build_trace.span('ref_resolve'):
+        contents = json.loads(path.read_text(encoding='utf-8'))
+    _ref_document_cache[path] = (signature, contents)
+    return contents
+
+
+def _retrieve_file_uri(uri: str):
+    """Registry の retrieve。file: URI で参照される JSON スキーマを Resource で返す"""
+    referencing = require_referencing()
+    try:
+        contents = _load_ref_document(uri)
+    except LookupError:
+        raise referencing.exceptions.NoSuchResource(ref=uri)
+    return referencing.Resource.from_contents(contents)
 
 
 def _resolve_refs_to_absolute(schema: dict, base_path: Path) -> None:
@@ -83,15 +149,108 @@ def _resolve_refs_to_absolute(schema: dict, base_path: Path) -> None:
                     _resolve_refs_to_absolute(item, base_path)
 
 
-def load_schema_and_registry(schema_path: Path) -> tuple[dict, Registry]:
-    """スキーマを読み込み、外部 $ref 解決用の Registry を返す"""
+def load_resolved_schema(schema_path: Path) -> dict:
+    """スキーマを読み込み、相対 $ref を絶対 file: URI に書き換えて返す"""
     schema = load_schema(schema_path)
-    base_path = schema_path.resolve().parent
-    _resolve_refs_to_absolute(schema, base_path)
-    main_uri = schema_path.resolve().as_uri()
-    resource = DRAFT7.create_resource(schema)
-    registry = Registry(retrieve=_retrieve_file_uri).with_resource(uri=main_uri, resource=resource)
-    return schema, registry
+    _resolve_refs_to_absolute(schema, schema_path.resolve().parent)
+    return schema
+
+
+def _make_registry(schema: dict, schema_path: Path):
+    """$ref 解決用の Registry（スキーマ自身を登録済み）を返す"""
+    referencing = require_referencing()
+    resource = referencing.jsonschema.DRAFT7.create_resource(schema)
+    return referencing.Registry(retrieve=_retrieve_file_uri).with_resource(
+        uri=schema_path.resolve().as_uri(), resource=resource
+    )
+
+
+def load_schema_and_registry(schema_path: Path) -> tuple[dict, "referencing.Registry"]:
+    """スキーマを読み込み、外部 $ref 解決用の Registry を返す"""
+    schema = load_resolved_schema(schema_path)
+    return schema, _make_registry(schema, schema_path)
+
+
+def _collect_file_refs(schema, found: set[Path]) -> None:
+    """絶対 file: URI に書き換え済みのスキーマから参照先ファイルを再帰的に集める（参照先の中の相対 $ref も含む）"""
+    if isinstance(schema, dict):
+        for key, value in schema.items():
+            if key == '$ref' and isinstance(value, str) and value.startswith('file:'):
+                path = Path(urlparse(value).path)
+                if path in found or _file_signature(path) is None:
+                    continue
+                found.add(path)
+                try:
+                    contents = json.loads(path.read_text(encoding='utf-8'))
+                except (OSError, ValueError):
+                    continue
+                _resolve_refs_to_absolute(contents, path.parent)
+                _collect_file_refs(contents, found)
+            else:
+                _collect_file_refs(value, found)
+    elif isinstance(schema, list):
+        for item in schema:
+            _collect_file_refs(item, found)
+
+
+def _schema_signature(paths) -> tuple:
+    """(パス, (mtime_ns, size)) の組。スキーマと $ref 先が変わったかの判定に使う"""
+    return tuple((p, _file_signature(p)) for p in sorted(paths))
+
+
+def get_validator(schema_path: Path, compiled: bool = True) -> tuple[dict, object]:
+    """
+    スキーマの (解決済みスキーマ, 検証器) を返す。検証器は iter_errors(instance) を持つ。
+    最新のバンドル（common/tools/bundle_schemas.py が書き出す $ref 展開済みスキーマ）があればそれを読み込み、
+    $ref の解決を省く（バンドルが無い・古い場合は scheme.json から $ref を解決する）。
+    compiled=True なら schema_compiler で生成した検証コード（.yaml-bridge/validators/ にキャッシュ）を使い、
+    コンパイラが扱えないスキーマと compiled=False のときは Draft7Validator を使う。
+    $ref 解決用 Registry を含めてプロセス内でキャッシュし、同じスキーマを使うドキュメントで使い回す。
+    スキーマ本体または $ref 先（common/scheme.json 等）の mtime・サイズが変わったら作り直す。
+    スキーマが JSON として不正なら json.JSONDecodeError を送出する。
+    """
+    key = schema_path.resolve()
+    cached = _validator_cache.get((key, compiled))
+    if cached:
+        signature, schema, validator = cached
+        if _schema_signature(path for path, _ in signature) == signature:
+            return schema, validator
+    import schema_bundle
+    import schema_compiler
+
+    with build_trace.span('schema_load'):
+        bundle = schema_bundle.load_fresh_bundle(key)
+        if bundle is not None:
+            schema, watched = bundle
+            ref_files = set(watched)
+        else:
+            schema = load_resolved_schema(key)
+            ref_files = {key}
+            _collect_file_refs(schema, ref_files)
+        validator = None
+        if compiled:
+            with build_trace.span('schema_compile'):
+                try:
+                    validator = schema_compiler.compile_validator(
+                        schema,
+                        key.as_uri(),
+                        _load_ref_document,
+                        get_build_cache_dir() / VALIDATOR_CACHE_DIR,
+                    )
+                except schema_compiler.UnsupportedSchema:
+                    validator = None
+        if validator is None:
+            Draft7Validator = require_jsonschema().Draft7Validator
+            if bundle is not None:
+                validator = Draft7Validator(schema)  # バンドルは外部 $ref を含まない
+            else:
+                # $ref 先を先に登録しておき、検証中の retrieve を不要にする
+                registry = _make_registry(schema, key).with_resources(
+                    (path.as_uri(), _retrieve_file_uri(path.as_uri())) for path in sorted(ref_files - {key})
+                )
+                validator = Draft7Validator(schema, registry=registry)
+    _validator_cache[(key, compiled)] = (_schema_signature(ref_files), schema, validator)
+    return schema, validator
 
 
 def detect_category_and_doc_type(yaml_data: dict) -> tuple[Optional[str], Optional[str]]:
@@ -100,37 +259,122 @@ def detect_category_and_doc_type(yaml_data: dict) -> tuple[Optional[str], Option
     return meta.get('category'), meta.get('doc_type')
 
 
-def format_error_path(error: ValidationError) -> str:
+def format_error_path(error: "jsonschema.ValidationError") -> str:
     if error.absolute_path:
         return ' → '.join(str(p) for p in error.absolute_path)
     return '(ルート)'
 
 
+class _StopCollecting(Exception):
+    """エラーの収集を打ち切る（--max-errors / --fail-fast で数える上限に達した）"""
+
+
+class _CappedErrors:
+    """
+    見つけたエラーを max_errors 件まで保持し（on_error があればその場で渡す）、それ以降は数だけ数える。
+    数えた件数が SUPPRESSED_ERROR_COUNT_LIMIT に達したら _StopCollecting を送出して検証を打ち切る。
+    """
+
+    def __init__(self, max_errors: int, on_error: Optional[Callable] = None):
+        self.max_errors = max_errors
+        self.on_error = on_error
+        self.errors = []
+        self.suppressed = 0
+
+    def append(self, error) -> None:
+        if len(self.errors) < self.max_errors:
+            self.errors.append(error)
+            if self.on_error:
+                self.on_error(error)
+            return
+        self.suppressed += 1
+        if self.suppressed >= SUPPRESSED_ERROR_COUNT_LIMIT:
+            raise _StopCollecting
+
+
+def collect_schema_errors(
+    validator,
+    instance,
+    max_errors: Optional[int] = None,
+    on_error: Optional[Callable] = None,
+) -> tuple[list, int, bool]:
+    """
+    instance の検証エラーを集め、(エラー, 省略した件数, 省略した件数が正確か) を返す。
+    max_errors が None なら全件をパス順に並べて返す。
+    max_errors を指定すると見つけた順に max_errors 件まで返し（on_error があれば見つけるたびに呼ぶ）、
+    残りは保持せず数だけ数える。SUPPRESSED_ERROR_COUNT_LIMIT 件数えたら検証を打ち切る（件数は下限になる）。
+    """
+    if max_errors is None:
+        errors = sorted(validator.iter_errors(instance), key=lambda e: str(list(e.absolute_path)))
+        if on_error:
+            for error in errors:
+                on_error(error)
+        return errors, 0, True
+    capped = _CappedErrors(max_errors, on_error)
+    collect_errors = getattr(validator, 'collect_errors', None)  # schema_compiler.CompiledValidator
+    try:
+        if collect_errors is not None:
+            collect_errors(instance, capped)
+        else:
+            for error in validator.iter_errors(instance):
+                capped.append(error)
+    except _StopCollecting:
+        return capped.errors, capped.suppressed, False
+    return capped.errors, capped.suppressed, True
+
+
+# validate_document の出力の最後に付く失敗のまとめ行の書き出し（build.py はこの行を除いてエラーを表示する）
+VALIDATION_FAILED_PREFIX = "❌ バリデーション失敗"
+
+
+def format_schema_error(error, verbose: bool = False) -> list[str]:
+    """検証エラー 1 件の表示行（verbose なら context のエラーも表示する）"""
+    lines = [f"❌ [{format_error_path(error)}] {error.message}"]
+    if verbose and error.context:
+        for suberror in error.context:
+            lines.append(f"   └─ {suberror.message}")
+    return lines
+
+
+def format_suppressed_errors(suppressed: int, exact: bool) -> str:
+    """--max-errors / --fail-fast で表示しなかったエラーの件数の行"""
+    count = f"{suppressed} 件" if exact else f"{suppressed} 件以上"
+    return f"⚠️  ほか {count}のエラーを省略しました（--max-errors で表示件数を変更できます）"
+
+
 def validate_yaml(
     yaml_data: dict,
     schema: dict,
     verbose: bool = False,
-    registry: Optional[Registry] = None,
+    registry: Optional["referencing.Registry"] = None,
+    validator=None,
+    max_errors: Optional[int] = None,
+    on_message: Optional[Callable[[str], None]] = None,
 ) -> tuple[bool, list[str]]:
-    validator = Draft7Validator(schema, registry=registry) if registry else Draft7Validator(schema)
-    errors = list(validator.iter_errors(yaml_data))
-    
+    """
+    スキーマ検証し、(成功可否, エラーの表示行) を返す。
+    max_errors を指定するとエラーを見つけた順に max_errors 件まで表示し、残りは件数だけを表示する
+    （全件のリストは作らない）。on_message があれば表示行を作るたびに渡す。
+    """
+    if validator is None:
+        Draft7Validator = require_jsonschema().Draft7Validator
+        validator = Draft7Validator(schema, registry=registry) if registry else Draft7Validator(schema)
+    error_messages = []
+
+    def add_error(error) -> None:
+        for line in format_schema_error(error, verbose):
+            error_messages.append(line)
+            if on_message:
+                on_message(line)
+
+    errors, suppressed, exact = collect_schema_errors(validator, yaml_data, max_errors, add_error)
     if not errors:
         return True, []
-    
-    error_messages = []
-    for error in sorted(errors, key=lambda e: str(list(e.absolute_path))):
-        path = format_error_path(error)
-        message = error.message
-        
-        if verbose:
-            error_messages.append(f"❌ [{path}] {message}")
-            if error.context:
-                for suberror in error.context:
-                    error_messages.append(f"   └─ {suberror.message}")
-        else:
-            error_messages.append(f"❌ [{path}] {message}")
-    
+    if suppressed:
+        line = format_suppressed_errors(suppressed, exact)
+        error_messages.append(line)
+        if on_message:
+            on_message(line)
     return False, error_messages
 
 
@@ -194,30 +438,36 @@ def check_file_path_exists(path_str: str, base: Path) -> Optional[str]:
     s = path_str.strip()
     if not s:
         return None
-    if s.lower().startswith('file://'):
-        parsed = urlparse(s)
-        resolved = Path(parsed.path)
-    elif s.startswith('/'):
-        resolved = base / s.lstrip('/')
-    else:
-        resolved = (base / s).resolve()
+    resolved = file_index.resolve_reference(s, base)
     try:
-        if not resolved.exists():
+        if not file_index.exists(resolved):
             return f"ファイルパスが存在しません: {path_str}"
     except OSError:
         return f"ファイルパスを解決できません: {path_str}"
     return None
 
 
+def _collect_file_path_values(yaml_data: dict) -> list[str]:
+    """references および related_docs 由来の url/パスのうち、ファイルパスとみなすもの（重複なし・出現順）"""
+    all_values = collect_all_urls_and_paths(yaml_data)
+    return list(dict.fromkeys(v for v in all_values if v.strip() and is_file_path(v)))
+
+
+def collect_file_path_targets(yaml_data: dict, base_path: Path) -> list[Path]:
+    """
+    run_file_path_check が実在を確認するファイルパスを絶対パスにして返す。
+    build.py がビルドマニフェストに記録し、参照先が消えたらスキップせずに再検証する。
+    """
+    return [file_index.resolve_reference(v, base_path) for v in _collect_file_path_values(yaml_data)]
+
+
 def run_file_path_check(yaml_data: dict, base_path: Path) -> list[str]:
     """
     references および related_docs 由来の url/パスのうち、ファイルパスとみなすものについて
     実在チェックを行い、存在しないパスのエラーメッセージリストを返す。
     """
-    all_values = collect_all_urls_and_paths(yaml_data)
-    file_paths = list(dict.fromkeys(v for v in all_values if v.strip() and is_file_path(v)))
     errors = []
-    for path_str in file_paths:
+    for path_str in _collect_file_path_values(yaml_data):
         err = check_file_path_exists(path_str, base_path)
         if err:
             errors.append(err)
@@ -234,37 +484,95 @@ def is_github_url(url: str) -> bool:
         return False
 
 
-def check_github_url_not_404(url: str, timeout: int = 5) -> Optional[str]:
+def check_github_url_not_404(url: str, timeout: int = 5, refresh: bool = False) -> Optional[str]:
     """
-    GitHub URL に HEAD でアクセスし、404 の場合はエラーメッセージを返す。
+    GitHub URL に HEAD でアクセスし（リダイレクトは追跡）、404 の場合はエラーメッセージを返す。
     404 でなければ None。ネットワークエラー等は None（警告扱いにする場合は呼び元で対応可能）。
+    結果は .yaml-bridge/linkcache.sqlite にキャッシュされる（refresh=True で再確認）。
     """
-    try:
-        req = urllib.request.Request(url, method='HEAD')
-        req.add_header('User-Agent', 'Mozilla/5.0 (compatible; doc-validate-link-check/1.0)')
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            if resp.status == 404:
-                return f"GitHub リンクが 404: {url}"
-            return None
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            return f"GitHub リンクが 404: {url}"
-        return None
-    except Exception:
-        return None
+    return check_github_urls_not_404([url], timeout=timeout, refresh=refresh).get(url)
+
+
+def check_github_urls_not_404(urls: list[str], timeout: int = 5, refresh: bool = False) -> dict[str, Optional[str]]:
+    """
+    複数の GitHub URL を並列に HEAD 確認し、URL → エラーメッセージ（404 以外は None）を返す。
+    prefetch_github_links で確認済みの URL はその結果を、それ以外は link_cache 経由の結果を使う。
+    同時接続数・全体の制限時間・レート制限時の待ち・キャッシュの有効期間は config の設定に従う。
+    """
+    statuses = {url: _prefetched_link_statuses[url] for url in urls if url in _prefetched_link_statuses}
+    remaining = [url for url in urls if url not in statuses]
+    if remaining:
+        import link_cache
+        statuses.update(link_cache.check_urls(remaining, timeout=timeout, refresh=refresh))
+    return {url: f"GitHub リンクが 404: {url}" if statuses.get(url) == 404 else None for url in urls}
+
 
+# 一括検証・ビルドの前に prefetch_github_links で確認した GitHub リンクの結果（URL → ステータス。未確認は None）
+_prefetched_link_statuses: dict[str, Optional[int]] = {}
 
-def run_github_link_check(yaml_data: dict, timeout: int = 5, sleep_seconds: float = 1.0) -> list[str]:
+
+def collect_github_link_citations(yaml_files: list[Path]) -> dict[str, list[Path]]:
+    """全 YAML の references[].url から GitHub の URL を集め、URL → 参照している YAML（出現順）を返す"""
+    citations: dict[str, list[Path]] = {}
+    for yaml_file in yaml_files:
+        try:
+            yaml_data = load_yaml(str(yaml_file))
+        except Exception:
+            continue  # 解析できない YAML は各ドキュメントの検証でエラーになる
+        if not isinstance(yaml_data, dict):
+            continue
+        for url in dict.fromkeys(collect_reference_urls(yaml_data)):
+            if is_github_url(url):
+                citations.setdefault(url, []).append(yaml_file)
+    return citations
+
+
+def prefetch_github_links(yaml_files: list[Path], timeout: int = 5, refresh: bool = False) -> dict[str, list[Path]]:
+    """
+    全 YAML の GitHub リンクを重複なく 1 回ずつ確認し、結果をこのプロセスの以降の検証
+    （run_github_link_check）で使う。同じ URL を複数のドキュメントが参照していても確認は 1 回になる。
+    URL → 参照している YAML を返す（format_broken_link_report で 404 の参照元を表示できる）。
+    """
+    citations = collect_github_link_citations(yaml_files)
+    statuses = {}
+    if citations:
+        import link_cache
+        statuses = link_cache.check_urls(list(citations), timeout=timeout, refresh=refresh)
+    _prefetched_link_statuses.clear()
+    _prefetched_link_statuses.update(statuses)
+    return citations
+
+
+def format_broken_link_report(citations: dict[str, list[Path]]) -> list[str]:
+    """prefetch_github_links の結果から、404 の URL ごとに参照している YAML を並べた出力行を返す（なければ空）"""
+    root = get_project_root()
+    lines = []
+    for url, yaml_files in citations.items():
+        if _prefetched_link_statuses.get(url) != 404:
+            continue
+        lines.append(f"❌ {url}（{len(yaml_files)} 件から参照）")
+        for yaml_file in yaml_files:
+            try:
+                lines.append(f"   └─ {Path(yaml_file).resolve().relative_to(root)}")
+            except ValueError:
+                lines.append(f"   └─ {yaml_file}")
+    return lines
+
+
+def format_link_prefetch_summary(citations: dict[str, list[Path]]) -> str:
+    """「参照 M 件 → 一意な URL N 件」の 1 行"""
+    references = sum(len(files) for files in citations.values())
+    broken = sum(1 for url in citations if _prefetched_link_statuses.get(url) == 404)
+    unknown = sum(1 for url in citations if _prefetched_link_statuses.get(url) is None)
+    return f"🔗 GitHub リンク: 参照 {references} 件 → 一意な URL {len(citations)} 件を確認（404: {broken} 件 / 未確認: {unknown} 件）"
+
+
+def run_github_link_check(yaml_data: dict, timeout: int = 5, refresh: bool = False) -> list[str]:
     """references[].url のうち GitHub の URL を HEAD で検証し、404 の URL をエラーとして返す"""
-    errors = []
     urls = collect_reference_urls(yaml_data)
-    github_urls = [u for u in urls if is_github_url(u)]
-    for url in github_urls:
-        err = check_github_url_not_404(url, timeout=timeout)
-        if err:
-            errors.append(err)
-        time.sleep(sleep_seconds)
-    return errors
+    github_urls = list(dict.fromkeys(u for u in urls if is_github_url(u)))
+    results = check_github_urls_not_404(github_urls, timeout=timeout, refresh=refresh)
+    return [results[url] for url in github_urls if results.get(url)]
 
 
 # --- 生成済み human/document.md 内の相対リンク検証 ---
@@ -307,8 +615,8 @@ def check_md_file_links(md_path: Path, project_root: Path) -> list[str]:
     errors = []
     for href in extract_md_relative_links(content):
         try:
-            resolved = (human_dir / href).resolve()
-            if not resolved.exists():
+            resolved = Path(os.path.normpath(human_dir / href))
+            if not file_index.exists(resolved):
                 errors.append(f"リンク先が存在しません: {md_path} 内の {href} → {resolved}")
         except OSError:
             errors.append(f"リンク先を解決できません: {md_path} 内の {href}")
@@ -324,6 +632,7 @@ def run_md_links_check(project_root: Optional[Path] = None) -> list[str]:
     categories_dir = get_categories_dir()
     if not categories_dir.exists():
         return []
+    file_index.refresh(persist=True)  # ビルドで書き出した document.md 等を反映する
     all_errors = []
     for category in get_available_categories():
         for doc_type in get_doc_types(category):
@@ -343,6 +652,7 @@ def main_md_links_check(args) -> int:
         if not md_path.is_file():
             print(f"❌ 指定パスはファイルではありません: {md_path}")
             return 1
+        file_index.refresh(persist=True)
         errors = check_md_file_links(md_path, project_root)
     else:
         errors = run_md_links_check(project_root)
@@ -361,144 +671,301 @@ def main_md_links_check(args) -> int:
     return 0
 
 
-def main():
-    parser = argparse.ArgumentParser(description='設計YAMLをバリデートします')
-    parser.add_argument('input', nargs='?', help='入力YAMLファイルのパス（--check-md-links 時は human/document.md のパス、省略時は --all で全件）')
-    parser.add_argument('-s', '--schema', default=None, help='JSON Schemaファイルのパス')
-    parser.add_argument('-v', '--verbose', action='store_true', help='詳細なエラー情報を表示')
-    parser.add_argument('--strict', action='store_true', help='警告もエラーとして扱う')
-    parser.add_argument('--list', action='store_true', help='利用可能なcategory/doc_typeを表示')
-    parser.add_argument('--skip-link-check', action='store_true', help='GitHub リンクの 404 チェックをスキップ')
-    parser.add_argument('--skip-file-path-check', action='store_true', help='related_docs/references のファイルパス存在チェックをスキップ')
-    parser.add_argument('--check-md-links', action='store_true', help='生成済み human/document.md 内の相対リンクのファイル存在を検証')
-    parser.add_argument('--all', '-a', action='store_true', help='--check-md-links 時: 全 human/document.md を対象にする')
-    
-    args = parser.parse_args()
-    
-    if args.check_md_links:
-        if args.all or not args.input:
-            # 全 human/document.md を対象
-            code = main_md_links_check(argparse.Namespace(input=None))
-        else:
-            code = main_md_links_check(args)
-        sys.exit(code)
-    
-    if args.list:
-        print("利用可能なcategory/doc_type:")
-        for category in get_available_categories():
-            print(f"\n📦 {category}")
-            for doc_type in get_doc_types(category):
-                print(f"   └─ {doc_type}")
-        sys.exit(0)
-    
-    if not args.input:
-        print("❌ 入力YAMLファイルを指定してください")
-        sys.exit(1)
-    
-    input_path = Path(args.input)
+class _OutputLines(list):
+    """validate_document の出力行。on_line を指定すると追加した行をその場で渡す"""
+
+    def __init__(self, on_line: Optional[Callable[[str], None]] = None):
+        super().__init__()
+        self.on_line = on_line
+
+    def append(self, line: str) -> None:
+        super().append(line)
+        if self.on_line:
+            self.on_line(line)
+
+    def extend(self, lines) -> None:
+        for line in lines:
+            self.append(line)
+
+
+def validate_document(
+    input_path: Path,
+    *,
+    schema_path: Optional[Path] = None,
+    verbose: bool = False,
+    strict: bool = False,
+    skip_link_check: bool = False,
+    skip_file_path_check: bool = False,
+    refresh_links: bool = False,
+    max_errors: Optional[int] = None,
+    on_line: Optional[Callable[[str], None]] = None,
+) -> tuple[bool, list[str]]:
+    """
+    1 つの YAML をスキーマ検証・追加チェック・リンクチェックし、(成功可否, 出力行) を返す。
+    CLI（main）と build.py の in-process ビルドで共通利用する。出力行は CLI の表示そのもの。
+    max_errors を指定するとスキーマのエラーを見つけた順に max_errors 件まで表示し、残りは件数だけを表示する。
+    on_line を指定すると出力行を作るたびに渡す（大きなドキュメントでもエラーを見つけたそばから表示できる）。
+    """
+    lines = _OutputLines(on_line)
     if not input_path.exists():
-        print(f"❌ 入力ファイルが見つかりません: {input_path}")
-        sys.exit(1)
+        lines.append(f"❌ 入力ファイルが見つかりません: {input_path}")
+        return False, lines
     
+    import yaml
+
     try:
-        yaml_data = load_yaml(args.input)
+        yaml_data = load_yaml(str(input_path))
     except yaml.YAMLError as e:
-        print(f"❌ YAMLの解析に失敗しました:")
-        print(f"   {e}")
-        sys.exit(1)
+        lines.append(f"❌ YAMLの解析に失敗しました:")
+        lines.append(f"   {e}")
+        return False, lines
     
     # スキーマパスの解決
-    if args.schema:
-        schema_path = Path(args.schema)
-        category, doc_type = detect_category_and_doc_type(yaml_data)
-    else:
-        category, doc_type = detect_category_and_doc_type(yaml_data)
-        
+    category, doc_type = detect_category_and_doc_type(yaml_data)
+    if not schema_path:
         if not category or not doc_type:
-            print("❌ category/doc_typeを検出できません")
-            print("   meta.category, meta.doc_type フィールドを指定してください")
-            sys.exit(1)
+            lines.append("❌ category/doc_typeを検出できません")
+            lines.append("   meta.category, meta.doc_type フィールドを指定してください")
+            return False, lines
         
         schema_path = get_schema_path(category, doc_type)
         
         if not schema_path:
-            print(f"❌ スキーマが見つかりません: {category}/{doc_type}")
-            sys.exit(1)
+            lines.append(f"❌ スキーマが見つかりません: {category}/{doc_type}")
+            return False, lines
     
     if not schema_path.exists():
-        print(f"❌ スキーマファイルが見つかりません: {schema_path}")
-        sys.exit(1)
+        lines.append(f"❌ スキーマファイルが見つかりません: {schema_path}")
+        return False, lines
     
-    print(f"📄 検証対象: {input_path}")
-    print(f"📋 スキーマ: {schema_path}")
-    print(f"📁 パス: {category}/{doc_type}")
-    print()
+    lines.append(f"📄 検証対象: {input_path}")
+    lines.append(f"📋 スキーマ: {schema_path}")
+    lines.append(f"📁 パス: {category}/{doc_type}")
+    lines.append("")
     
     try:
-        schema, registry = load_schema_and_registry(schema_path)
+        schema, validator = get_validator(schema_path)
     except json.JSONDecodeError as e:
-        print(f"❌ スキーマの解析に失敗しました:")
-        print(f"   {e}")
-        sys.exit(1)
+        lines.append(f"❌ スキーマの解析に失敗しました:")
+        lines.append(f"   {e}")
+        return False, lines
     
-    print("🔍 スキーマ検証中...")
-    is_valid, errors = validate_yaml(yaml_data, schema, args.verbose, registry=registry)
-    
-    if errors:
-        print()
-        print("=== エラー ===")
-        for error in errors:
-            print(error)
+    lines.append("🔍 スキーマ検証中...")
+    errors = []
+
+    def add_error(error) -> None:
+        if not errors:
+            lines.append("")
+            lines.append("=== エラー ===")
+        for line in format_schema_error(error, verbose):
+            errors.append(line)
+            lines.append(line)
+
+    with build_trace.span('jsonschema'):
+        schema_errors, suppressed, exact = collect_schema_errors(validator, yaml_data, max_errors, add_error)
+    is_valid = not schema_errors
+    if suppressed:
+        lines.append(format_suppressed_errors(suppressed, exact))
     
-    print()
-    print("🔍 追加チェック中...")
+    lines.append("")
+    lines.append("🔍 追加チェック中...")
     warnings = run_common_checks(yaml_data)
     
     if warnings:
-        print()
-        print("=== 警告 ===")
-        for warning in warnings:
-            print(warning)
+        lines.append("")
+        lines.append("=== 警告 ===")
+        lines.extend(warnings)
     
     link_errors = []
-    if not args.skip_link_check:
-        print()
-        print("🔍 GitHub リンク確認中...")
-        link_errors = run_github_link_check(yaml_data, timeout=5, sleep_seconds=1.0)
+    if not skip_link_check:
+        lines.append("")
+        lines.append("🔍 GitHub リンク確認中...")
+        with build_trace.span('github_links'):
+            link_errors = run_github_link_check(yaml_data, timeout=5, refresh=refresh_links)
         if link_errors:
-            print()
-            print("=== リンクエラー ===")
-            for err in link_errors:
-                print(err)
+            lines.append("")
+            lines.append("=== リンクエラー ===")
+            lines.extend(link_errors)
     
     file_path_errors = []
-    if not args.skip_file_path_check:
-        print()
-        print("🔍 ファイルパス確認中...")
-        file_path_errors = run_file_path_check(yaml_data, get_project_root())
+    if not skip_file_path_check:
+        lines.append("")
+        lines.append("🔍 ファイルパス確認中...")
+        with build_trace.span('file_paths'):
+            file_path_errors = run_file_path_check(yaml_data, get_project_root())
         if file_path_errors:
-            print()
-            print("=== ファイルパスエラー ===")
-            for err in file_path_errors:
-                print(err)
+            lines.append("")
+            lines.append("=== ファイルパスエラー ===")
+            lines.extend(file_path_errors)
     
-    print()
-    print("=" * 40)
+    lines.append("")
+    lines.append("=" * 40)
     
-    if is_valid and (not warnings or not args.strict) and not link_errors and not file_path_errors:
+    if is_valid and (not warnings or not strict) and not link_errors and not file_path_errors:
         if warnings:
-            print(f"✅ バリデーション成功（警告 {len(warnings)} 件）")
+            lines.append(f"✅ バリデーション成功（警告 {len(warnings)} 件）")
         else:
-            print("✅ バリデーション成功")
-        sys.exit(0)
+            lines.append("✅ バリデーション成功")
+        return True, lines
+    error_count = len(errors) + suppressed + len(link_errors) + len(file_path_errors)
+    error_count = f"{error_count} 件" if exact else f"{error_count} 件以上"
+    warning_count = len(warnings)
+    if strict:
+        lines.append(f"{VALIDATION_FAILED_PREFIX}（エラー {error_count}、警告 {warning_count} 件）")
     else:
-        error_count = len(errors) + len(link_errors) + len(file_path_errors)
-        warning_count = len(warnings)
-        if args.strict:
-            print(f"❌ バリデーション失敗（エラー {error_count} 件、警告 {warning_count} 件）")
+        lines.append(f"{VALIDATION_FAILED_PREFIX}（エラー {error_count}）")
+    return False, lines
+
+
+def _validate_document_job(job: tuple[Path, dict]) -> tuple[bool, list[str]]:
+    """validate_all のワーカー用（プロセスプールから呼ぶため引数を 1 つにまとめる）"""
+    input_path, options = job
+    ok, lines = validate_document(input_path, **options)
+    return ok, list(lines)  # プロセス間で受け渡すため、_OutputLines から普通のリストにする
+
+
+def validate_all(
+    yaml_files: list[Path],
+    jobs: int = 1,
+    prefetch_links: bool = True,
+    **options,
+) -> list[tuple[Path, bool, list[str]]]:
+    """
+    複数の YAML を検証し、入力順に (パス, 成功可否, 出力行) のリストを返す。
+    jobs == 1 では 1 プロセス内で検証し、同じスキーマの検証器（get_validator）を使い回す。
+    jobs > 1 ではプロセスプールで並列に検証する（ワーカーごとに検証器をキャッシュする）。
+    prefetch_links なら先に全 YAML の GitHub リンクを重複なく確認する（呼び元で済ませた場合は False）。
+    options は validate_document のキーワード引数。
+    """
+    if prefetch_links and not options.get('skip_link_check'):
+        prefetch_github_links(yaml_files, refresh=options.get('refresh_links', False))
+    if jobs > 1 and len(yaml_files) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(jobs, len(yaml_files))) as executor:
+            results = list(executor.map(_validate_document_job, [(f, options) for f in yaml_files]))
+    else:
+        results = [validate_document(f, **options) for f in yaml_files]
+    return [(f, ok, lines) for f, (ok, lines) in zip(yaml_files, results)]
+
+
+def main_validate_all(args) -> int:
+    """--all 用のエントリ。全 categories/*/*/ai/*.yaml を検証し、ファイルごとの結果と合計を表示して exit code を返す。"""
+    yaml_files = get_all_yaml_files()
+    if not args.skip_file_path_check:
+        file_index.refresh(persist=True)
+    citations = {}
+    if not args.skip_link_check:
+        citations = prefetch_github_links(yaml_files, refresh=args.refresh_links)
+        print(format_link_prefetch_summary(citations))
+    results = validate_all(
+        yaml_files,
+        jobs=args.jobs,
+        prefetch_links=False,
+        verbose=args.verbose,
+        strict=args.strict,
+        skip_link_check=args.skip_link_check,
+        skip_file_path_check=args.skip_file_path_check,
+        refresh_links=args.refresh_links,
+        max_errors=args.max_errors,
+    )
+    root = get_project_root()
+    fail_count = 0
+    for yaml_file, ok, lines in results:
+        print(f"{'✅' if ok else '❌'} {yaml_file.relative_to(root)}")
+        if args.verbose:
+            # 末尾の成功/失敗行はファイル名の行で表しているため除く
+            detail = [line for line in lines[:-1] if line and not line.startswith('=' * 10)]
         else:
-            print(f"❌ バリデーション失敗（エラー {error_count} 件）")
+            detail = [line for line in lines[:-1] if line.startswith('❌') or line.startswith('⚠️')]
+        for line in detail:
+            print(f"    {line}")
+        if not ok:
+            fail_count += 1
+    broken_report = format_broken_link_report(citations)
+    if broken_report:
+        print()
+        print("=== GitHub リンク切れ（URL ごとの参照元） ===")
+        for line in broken_report:
+            print(line)
+    print()
+    print("=" * 40)
+    print(f"📊 結果: 成功 {len(results) - fail_count} / 失敗 {fail_count}")
+    if args.jobs <= 1 and not args.skip_link_check:
+        import link_cache
+        link_stats = link_cache.get_stats()
+        if any(link_stats.values()):
+            print(
+                f"🔗 GitHub リンク: キャッシュ {link_stats['hits']} 件 / 再検証（304）{link_stats['revalidated']} 件"
+                f" / 確認 {link_stats['fetched']} 件"
+            )
+    if fail_count:
+        print(f"❌ バリデーション失敗（{fail_count} ファイル）")
+        return 1
+    print("✅ バリデーション成功")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='設計YAMLをバリデートします')
+    parser.add_argument('input', nargs='?', help='入力YAMLファイルのパス（--check-md-links 時は human/document.md のパス、省略時は --all で全件）')
+    parser.add_argument('-s', '--schema', default=None, help='JSON Schemaファイルのパス')
+    parser.add_argument('-v', '--verbose', action='store_true', help='詳細なエラー情報を表示')
+    parser.add_argument('--strict', action='store_true', help='警告もエラーとして扱う')
+    parser.add_argument('--list', action='store_true', help='利用可能なcategory/doc_typeを表示')
+    parser.add_argument('--skip-link-check', action='store_true', help='GitHub リンクの 404 チェックをスキップ')
+    parser.add_argument('--refresh-links', action='store_true', help='GitHub リンクのキャッシュ（.yaml-bridge/linkcache.sqlite）を使わず再確認する')
+    parser.add_argument('--skip-file-path-check', action='store_true', help='related_docs/references のファイルパス存在チェックをスキップ')
+    parser.add_argument('--check-md-links', action='store_true', help='生成済み human/document.md 内の相対リンクのファイル存在を検証')
+    parser.add_argument('--all', '-a', action='store_true',
+                        help='全 categories/*/*/ai/*.yaml（invalid_ で始まるものを除く）を 1 プロセスで検証する。--check-md-links 時は全 human/document.md を対象にする')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='--all 時の並列ワーカー数（既定: 1 = 1 プロセス内で検証器を共有）')
+    parser.add_argument('--max-errors', type=int, default=None, metavar='N',
+                        help='スキーマのエラーを見つけた順に N 件まで表示し、残りは件数だけを表示する（全件を並べ替えない）')
+    parser.add_argument('--fail-fast', action='store_true', help='最初のスキーマエラーで検証を打ち切る（--max-errors 1 と同じ）')
+    
+    args = parser.parse_args()
+    if args.fail_fast:
+        args.max_errors = 1
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error('--max-errors には 1 以上を指定してください')
+    
+    if args.check_md_links:
+        if args.all or not args.input:
+            # 全 human/document.md を対象
+            code = main_md_links_check(argparse.Namespace(input=None))
+        else:
+            code = main_md_links_check(args)
+        sys.exit(code)
+    
+    if args.list:
+        print("利用可能なcategory/doc_type:")
+        for category, doc_types in workspace_index.get_doc_types_by_category().items():
+            print(f"\n📦 {category}")
+            for doc_type in doc_types:
+                print(f"   └─ {doc_type}")
+        sys.exit(0)
+    
+    if args.all:
+        sys.exit(main_validate_all(args))
+    
+    if not args.input:
+        print("❌ 入力YAMLファイルを指定してください")
         sys.exit(1)
+    
+    if not args.skip_file_path_check:
+        file_index.refresh(persist=True)
+    success, _ = validate_document(
+        Path(args.input),
+        schema_path=Path(args.schema) if args.schema else None,
+        verbose=args.verbose,
+        strict=args.strict,
+        skip_link_check=args.skip_link_check,
+        skip_file_path_check=args.skip_file_path_check,
+        refresh_links=args.refresh_links,
+        max_errors=args.max_errors,
+        on_line=print,
+    )
+    sys.exit(0 if success else 1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+ワークスペースのマニフェスト（.yaml-bridge/workspace-index.json）。
+全カテゴリ・doc_type・ドキュメント（ai/ 配下の YAML。invalid_ で始まるものを除く）のパスと、
+meta の一部（WORKSPACE_INDEX_META_FIELDS: doc_type・title・status・version・updated_at）を 1 つの JSON にまとめる。
+--list・project_summary のリンク一覧・WBS の集約は、これを使ってディレクトリの走査と meta の解析を省く。
+
+- build.py がビルドの開始時に refresh(persist=True) で最新にして書き出す。無くても動く（その場で作り、書き出さない）
+- paths のカタログと同じく走査したディレクトリの mtime を、ドキュメントごとに mtime・サイズを記録する。
+  使うときはこれらを stat で確認し、ディレクトリが変わっていれば一覧を作り直し（paths.get_catalog）、
+  変わった YAML の meta だけを読み直す（doc_store.load_meta）
+- パスは categories/ 相対（'/' 区切り）で記録する。書き出しは一時ファイル経由（途中で中断されても壊れないように）
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import build_trace
+from config import WORKSPACE_INDEX_JSON, WORKSPACE_INDEX_META_FIELDS
+from paths import (
+    DOC_CATEGORIES,
+    get_build_cache_dir,
+    get_catalog_with_dirs,
+    get_categories_dir,
+    get_doc_type_dir,
+    is_catalog_dirs_fresh,
+)
+
+# 保存形式のバージョン（形式を変えたら上げる）
+WORKSPACE_INDEX_VERSION = 1
+
+# 読み込み済みのマニフェスト。None のときは未作成
+# {'root': categories ディレクトリ, 'dirs': ((ディレクトリ, mtime_ns), ...),
+#  'categories': {category: {doc_type: {ファイル名: {'mtime_ns', 'size', 'meta'} または None（未読）}}}}
+_index: Optional[dict] = None
+
+
+def get_index_path() -> Path:
+    """保存先（.yaml-bridge/workspace-index.json）の絶対パス"""
+    return get_build_cache_dir() / WORKSPACE_INDEX_JSON
+
+
+def _rel(root: str, path: str) -> str:
+    rel = os.path.relpath(path, root)
+    return '' if rel == '.' else rel.replace(os.sep, '/')
+
+
+def _abs(root: str, rel: str) -> str:
+    return os.path.join(root, *rel.split('/')) if rel else root
+
+
+def _json_value(value):
+    """JSON にそのまま書けない値（日付等）は文字列にする（読み直した値と保存した値を同じにするため）"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _read_meta(path: str) -> Optional[dict]:
+    """記録する meta のキーだけを返す。解析できない YAML は None、meta がマッピングでなければ {}"""
+    from doc_store import load_meta
+
+    try:
+        meta = load_meta(path)
+    except Exception:
+        return None
+    if not isinstance(meta, dict):
+        return {}
+    return {key: _json_value(meta[key]) for key in WORKSPACE_INDEX_META_FIELDS if key in meta}
+
+
+def _load_persisted(root: str) -> Optional[dict]:
+    try:
+        data = json.loads(get_index_path().read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != WORKSPACE_INDEX_VERSION:
+        return None
+    try:
+        dirs = tuple((_abs(root, rel), int(mtime_ns)) for rel, mtime_ns in data['dirs'].items())
+        categories = {}
+        for category, doc_types in data['categories'].items():
+            categories[category] = {}
+            for doc_type, documents in doc_types.items():
+                categories[category][doc_type] = {
+                    document['path'].rsplit('/', 1)[-1]: {
+                        'mtime_ns': int(document['mtime_ns']),
+                        'size': int(document['size']),
+                        'meta': document['meta'],
+                    }
+                    for document in documents
+                }
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+    return {'root': root, 'dirs': dirs, 'categories': categories}
+
+
+def _save_persisted(index: dict) -> None:
+    root = index['root']
+    data = {
+        'version': WORKSPACE_INDEX_VERSION,
+        'dirs': {_rel(root, path): mtime_ns for path, mtime_ns in index['dirs']},
+        'categories': {
+            category: {
+                doc_type: [
+                    {
+                        'path': f"{category}/{doc_type}/ai/{name}",
+                        'mtime_ns': entry['mtime_ns'],
+                        'size': entry['size'],
+                        'meta': entry['meta'],
+                    }
+                    for name, entry in documents.items() if entry is not None
+                ]
+                for doc_type, documents in doc_types.items()
+            }
+            for category, doc_types in index['categories'].items()
+        },
+    }
+    text = json.dumps(data, ensure_ascii=False, indent=1) + '\n'
+    path = get_index_path()
+    try:
+        if path.exists() and path.read_text(encoding='utf-8') == text:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(text, encoding='utf-8')
+        os.replace(tmp, path)
+    except OSError:
+        pass  # 保存できなくても次回は作り直すだけ
+
+
+def _listing_from_catalog(root: str, previous: Optional[dict]) -> dict:
+    """paths のカタログから一覧を作る。前回の記録にあるドキュメントは引き継ぐ（mtime・サイズは後で確認する）"""
+    catalog, dirs = get_catalog_with_dirs()
+    old = previous['categories'] if previous is not None else {}
+    categories = {}
+    for category, doc_types in catalog.items():
+        if not doc_types or category.startswith('_'):
+            continue
+        categories[category] = {}
+        for doc_type, names in doc_types.items():
+            old_documents = old.get(category, {}).get(doc_type, {})
+            categories[category][doc_type] = {
+                name: old_documents.get(name) for name in names if not name.startswith('invalid_')
+            }
+    return {'root': root, 'dirs': dirs, 'categories': categories}
+
+
+def _refresh_documents(index: dict) -> bool:
+    """mtime・サイズが変わった（未読の）ドキュメントの meta を読み直す。読み直したものがあれば True"""
+    changed = False
+    for category, doc_types in index['categories'].items():
+        for doc_type, documents in doc_types.items():
+            ai_dir = get_doc_type_dir(category, doc_type) / 'ai'
+            for name, entry in documents.items():
+                path = str(ai_dir / name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    if entry is not None:
+                        documents[name] = None
+                        changed = True
+                    continue
+                if entry is not None and (entry['mtime_ns'], entry['size']) == (st.st_mtime_ns, st.st_size):
+                    continue
+                documents[name] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'meta': _read_meta(path)}
+                changed = True
+    return changed
+
+
+def refresh(persist: bool = False) -> None:
+    """
+    マニフェストを最新にする。未読み込みなら .yaml-bridge/workspace-index.json を読み込み、記録したディレクトリの mtime が
+    変わっていれば一覧を作り直し、mtime・サイズが変わったドキュメントの meta だけを読み直す。
+    persist=True なら（内容が変わったときだけ）書き出す。build.py がビルドの開始時に呼ぶ。
+    """
+    global _index
+    root = str(get_categories_dir())
+    with build_trace.span('workspace_index'):
+        index = _index if _index is not None and _index['root'] == root else _load_persisted(root)
+        changed = False
+        if index is None or not is_catalog_dirs_fresh(index['dirs']):
+            index = _listing_from_catalog(root, index)
+            changed = True
+        changed = _refresh_documents(index) or changed
+        _index = index
+        if persist and (changed or not get_index_path().exists()):
+            _save_persisted(index)
+
+
+def get_doc_types_by_category() -> dict[str, list[str]]:
+    """
+    {category: doc_type 一覧}（ai/scheme.json がある doc_type を持つカテゴリのみ。名前順）を返す。
+    記録した一覧が最新ならディレクトリを走査せず、meta も読まない（--list 用）。そうでなければ paths のカタログから作る。
+    """
+    root = str(get_categories_dir())
+    index = _index if _index is not None and _index['root'] == root else _load_persisted(root)
+    if index is None or not is_catalog_dirs_fresh(index['dirs']):
+        index = _listing_from_catalog(root, None)
+    return {category: list(doc_types) for category, doc_types in sorted(index['categories'].items())}
+
+
+def get_documents(file_name: Optional[str] = None) -> list[dict]:
+    """
+    DOC_CATEGORIES の全ドキュメントを (カテゴリ（DOC_CATEGORIES 順）, doc_type, ファイル名) の順に返す。
+    各要素は {'category', 'doc_type', 'path'（絶対パス）, 'meta'（WORKSPACE_INDEX_META_FIELDS のキーだけ。
+    解析できない YAML は None）}。file_name（例: 'document.yaml'）を指定するとそのファイルだけ返す。
+    """
+    refresh()
+    documents = []
+    for category in DOC_CATEGORIES:
+        for doc_type, entries in sorted(_index['categories'].get(category, {}).items()):
+            ai_dir = get_doc_type_dir(category, doc_type) / 'ai'
+            for name, entry in sorted(entries.items()):
+                if entry is None or (file_name is not None and name != file_name):
+                    continue
+                documents.append({
+                    'category': category,
+                    'doc_type': doc_type,
+                    'path': ai_dir / name,
+                    'meta': entry['meta'],
+                })
+    return documents
+
+
+def clear() -> None:
+    """メモリ上のマニフェストを破棄する（保存済みのファイルは残す）"""
+    global _index
+    _index = None